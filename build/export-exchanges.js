@@ -70,13 +70,13 @@ const pad = function (string, n) {
     },
     {
         file: './python/ccxt/__init__.py',
-        regex: /(?:from ccxt\.[^\.]+ import [^\s]+\s+\# noqa\: F401[\r]?[\n])+[\r]?[\n]exchanges/,
-        replacement: ids.map (id => pad ('from ccxt.' + id + ' import ' + id, 60) + '# noqa: F401').join ("\n") + "\n\nexchanges",
+        regex: /(?:    from ccxt\.[^\.]+ import [^\s]+\s+\# noqa\: F401[\r]?[\n])+/,
+        replacement: ids.map (id => '    ' + pad ('from ccxt.' + id + ' import ' + id, 60) + '# noqa: F401').join ("\n") + "\n",
     },
     {
         file: './python/ccxt/async_support/__init__.py',
-        regex: /(?:from ccxt\.async_support\.[^\.]+ import [^\s]+\s+\# noqa\: F401[\r]?[\n])+[\r]?[\n]exchanges/,
-        replacement: ids.map (id => pad ('from ccxt.async_support.' + id + ' import ' + id, 74) + '# noqa: F401').join ("\n") + "\n\nexchanges",
+        regex: /(?:    from ccxt\.async_support\.[^\.]+ import [^\s]+\s+\# noqa\: F401[\r]?[\n])+/,
+        replacement: ids.map (id => '    ' + pad ('from ccxt.async_support.' + id + ' import ' + id, 74) + '# noqa: F401').join ("\n") + "\n",
     },
     {
         file: './python/ccxt/async_support/__init__.py',
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import selectors
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.async_support.base.throttle import throttle  # noqa: E402
+
+# usage: benchmark-async-throttle.py [number of requests in the burst] [rateLimit in milliseconds]
+number = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+rate_limit = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+
+
+class CountingSelector(selectors.DefaultSelector):
+    """Every select() call is one wakeup of the event loop"""
+
+    wakeups = 0
+
+    def select(self, timeout=None):
+        self.wakeups += 1
+        return super(CountingSelector, self).select(timeout)
+
+
+async def burst(loop, cost):
+    bucket = throttle({
+        'loop': loop,
+        'refillRate': 1.0 / rate_limit,
+        'capacity': 1.0,
+    })
+    start = time.monotonic()
+    released = [None] * number
+
+    async def request(i):
+        await bucket(cost)
+        released[i] = time.monotonic()
+
+    await asyncio.gather(*[request(i) for i in range(0, number)])
+    # ideally the n-th request of the burst proceeds n * cost * rateLimit milliseconds after the first one
+    latencies = [max(0.0, released[i] - released[0] - i * cost * rate_limit / 1000.0) for i in range(0, number)]
+    return time.monotonic() - start, latencies
+
+
+for cost in (1, 5):
+    selector = CountingSelector()
+    loop = asyncio.SelectorEventLoop(selector)
+    cpu = time.process_time()
+    seconds, latencies = loop.run_until_complete(burst(loop, cost))
+    cpu = time.process_time() - cpu
+    loop.close()
+    latencies.sort()
+    print('{} requests of cost {}, rateLimit {} ms: {:.3f} s, {:.3f} s cpu, {} wakeups, added latency mean {:.3f} ms, p99 {:.3f} ms, max {:.3f} ms'.format(
+        number, cost, rate_limit, seconds, cpu, selector.wakeups,
+        sum(latencies) / len(latencies) * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000,
+        latencies[-1] * 1000))
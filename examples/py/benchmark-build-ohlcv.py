@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import math
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# usage: benchmark-build-ohlcv.py [number of trades]
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+random.seed(0)
+timestamp = 1546300800000
+trades = []
+for i in range(0, count):
+    timestamp += random.randint(0, 500)
+    trades.append({'timestamp': timestamp, 'price': random.uniform(3000, 4000), 'amount': random.uniform(0, 10)})
+
+
+def previous_build_ohlcv(exchange, trades, timeframe='1m'):
+    # the previous implementation, with a floor division and nested list indexing per trade
+    ms = exchange.parse_timeframe(timeframe) * 1000
+    ohlcvs = []
+    for i in range(0, len(trades) - 1):
+        trade = trades[i]
+        opening_time = int(math.floor(trade['timestamp'] / ms) * ms)
+        j = len(ohlcvs)
+        if (j == 0) or opening_time >= ohlcvs[j - 1][0] + ms:
+            ohlcvs.append([opening_time, trade['price'], trade['price'], trade['price'], trade['price'], trade['amount']])
+        else:
+            ohlcvs[j - 1][2] = max(ohlcvs[j - 1][2], trade['price'])
+            ohlcvs[j - 1][3] = min(ohlcvs[j - 1][3], trade['price'])
+            ohlcvs[j - 1][4] = trade['price']
+            ohlcvs[j - 1][5] += trade['amount']
+    return ohlcvs
+
+
+exchange = Exchange({'id': 'benchmark'})
+timeframes = ['1m', '5m', '15m', '1h', '1d']
+durations = [(timeframe, exchange.parse_timeframe(timeframe) * 1000) for timeframe in timeframes]
+
+cases = [
+    ('previous build_ohlcv, 1m', lambda: previous_build_ohlcv(exchange, trades)),
+    ('pure Python build_ohlcv, 1m', lambda: Exchange.build_ohlcvs_from_trades(trades, durations[:1])),
+    ('build_ohlcv, 1m', lambda: exchange.build_ohlcv(trades)),
+    ('previous build_ohlcv, 5 timeframes', lambda: [previous_build_ohlcv(exchange, trades, timeframe) for timeframe in timeframes]),
+    ('pure Python build_ohlcvs, 5 timeframes', lambda: Exchange.build_ohlcvs_from_trades(trades, durations)),
+    ('build_ohlcvs, 5 timeframes', lambda: exchange.build_ohlcvs(trades, timeframes)),
+]
+
+print('{} trades'.format(count))
+
+for name, function in cases:
+    begin = time.time()
+    function()
+    print('{:<40} {:8.3f} s'.format(name, time.time() - begin))
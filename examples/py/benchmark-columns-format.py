@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+import ccxt  # noqa: E402
+import numpy  # noqa: E402, F401 imported before the measures, ccxt imports it on the first use of the columns format
+
+# usage: benchmark-columns-format.py [number of trades]
+# the memory and the time of fetch_trades() on binance aggregate trades, in dicts and in columns
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+random.seed(0)
+market = {'id': 'ETHBTC', 'symbol': 'ETH/BTC', 'base': 'ETH', 'quote': 'BTC'}
+trades = [{
+    'a': 26129 + i,
+    'p': '{:.8f}'.format(random.uniform(0.03, 0.04)),
+    'q': '{:.8f}'.format(random.uniform(0, 10)),
+    'f': 27781 + i,
+    'l': 27781 + i,
+    'T': 1546300800000 + 100 * i,
+    'm': random.random() < 0.5,
+    'M': True,
+} for i in range(0, count)]
+
+
+class binance(ccxt.binance):
+
+    def fetch_trades(self, symbol, since=None, limit=None, params={}):
+        return self.parse_trades(trades, market, since, limit)
+
+
+cases = [
+    ('dicts', binance()),
+    ('columns', binance({'tradesFormat': 'columns'})),
+    ('columns with id and datetime', binance({'tradesFormat': 'columns', 'tradesColumns': ['timestamp', 'price', 'amount', 'side', 'id', 'datetime']})),
+]
+
+print('{} trades'.format(count))
+
+for name, exchange in cases:
+    tracemalloc.start()
+    begin = time.time()
+    result = exchange.fetch_trades('ETH/BTC')
+    seconds = time.time() - begin
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('{:<32} {:8.3f} s {:8.1f} bytes per trade'.format(name, seconds, size / float(count)))
+    del result
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.base.decimal_to_precision import decimal_to_precision  # noqa: E402
+from ccxt.base.decimal_to_precision import TRUNCATE              # noqa: E402
+from ccxt.base.decimal_to_precision import ROUND                 # noqa: E402
+from ccxt.base.decimal_to_precision import DECIMAL_PLACES        # noqa: E402
+from ccxt.base.decimal_to_precision import SIGNIFICANT_DIGITS    # noqa: E402
+from ccxt.base.decimal_to_precision import PAD_WITH_ZERO         # noqa: E402
+from ccxt.base.decimal_to_precision import NO_PADDING            # noqa: E402
+
+number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+random.seed(0)
+floats = [random.uniform(0, 10000) for i in range(0, number)]
+strings = [str(x) for x in floats]
+
+cases = [
+    ('price_to_precision', ROUND, 8, DECIMAL_PLACES, NO_PADDING),
+    ('amount_to_precision', TRUNCATE, 8, DECIMAL_PLACES, NO_PADDING),
+    ('round 2 decimal places padded', ROUND, 2, DECIMAL_PLACES, PAD_WITH_ZERO),
+    ('round 5 significant digits', ROUND, 5, SIGNIFICANT_DIGITS, NO_PADDING),
+    ('truncate to tens', TRUNCATE, -1, DECIMAL_PLACES, NO_PADDING),
+]
+
+print('{} calls per case'.format(number))
+
+for name, rounding_mode, precision, counting_mode, padding_mode in cases:
+    for kind, values in (('floats', floats), ('strings', strings)):
+        seconds = timeit.timeit(lambda: [decimal_to_precision(x, rounding_mode, precision, counting_mode, padding_mode) for x in values], number=1)
+        print('{:<32} {:<8} {:8.3f} s {:8.3f} us/call'.format(name, kind, seconds, seconds / number * 1000000))
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+import ccxt  # noqa: E402
+
+# the exchanges with the largest api definitions by default
+ids = sys.argv[1:] if len(sys.argv) > 1 else ['binance', 'kraken', 'hitbtc2']
+number = 500
+
+for id in ids:
+    exchange_class = getattr(ccxt, id)
+    # the first instance defines the generated api methods for the class
+    first = timeit.timeit(exchange_class, number=1)
+    total = timeit.timeit(exchange_class, number=number)
+    print('{:<10} first instance: {:8.3f} ms, subsequent instances: {:8.3f} ms'.format(id, first * 1000, total / number * 1000))
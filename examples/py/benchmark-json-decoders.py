@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import random
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.base.exchange import json_decoders  # noqa: E402
+
+# usage: benchmark-json-decoders.py [recorded response.json ...]
+# without arguments it decodes generated payloads shaped like the binance exchangeInfo and 24hr tickers
+
+
+def generate_payloads():
+    random.seed(0)
+    symbols = ['C{}BTC'.format(i) for i in range(0, 2000)]
+    markets = {
+        'timezone': 'UTC',
+        'serverTime': 1565000000000,
+        'symbols': [{
+            'symbol': symbol,
+            'status': 'TRADING',
+            'baseAsset': symbol[:-3],
+            'quoteAsset': 'BTC',
+            'orderTypes': ['LIMIT', 'LIMIT_MAKER', 'MARKET', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT_LIMIT'],
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': '0.00000001', 'maxPrice': '100000.00000000', 'tickSize': '0.00000001'},
+                {'filterType': 'LOT_SIZE', 'minQty': '1.00000000', 'maxQty': '90000000.00000000', 'stepSize': '1.00000000'},
+            ],
+        } for symbol in symbols],
+    }
+    tickers = [{
+        'symbol': symbol,
+        'priceChange': '{:.8f}'.format(random.uniform(-1, 1)),
+        'lastPrice': '{:.8f}'.format(random.uniform(0, 1)),
+        'bidPrice': '{:.8f}'.format(random.uniform(0, 1)),
+        'askPrice': '{:.8f}'.format(random.uniform(0, 1)),
+        'volume': '{:.8f}'.format(random.uniform(0, 1000000)),
+        'openTime': 1565000000000 + i,
+        'closeTime': 1565086400000 + i,
+        'count': random.randint(0, 100000),
+    } for i, symbol in enumerate(symbols)]
+    return [('markets', json.dumps(markets).encode()), ('tickers', json.dumps(tickers).encode())]
+
+
+payloads = [(os.path.basename(path), open(path, 'rb').read()) for path in sys.argv[1:]] or generate_payloads()
+
+for name, payload in payloads:
+    number = max(1, int(20000000 / len(payload)))
+    print('{}: {:.2f} MB, {} runs'.format(name, len(payload) / 1000000.0, number))
+    # the previous path: response.text followed by json.loads
+    seconds = timeit.timeit(lambda: json.loads(payload.decode('utf-8')), number=number)
+    print('    {:<36} {:8.2f} ms'.format('json.loads(bytes.decode())', seconds / number * 1000))
+    for decoder, loads in json_decoders.items():
+        if decoder != 'json':
+            text = payload.decode('utf-8')
+            seconds = timeit.timeit(lambda: loads(text), number=number)
+            print('    {:<36} {:8.2f} ms'.format(decoder + '.loads(str)', seconds / number * 1000))
+            seconds = timeit.timeit(lambda: loads(payload), number=number)
+            print('    {:<36} {:8.2f} ms'.format(decoder + '.loads(bytes)', seconds / number * 1000))
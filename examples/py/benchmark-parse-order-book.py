@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# usage: benchmark-parse-order-book.py [number of levels per side] [number of runs]
+levels = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+number = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+random.seed(0)
+orderbook = {
+    'bids': [['{:.8f}'.format(10000 - i * 0.01), '{:.8f}'.format(random.uniform(0, 10))] for i in range(0, levels)],
+    'asks': [['{:.8f}'.format(10000.01 + i * 0.01), '{:.8f}'.format(random.uniform(0, 10))] for i in range(0, levels)],
+}
+shuffled = {side: random.sample(orderbook[side], len(orderbook[side])) for side in orderbook}
+
+
+def previous_parse_order_book(exchange, orderbook):
+    # the previous implementation, a method call per level and a sort with a lambda per side
+    def parse_bids_asks(bidasks):
+        result = []
+        for bidask in bidasks:
+            if bidask[0] and bidask[1]:
+                result.append(exchange.parse_bid_ask(bidask, 0, 1))
+        return result
+    return {
+        'bids': exchange.sort_by(parse_bids_asks(orderbook['bids']), 0, True),
+        'asks': exchange.sort_by(parse_bids_asks(orderbook['asks']), 0),
+    }
+
+
+def previous_l2(exchange, orderbook):
+    return {
+        'bids': exchange.sort_by(exchange.aggregate(orderbook['bids']), 0, True),
+        'asks': exchange.sort_by(exchange.aggregate(orderbook['asks']), 0),
+    }
+
+
+def l2(exchange, orderbook):
+    return {
+        'bids': exchange.sort_bids_asks(exchange.aggregate(orderbook['bids']), True),
+        'asks': exchange.sort_bids_asks(exchange.aggregate(orderbook['asks'])),
+    }
+
+
+exchange = Exchange({'id': 'benchmark'})
+arrays = Exchange({'id': 'benchmark', 'orderBookArrays': True})
+
+cases = [
+    ('previous parse_order_book', lambda book: previous_parse_order_book(exchange, book)),
+    ('parse_order_book', lambda book: exchange.parse_order_book(book)),
+    ('parse_order_book, numpy arrays', lambda book: arrays.parse_order_book(book)),
+]
+
+print('{} levels per side, {} runs'.format(levels, number))
+
+for name, function in cases:
+    for kind, book in (('sorted', orderbook), ('shuffled', shuffled)):
+        seconds = timeit.timeit(lambda: function(book), number=number)
+        print('{:<32} {:<8} {:8.3f} ms'.format(name, kind, seconds / number * 1000))
+
+parsed = exchange.parse_order_book(orderbook)
+parsed_arrays = arrays.parse_order_book(orderbook)
+cases = [
+    ('previous l2 aggregation', lambda: previous_l2(exchange, parsed)),
+    ('l2 aggregation', lambda: l2(exchange, parsed)),
+    ('l2 aggregation, numpy arrays', lambda: l2(arrays, parsed_arrays)),
+]
+for name, function in cases:
+    seconds = timeit.timeit(function, number=number)
+    print('{:<32} {:<8} {:8.3f} ms'.format(name, 'sorted', seconds / number * 1000))
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from requests import Session
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+import ccxt  # noqa: E402
+
+# usage: benchmark-session-pool.py [number of threads] [number of requests per thread]
+# requires the openssl command line tool to make a self-signed certificate for the local https stub
+number_of_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+number_of_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+connections = None  # the number of connections accepted by the stub, shared by the processes
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'  # keeps the connections alive
+
+    def setup(self):
+        with connections.get_lock():
+            connections.value += 1  # every new connection is a new TLS handshake
+        BaseHTTPRequestHandler.setup(self)
+
+    def do_GET(self):
+        body = b'{"symbol":"BTC/USDT","bid":10000.0,"ask":10000.1}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'session=1')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def serve(certfile, ports, counter):
+    # the stub runs in its own process, so that it does not compete with the client threads for the GIL
+    global connections
+    connections = counter
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+def run(exchange, certfile, url):
+    exchange.session.trust_env = False  # REQUESTS_CA_BUNDLE would override the verify setting
+    exchange.session.verify = certfile
+    latencies = []
+
+    def worker():
+        for i in range(0, number_of_requests):
+            start = time.time()
+            exchange.fetch(url)
+            latencies.append(time.time() - start)
+
+    connections.value = 0
+    threads = [threading.Thread(target=worker) for i in range(0, number_of_threads)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.time() - start
+    latencies.sort()
+    return len(latencies) / seconds, latencies[int(len(latencies) * 0.99)] * 1000, connections.value
+
+
+if __name__ == '__main__':
+
+    directory = tempfile.mkdtemp()
+    certfile = os.path.join(directory, 'stub.pem')
+    subprocess.check_call(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1', '-subj', '/CN=127.0.0.1',
+                           '-addext', 'subjectAltName=IP:127.0.0.1', '-keyout', certfile, '-out', certfile], stderr=subprocess.DEVNULL)
+
+    connections = multiprocessing.Value('i', 0)
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(certfile, ports, connections))
+    server.daemon = True
+    server.start()
+    url = 'https://127.0.0.1:' + str(ports.get()) + '/ticker'
+
+    configs = [
+        ('default session', {'session': Session()}),
+        ('tuned session', {'sessionOptions': {
+            'poolMaxSize': number_of_threads,
+            'keepAlive': True,
+            'clearCookies': False,
+        }}),
+    ]
+
+    print('{} threads, {} requests per thread'.format(number_of_threads, number_of_requests))
+
+    for name, config in configs:
+        requests_per_second, p99, handshakes = run(ccxt.Exchange(ccxt.Exchange.extend({'id': 'stub'}, config)), certfile, url)
+        print('{:<16} {:8.1f} requests/s, p99 latency {:8.2f} ms, {:5d} TLS handshakes'.format(name, requests_per_second, p99, handshakes))
+
+    server.terminate()
+    shutil.rmtree(directory)
@@ -16,17 +16,8 @@ timeframe = '1h'
 
 candles = exchange.fetch_ohlcv(symbol, timeframe)
 
-# timeframe duration in seconds
-duration = exchange.parse_timeframe(timeframe)
-
-# timeframe duration in milliseconds
-duration *= 1000
-
-pprint([[
-    exchange.iso8601(int(round(candle[0] / duration)) * duration),
-    candle[1],  # o
-    candle[2],  # h
-    candle[3],  # l
-    candle[4],  # c
-    candle[5]   # v
-] for candle in candles])
+# round the timestamps to the timeframe and fill the missing candles at the previous close
+
+candles = exchange.fill_ohlcv_gaps(candles, timeframe)
+
+pprint([[exchange.iso8601(candle[0])] + candle[1:] for candle in candles])
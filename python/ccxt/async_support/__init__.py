@@ -8,9 +8,18 @@ __version__ = '1.18.497'
 
 # -----------------------------------------------------------------------------
 
+import importlib
+import sys
+import types
+
+# -----------------------------------------------------------------------------
+
 from ccxt.async_support.base.exchange import Exchange                   # noqa: F401
+from ccxt.base.order_book import OrderBook                  # noqa: F401
+from ccxt.base.ohlcv_cache import OHLCVCache                # noqa: F401
 
 from ccxt.base.decimal_to_precision import decimal_to_precision  # noqa: F401
+from ccxt.base.decimal_to_precision import decimals_to_precision  # noqa: F401
 from ccxt.base.decimal_to_precision import TRUNCATE              # noqa: F401
 from ccxt.base.decimal_to_precision import ROUND                 # noqa: F401
 from ccxt.base.decimal_to_precision import DECIMAL_PLACES        # noqa: F401
@@ -46,143 +55,6 @@ from ccxt.base.errors import OrderImmediatelyFillable           # noqa: F401
 from ccxt.base.errors import OrderNotFillable                   # noqa: F401
 
 
-from ccxt.async_support._1btcxe import _1btcxe                            # noqa: F401
-from ccxt.async_support.acx import acx                                    # noqa: F401
-from ccxt.async_support.allcoin import allcoin                            # noqa: F401
-from ccxt.async_support.anxpro import anxpro                              # noqa: F401
-from ccxt.async_support.anybits import anybits                            # noqa: F401
-from ccxt.async_support.bcex import bcex                                  # noqa: F401
-from ccxt.async_support.bequant import bequant                            # noqa: F401
-from ccxt.async_support.bibox import bibox                                # noqa: F401
-from ccxt.async_support.bigone import bigone                              # noqa: F401
-from ccxt.async_support.binance import binance                            # noqa: F401
-from ccxt.async_support.binanceje import binanceje                        # noqa: F401
-from ccxt.async_support.bishino import bishino                            # noqa: F401
-from ccxt.async_support.bit2c import bit2c                                # noqa: F401
-from ccxt.async_support.bitbank import bitbank                            # noqa: F401
-from ccxt.async_support.bitbay import bitbay                              # noqa: F401
-from ccxt.async_support.bitfinex import bitfinex                          # noqa: F401
-from ccxt.async_support.bitfinex2 import bitfinex2                        # noqa: F401
-from ccxt.async_support.bitflyer import bitflyer                          # noqa: F401
-from ccxt.async_support.bitforex import bitforex                          # noqa: F401
-from ccxt.async_support.bithumb import bithumb                            # noqa: F401
-from ccxt.async_support.bitibu import bitibu                              # noqa: F401
-from ccxt.async_support.bitkk import bitkk                                # noqa: F401
-from ccxt.async_support.bitlish import bitlish                            # noqa: F401
-from ccxt.async_support.bitmarket import bitmarket                        # noqa: F401
-from ccxt.async_support.bitmex import bitmex                              # noqa: F401
-from ccxt.async_support.bitsane import bitsane                            # noqa: F401
-from ccxt.async_support.bitso import bitso                                # noqa: F401
-from ccxt.async_support.bitstamp import bitstamp                          # noqa: F401
-from ccxt.async_support.bitstamp1 import bitstamp1                        # noqa: F401
-from ccxt.async_support.bittrex import bittrex                            # noqa: F401
-from ccxt.async_support.bitz import bitz                                  # noqa: F401
-from ccxt.async_support.bl3p import bl3p                                  # noqa: F401
-from ccxt.async_support.bleutrade import bleutrade                        # noqa: F401
-from ccxt.async_support.braziliex import braziliex                        # noqa: F401
-from ccxt.async_support.btcalpha import btcalpha                          # noqa: F401
-from ccxt.async_support.btcbox import btcbox                              # noqa: F401
-from ccxt.async_support.btcchina import btcchina                          # noqa: F401
-from ccxt.async_support.btcexchange import btcexchange                    # noqa: F401
-from ccxt.async_support.btcmarkets import btcmarkets                      # noqa: F401
-from ccxt.async_support.btctradeim import btctradeim                      # noqa: F401
-from ccxt.async_support.btctradeua import btctradeua                      # noqa: F401
-from ccxt.async_support.btcturk import btcturk                            # noqa: F401
-from ccxt.async_support.buda import buda                                  # noqa: F401
-from ccxt.async_support.bxinth import bxinth                              # noqa: F401
-from ccxt.async_support.ccex import ccex                                  # noqa: F401
-from ccxt.async_support.cex import cex                                    # noqa: F401
-from ccxt.async_support.chbtc import chbtc                                # noqa: F401
-from ccxt.async_support.chilebit import chilebit                          # noqa: F401
-from ccxt.async_support.cobinhood import cobinhood                        # noqa: F401
-from ccxt.async_support.coinbase import coinbase                          # noqa: F401
-from ccxt.async_support.coinbaseprime import coinbaseprime                # noqa: F401
-from ccxt.async_support.coinbasepro import coinbasepro                    # noqa: F401
-from ccxt.async_support.coincheck import coincheck                        # noqa: F401
-from ccxt.async_support.coinegg import coinegg                            # noqa: F401
-from ccxt.async_support.coinex import coinex                              # noqa: F401
-from ccxt.async_support.coinexchange import coinexchange                  # noqa: F401
-from ccxt.async_support.coinfalcon import coinfalcon                      # noqa: F401
-from ccxt.async_support.coinfloor import coinfloor                        # noqa: F401
-from ccxt.async_support.coingi import coingi                              # noqa: F401
-from ccxt.async_support.coinmarketcap import coinmarketcap                # noqa: F401
-from ccxt.async_support.coinmate import coinmate                          # noqa: F401
-from ccxt.async_support.coinnest import coinnest                          # noqa: F401
-from ccxt.async_support.coinone import coinone                            # noqa: F401
-from ccxt.async_support.coinspot import coinspot                          # noqa: F401
-from ccxt.async_support.cointiger import cointiger                        # noqa: F401
-from ccxt.async_support.coolcoin import coolcoin                          # noqa: F401
-from ccxt.async_support.coss import coss                                  # noqa: F401
-from ccxt.async_support.crex24 import crex24                              # noqa: F401
-from ccxt.async_support.crypton import crypton                            # noqa: F401
-from ccxt.async_support.cryptopia import cryptopia                        # noqa: F401
-from ccxt.async_support.deribit import deribit                            # noqa: F401
-from ccxt.async_support.dsx import dsx                                    # noqa: F401
-from ccxt.async_support.ethfinex import ethfinex                          # noqa: F401
-from ccxt.async_support.exmo import exmo                                  # noqa: F401
-from ccxt.async_support.exx import exx                                    # noqa: F401
-from ccxt.async_support.fcoin import fcoin                                # noqa: F401
-from ccxt.async_support.fcoinjp import fcoinjp                            # noqa: F401
-from ccxt.async_support.flowbtc import flowbtc                            # noqa: F401
-from ccxt.async_support.foxbit import foxbit                              # noqa: F401
-from ccxt.async_support.fybse import fybse                                # noqa: F401
-from ccxt.async_support.fybsg import fybsg                                # noqa: F401
-from ccxt.async_support.gateio import gateio                              # noqa: F401
-from ccxt.async_support.gdax import gdax                                  # noqa: F401
-from ccxt.async_support.gemini import gemini                              # noqa: F401
-from ccxt.async_support.getbtc import getbtc                              # noqa: F401
-from ccxt.async_support.hadax import hadax                                # noqa: F401
-from ccxt.async_support.hitbtc import hitbtc                              # noqa: F401
-from ccxt.async_support.hitbtc2 import hitbtc2                            # noqa: F401
-from ccxt.async_support.huobipro import huobipro                          # noqa: F401
-from ccxt.async_support.huobiru import huobiru                            # noqa: F401
-from ccxt.async_support.ice3x import ice3x                                # noqa: F401
-from ccxt.async_support.independentreserve import independentreserve      # noqa: F401
-from ccxt.async_support.indodax import indodax                            # noqa: F401
-from ccxt.async_support.itbit import itbit                                # noqa: F401
-from ccxt.async_support.jubi import jubi                                  # noqa: F401
-from ccxt.async_support.kkex import kkex                                  # noqa: F401
-from ccxt.async_support.kraken import kraken                              # noqa: F401
-from ccxt.async_support.kucoin import kucoin                              # noqa: F401
-from ccxt.async_support.kucoin2 import kucoin2                            # noqa: F401
-from ccxt.async_support.kuna import kuna                                  # noqa: F401
-from ccxt.async_support.lakebtc import lakebtc                            # noqa: F401
-from ccxt.async_support.lbank import lbank                                # noqa: F401
-from ccxt.async_support.liqui import liqui                                # noqa: F401
-from ccxt.async_support.liquid import liquid                              # noqa: F401
-from ccxt.async_support.livecoin import livecoin                          # noqa: F401
-from ccxt.async_support.luno import luno                                  # noqa: F401
-from ccxt.async_support.lykke import lykke                                # noqa: F401
-from ccxt.async_support.mandala import mandala                            # noqa: F401
-from ccxt.async_support.mercado import mercado                            # noqa: F401
-from ccxt.async_support.mixcoins import mixcoins                          # noqa: F401
-from ccxt.async_support.negociecoins import negociecoins                  # noqa: F401
-from ccxt.async_support.nova import nova                                  # noqa: F401
-from ccxt.async_support.okcoincny import okcoincny                        # noqa: F401
-from ccxt.async_support.okcoinusd import okcoinusd                        # noqa: F401
-from ccxt.async_support.okex import okex                                  # noqa: F401
-from ccxt.async_support.paymium import paymium                            # noqa: F401
-from ccxt.async_support.poloniex import poloniex                          # noqa: F401
-from ccxt.async_support.quadrigacx import quadrigacx                      # noqa: F401
-from ccxt.async_support.rightbtc import rightbtc                          # noqa: F401
-from ccxt.async_support.southxchange import southxchange                  # noqa: F401
-from ccxt.async_support.stronghold import stronghold                      # noqa: F401
-from ccxt.async_support.surbitcoin import surbitcoin                      # noqa: F401
-from ccxt.async_support.theocean import theocean                          # noqa: F401
-from ccxt.async_support.therock import therock                            # noqa: F401
-from ccxt.async_support.tidebit import tidebit                            # noqa: F401
-from ccxt.async_support.tidex import tidex                                # noqa: F401
-from ccxt.async_support.uex import uex                                    # noqa: F401
-from ccxt.async_support.upbit import upbit                                # noqa: F401
-from ccxt.async_support.urdubit import urdubit                            # noqa: F401
-from ccxt.async_support.vaultoro import vaultoro                          # noqa: F401
-from ccxt.async_support.vbtc import vbtc                                  # noqa: F401
-from ccxt.async_support.virwox import virwox                              # noqa: F401
-from ccxt.async_support.xbtce import xbtce                                # noqa: F401
-from ccxt.async_support.yobit import yobit                                # noqa: F401
-from ccxt.async_support.zaif import zaif                                  # noqa: F401
-from ccxt.async_support.zb import zb                                      # noqa: F401
-
 exchanges = [
     '_1btcxe',
     'acx',
@@ -324,8 +196,179 @@ exchanges = [
 
 base = [
     'Exchange',
+    'OrderBook',
+    'OHLCVCache',
     'exchanges',
     'decimal_to_precision',
+    'decimals_to_precision',
 ]
 
 __all__ = base + errors.__all__ + exchanges
+
+# -----------------------------------------------------------------------------
+# exchange classes are imported on first access with a module-level __getattr__,
+# (PEP 562, Python 3.7+), older versions of Python import all of them eagerly,
+# the imported submodules of the exchanges are replaced with their classes
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        if name in exchanges:
+            module = importlib.import_module(__name__ + '.' + name)
+            globals()[name] = getattr(module, name)
+            return globals()[name]
+        raise AttributeError("module '" + __name__ + "' has no attribute '" + name + "'")
+
+    def __dir__():
+        return sorted(set(globals().keys()).union(exchanges))
+
+    class ExchangeModule(types.ModuleType):
+
+        def __setattr__(self, name, value):
+            # the import system binds every imported submodule to this package, however it is imported,
+            # as in from ccxt.kraken import kraken, import ccxt.kraken or the unpickling of an instance,
+            # the submodule of an exchange is executed by then and its class is bound in its place
+            if (name in exchanges) and isinstance(value, types.ModuleType):
+                value = getattr(value, name, value)
+            super(ExchangeModule, self).__setattr__(name, value)
+
+    sys.modules[__name__].__class__ = ExchangeModule
+
+else:
+
+    from ccxt.async_support._1btcxe import _1btcxe                            # noqa: F401
+    from ccxt.async_support.acx import acx                                    # noqa: F401
+    from ccxt.async_support.allcoin import allcoin                            # noqa: F401
+    from ccxt.async_support.anxpro import anxpro                              # noqa: F401
+    from ccxt.async_support.anybits import anybits                            # noqa: F401
+    from ccxt.async_support.bcex import bcex                                  # noqa: F401
+    from ccxt.async_support.bequant import bequant                            # noqa: F401
+    from ccxt.async_support.bibox import bibox                                # noqa: F401
+    from ccxt.async_support.bigone import bigone                              # noqa: F401
+    from ccxt.async_support.binance import binance                            # noqa: F401
+    from ccxt.async_support.binanceje import binanceje                        # noqa: F401
+    from ccxt.async_support.bishino import bishino                            # noqa: F401
+    from ccxt.async_support.bit2c import bit2c                                # noqa: F401
+    from ccxt.async_support.bitbank import bitbank                            # noqa: F401
+    from ccxt.async_support.bitbay import bitbay                              # noqa: F401
+    from ccxt.async_support.bitfinex import bitfinex                          # noqa: F401
+    from ccxt.async_support.bitfinex2 import bitfinex2                        # noqa: F401
+    from ccxt.async_support.bitflyer import bitflyer                          # noqa: F401
+    from ccxt.async_support.bitforex import bitforex                          # noqa: F401
+    from ccxt.async_support.bithumb import bithumb                            # noqa: F401
+    from ccxt.async_support.bitibu import bitibu                              # noqa: F401
+    from ccxt.async_support.bitkk import bitkk                                # noqa: F401
+    from ccxt.async_support.bitlish import bitlish                            # noqa: F401
+    from ccxt.async_support.bitmarket import bitmarket                        # noqa: F401
+    from ccxt.async_support.bitmex import bitmex                              # noqa: F401
+    from ccxt.async_support.bitsane import bitsane                            # noqa: F401
+    from ccxt.async_support.bitso import bitso                                # noqa: F401
+    from ccxt.async_support.bitstamp import bitstamp                          # noqa: F401
+    from ccxt.async_support.bitstamp1 import bitstamp1                        # noqa: F401
+    from ccxt.async_support.bittrex import bittrex                            # noqa: F401
+    from ccxt.async_support.bitz import bitz                                  # noqa: F401
+    from ccxt.async_support.bl3p import bl3p                                  # noqa: F401
+    from ccxt.async_support.bleutrade import bleutrade                        # noqa: F401
+    from ccxt.async_support.braziliex import braziliex                        # noqa: F401
+    from ccxt.async_support.btcalpha import btcalpha                          # noqa: F401
+    from ccxt.async_support.btcbox import btcbox                              # noqa: F401
+    from ccxt.async_support.btcchina import btcchina                          # noqa: F401
+    from ccxt.async_support.btcexchange import btcexchange                    # noqa: F401
+    from ccxt.async_support.btcmarkets import btcmarkets                      # noqa: F401
+    from ccxt.async_support.btctradeim import btctradeim                      # noqa: F401
+    from ccxt.async_support.btctradeua import btctradeua                      # noqa: F401
+    from ccxt.async_support.btcturk import btcturk                            # noqa: F401
+    from ccxt.async_support.buda import buda                                  # noqa: F401
+    from ccxt.async_support.bxinth import bxinth                              # noqa: F401
+    from ccxt.async_support.ccex import ccex                                  # noqa: F401
+    from ccxt.async_support.cex import cex                                    # noqa: F401
+    from ccxt.async_support.chbtc import chbtc                                # noqa: F401
+    from ccxt.async_support.chilebit import chilebit                          # noqa: F401
+    from ccxt.async_support.cobinhood import cobinhood                        # noqa: F401
+    from ccxt.async_support.coinbase import coinbase                          # noqa: F401
+    from ccxt.async_support.coinbaseprime import coinbaseprime                # noqa: F401
+    from ccxt.async_support.coinbasepro import coinbasepro                    # noqa: F401
+    from ccxt.async_support.coincheck import coincheck                        # noqa: F401
+    from ccxt.async_support.coinegg import coinegg                            # noqa: F401
+    from ccxt.async_support.coinex import coinex                              # noqa: F401
+    from ccxt.async_support.coinexchange import coinexchange                  # noqa: F401
+    from ccxt.async_support.coinfalcon import coinfalcon                      # noqa: F401
+    from ccxt.async_support.coinfloor import coinfloor                        # noqa: F401
+    from ccxt.async_support.coingi import coingi                              # noqa: F401
+    from ccxt.async_support.coinmarketcap import coinmarketcap                # noqa: F401
+    from ccxt.async_support.coinmate import coinmate                          # noqa: F401
+    from ccxt.async_support.coinnest import coinnest                          # noqa: F401
+    from ccxt.async_support.coinone import coinone                            # noqa: F401
+    from ccxt.async_support.coinspot import coinspot                          # noqa: F401
+    from ccxt.async_support.cointiger import cointiger                        # noqa: F401
+    from ccxt.async_support.coolcoin import coolcoin                          # noqa: F401
+    from ccxt.async_support.coss import coss                                  # noqa: F401
+    from ccxt.async_support.crex24 import crex24                              # noqa: F401
+    from ccxt.async_support.crypton import crypton                            # noqa: F401
+    from ccxt.async_support.cryptopia import cryptopia                        # noqa: F401
+    from ccxt.async_support.deribit import deribit                            # noqa: F401
+    from ccxt.async_support.dsx import dsx                                    # noqa: F401
+    from ccxt.async_support.ethfinex import ethfinex                          # noqa: F401
+    from ccxt.async_support.exmo import exmo                                  # noqa: F401
+    from ccxt.async_support.exx import exx                                    # noqa: F401
+    from ccxt.async_support.fcoin import fcoin                                # noqa: F401
+    from ccxt.async_support.fcoinjp import fcoinjp                            # noqa: F401
+    from ccxt.async_support.flowbtc import flowbtc                            # noqa: F401
+    from ccxt.async_support.foxbit import foxbit                              # noqa: F401
+    from ccxt.async_support.fybse import fybse                                # noqa: F401
+    from ccxt.async_support.fybsg import fybsg                                # noqa: F401
+    from ccxt.async_support.gateio import gateio                              # noqa: F401
+    from ccxt.async_support.gdax import gdax                                  # noqa: F401
+    from ccxt.async_support.gemini import gemini                              # noqa: F401
+    from ccxt.async_support.getbtc import getbtc                              # noqa: F401
+    from ccxt.async_support.hadax import hadax                                # noqa: F401
+    from ccxt.async_support.hitbtc import hitbtc                              # noqa: F401
+    from ccxt.async_support.hitbtc2 import hitbtc2                            # noqa: F401
+    from ccxt.async_support.huobipro import huobipro                          # noqa: F401
+    from ccxt.async_support.huobiru import huobiru                            # noqa: F401
+    from ccxt.async_support.ice3x import ice3x                                # noqa: F401
+    from ccxt.async_support.independentreserve import independentreserve      # noqa: F401
+    from ccxt.async_support.indodax import indodax                            # noqa: F401
+    from ccxt.async_support.itbit import itbit                                # noqa: F401
+    from ccxt.async_support.jubi import jubi                                  # noqa: F401
+    from ccxt.async_support.kkex import kkex                                  # noqa: F401
+    from ccxt.async_support.kraken import kraken                              # noqa: F401
+    from ccxt.async_support.kucoin import kucoin                              # noqa: F401
+    from ccxt.async_support.kucoin2 import kucoin2                            # noqa: F401
+    from ccxt.async_support.kuna import kuna                                  # noqa: F401
+    from ccxt.async_support.lakebtc import lakebtc                            # noqa: F401
+    from ccxt.async_support.lbank import lbank                                # noqa: F401
+    from ccxt.async_support.liqui import liqui                                # noqa: F401
+    from ccxt.async_support.liquid import liquid                              # noqa: F401
+    from ccxt.async_support.livecoin import livecoin                          # noqa: F401
+    from ccxt.async_support.luno import luno                                  # noqa: F401
+    from ccxt.async_support.lykke import lykke                                # noqa: F401
+    from ccxt.async_support.mandala import mandala                            # noqa: F401
+    from ccxt.async_support.mercado import mercado                            # noqa: F401
+    from ccxt.async_support.mixcoins import mixcoins                          # noqa: F401
+    from ccxt.async_support.negociecoins import negociecoins                  # noqa: F401
+    from ccxt.async_support.nova import nova                                  # noqa: F401
+    from ccxt.async_support.okcoincny import okcoincny                        # noqa: F401
+    from ccxt.async_support.okcoinusd import okcoinusd                        # noqa: F401
+    from ccxt.async_support.okex import okex                                  # noqa: F401
+    from ccxt.async_support.paymium import paymium                            # noqa: F401
+    from ccxt.async_support.poloniex import poloniex                          # noqa: F401
+    from ccxt.async_support.quadrigacx import quadrigacx                      # noqa: F401
+    from ccxt.async_support.rightbtc import rightbtc                          # noqa: F401
+    from ccxt.async_support.southxchange import southxchange                  # noqa: F401
+    from ccxt.async_support.stronghold import stronghold                      # noqa: F401
+    from ccxt.async_support.surbitcoin import surbitcoin                      # noqa: F401
+    from ccxt.async_support.theocean import theocean                          # noqa: F401
+    from ccxt.async_support.therock import therock                            # noqa: F401
+    from ccxt.async_support.tidebit import tidebit                            # noqa: F401
+    from ccxt.async_support.tidex import tidex                                # noqa: F401
+    from ccxt.async_support.uex import uex                                    # noqa: F401
+    from ccxt.async_support.upbit import upbit                                # noqa: F401
+    from ccxt.async_support.urdubit import urdubit                            # noqa: F401
+    from ccxt.async_support.vaultoro import vaultoro                          # noqa: F401
+    from ccxt.async_support.vbtc import vbtc                                  # noqa: F401
+    from ccxt.async_support.virwox import virwox                              # noqa: F401
+    from ccxt.async_support.xbtce import xbtce                                # noqa: F401
+    from ccxt.async_support.yobit import yobit                                # noqa: F401
+    from ccxt.async_support.zaif import zaif                                  # noqa: F401
+    from ccxt.async_support.zb import zb                                      # noqa: F401
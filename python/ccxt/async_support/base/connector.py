@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import ssl
+
+import aiohttp
+
+__all__ = [
+    'ssl_context',
+    'acquire_connector',
+    'release_connector',
+]
+
+# the ssl contexts by the path of the ca file and the shared connectors by event loop and settings
+contexts = {}
+connectors = {}
+
+default_connector_options = {
+    'limit': 100,  # the total number of simultaneous connections
+    'limit_per_host': 0,  # the number of simultaneous connections to one host, 0 for no limit
+    'use_dns_cache': True,
+    'ttl_dns_cache': 10,  # seconds before a resolved address is looked up again
+}
+
+
+def ssl_context(cafile):
+    """Returns the ssl context for the ca file, the certificates are loaded once per process
+
+    Sharing the context only saves loading the certificates again, the TLS sessions are not resumed across
+    connectors. The handshakes are saved by reusing the pooled connections of the shared connector.
+    """
+    if cafile not in contexts:
+        contexts[cafile] = ssl.create_default_context(cafile=cafile)
+    return contexts[cafile]
+
+
+def acquire_connector(loop, cafile, options=None):
+    """Returns the connector shared by all exchange instances with the same event loop and settings
+
+    The connector keeps a count of its users and is closed by the last call to release_connector().
+    """
+    options = dict(default_connector_options, **(options or {}))
+    key = (id(loop), cafile, tuple(sorted(options.items())))
+    if key not in connectors:
+        connector = aiohttp.TCPConnector(ssl=ssl_context(cafile), loop=loop, **options)
+        connectors[key] = {'connector': connector, 'references': 0}
+    connectors[key]['references'] += 1
+    return connectors[key]['connector']
+
+
+async def release_connector(connector):
+    for key, entry in list(connectors.items()):
+        if entry['connector'] is connector:
+            entry['references'] -= 1
+            if entry['references'] == 0:
+                del connectors[key]
+                await connector.close()
+            return
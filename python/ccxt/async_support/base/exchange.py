@@ -7,20 +7,24 @@ __version__ = '1.18.497'
 # -----------------------------------------------------------------------------
 
 import asyncio
+import collections
 import concurrent
+import logging
 import socket
 import time
 import math
 import random
 import certifi
 import aiohttp
-import ssl
 import sys
 import yarl
 
 # -----------------------------------------------------------------------------
 
 from ccxt.async_support.base.throttle import throttle
+from ccxt.async_support.base.connector import ssl_context
+from ccxt.async_support.base.connector import acquire_connector
+from ccxt.async_support.base.connector import release_connector
 
 # -----------------------------------------------------------------------------
 
@@ -32,6 +36,7 @@ from ccxt.base.errors import NotSupported
 # -----------------------------------------------------------------------------
 
 from ccxt.base.exchange import Exchange as BaseExchange
+from ccxt.base.json_stream import JsonStream
 
 # -----------------------------------------------------------------------------
 
@@ -43,6 +48,95 @@ __all__ = [
 # -----------------------------------------------------------------------------
 
 
+class ResponseStream(object):
+    """An asynchronous iterator over the members parsed by a JsonStream from an aiohttp response as it arrives"""
+
+    def __init__(self, exchange, response, stream, url, method):
+        self.exchange = exchange
+        self.response = response
+        self.stream = stream
+        self.url = url
+        self.method = method
+        self.items = collections.deque()
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self.items:
+            if self.closed:
+                raise StopAsyncIteration
+            try:
+                chunk = await self.response.content.readany()
+                self.items.extend(self.stream.feed(chunk) if chunk else self.stream.close())
+                self.closed = not chunk
+            except aiohttp.client_exceptions.ClientError as e:
+                self.close()
+                self.exchange.raise_error(ExchangeNotAvailable, self.url, self.method, e, None)
+            except concurrent.futures._base.TimeoutError as e:
+                self.close()
+                self.exchange.raise_error(RequestTimeout, self.method, self.url, e, None)
+            except ValueError as e:
+                self.close()
+                self.exchange.raise_error(ExchangeError, self.url, self.method, e, None)
+            if self.closed:
+                self.response.release()
+        return self.items.popleft()
+
+    def close(self):
+        """Releases the connection of a stream that is not iterated to the end"""
+        self.closed = True
+        self.items.clear()
+        self.response.release()
+
+
+class OHLCVRange(object):
+    """An asynchronous iterator over the candles of fetch_ohlcv_range(), the windows are fetched by concurrent tasks"""
+
+    def __init__(self, exchange, symbol, timeframe, start, end, limit, params):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.limit = limit or exchange.ohlcvLimit
+        self.params = params
+        self.windows = collections.deque(exchange.ohlcv_windows(timeframe, start, end, self.limit))
+        self.tasks = collections.deque()
+        self.candles = collections.deque()
+        self.loaded = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.loaded:
+            await self.exchange.load_markets()
+            self.loaded = True
+        while not self.candles:
+            while self.windows and (len(self.tasks) < max(1, self.exchange.ohlcvConcurrency)):
+                since, until = self.windows.popleft()
+                fetch_ohlcv = self.exchange.fetch_uncached_ohlcv or self.exchange.fetch_ohlcv
+                window = self.exchange.fetch_ohlcv_window(self.symbol, self.timeframe, since, until, self.limit, self.params, fetch_ohlcv)
+                self.tasks.append((since, until, self.exchange.asyncio_loop.create_task(window)))
+            if not self.tasks:
+                raise StopAsyncIteration
+            since, until, task = self.tasks.popleft()
+            try:
+                candles = await task
+            except BaseException:
+                self.close()
+                raise
+            self.exchange.cache_ohlcv_window(self.symbol, self.timeframe, since, until, candles, self.params)
+            self.candles.extend(candles)
+        return self.candles.popleft()
+
+    def close(self):
+        """Cancels the windows in flight of a range that is not iterated to the end"""
+        self.windows.clear()
+        while self.tasks:
+            self.tasks.popleft()[2].cancel()
+
+
 class Exchange(BaseExchange):
 
     def __init__(self, config={}):
@@ -51,14 +145,19 @@ class Exchange(BaseExchange):
         self.asyncio_loop = self.asyncio_loop or asyncio.get_event_loop()
         self.own_session = 'session' not in config
         self.cafile = config.get('cafile', certifi.where())
+        # the session is opened before the config is applied
+        self.aiohttp_shared_connector = config.get('aiohttp_shared_connector', self.aiohttp_shared_connector)
+        self.aiohttp_connector_options = config.get('aiohttp_connector_options', self.aiohttp_connector_options)
         self.open()
         super(Exchange, self).__init__(config)
-        self.init_rest_rate_limiter()
 
     def init_rest_rate_limiter(self):
-        self.throttle = throttle(self.extend({
+        self.throttle = self.throttle if self.throttle else throttle(self.extend({
             'loop': self.asyncio_loop,
         }, self.tokenBucket))
+        self.throttles = self.extend(dict([(name, throttle(self.extend({
+            'loop': self.asyncio_loop,
+        }, bucket))) for name, bucket in self.tokenBuckets.items()]), self.throttles or {})
 
     def __del__(self):
         if self.session is not None:
@@ -74,16 +173,24 @@ class Exchange(BaseExchange):
 
     def open(self):
         if self.own_session and self.session is None:
-            # Create our SSL context object with our CA cert file
-            context = ssl.create_default_context(cafile=self.cafile)
-            # Pass this SSL context to aiohttp and create a TCPConnector
-            connector = aiohttp.TCPConnector(ssl=context, loop=self.asyncio_loop)
-            self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env)
+            if self.aiohttp_shared_connector:
+                # one pool of connections, dns cache and ssl context for all instances on this event loop
+                connector = acquire_connector(self.asyncio_loop, self.cafile, self.aiohttp_connector_options)
+                self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, connector_owner=False, trust_env=self.aiohttp_trust_env)
+            else:
+                # The SSL context with our CA cert file is created once per process
+                context = ssl_context(self.cafile)
+                # Pass this SSL context to aiohttp and create a TCPConnector
+                connector = aiohttp.TCPConnector(ssl=context, loop=self.asyncio_loop, **(self.aiohttp_connector_options or {}))
+                self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env)
 
     async def close(self):
         if self.session is not None:
             if self.own_session:
+                connector = self.session.connector
                 await self.session.close()
+                if self.aiohttp_shared_connector:
+                    await release_connector(connector)
             self.session = None
 
     async def wait_for_token(self):
@@ -106,22 +213,43 @@ class Exchange(BaseExchange):
             self.rateLimitTokens = min(self.rateLimitTokens + new_tokens, self.rateLimitMaxTokens)
             self.rateLimitUpdateTime = now
 
-    async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
+    async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}):
         """A better wrapper over request for deferred signing"""
-        if self.enableRateLimit:
-            await self.throttle()
-        self.lastRestRequestTimestamp = self.milliseconds()
-        request = self.sign(path, api, method, params, headers, body)
-        return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
-
-    async def fetch(self, url, method='GET', headers=None, body=None):
-        """Perform a HTTP request and return decoded JSON data"""
+        attempt = 0
+        while True:
+            if self.enableRateLimit:
+                cost = self.calculate_rate_limiter_cost(api, method, path, params, config)
+                if self.adaptiveRateLimit:
+                    delay = self.rateLimitResumeTime - self.milliseconds()
+                    if delay > 0:
+                        await asyncio.sleep(delay / 1000.0)
+                    cost *= self.rateLimitSlowdown
+                await self.select_throttle(api, method, path, config)(cost)
+            self.lastRestRequestTimestamp = self.milliseconds()
+            request = self.sign(path, api, method, params, headers, body)
+            stream = JsonStream(config['stream']) if 'stream' in config else None
+            try:
+                response = await self.fetch(request['url'], request['method'], request['headers'], request['body'], self.safe_value(config, 'raw', False), stream)
+            except tuple(self.retryPolicy['exceptions']) as e:
+                delay = self.retry_delay(e, attempt, api, method, path, config)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay / 1000.0)
+                continue
+            if attempt > 0:
+                self.retryMetrics['recovered'] += 1
+            return response
+
+    async def fetch(self, url, method='GET', headers=None, body=None, raw=False, stream=None):
+        """Perform a HTTP request and return decoded JSON data, see the synchronous fetch() for raw and stream"""
         request_headers = self.prepare_request_headers(headers)
         url = self.proxy + url
 
         if self.verbose:
             print("\nRequest:", method, url, headers, body)
-        self.logger.debug("%s %s, Request: %s %s", method, url, headers, body)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s %s, Request: %s %s", method, url, headers, body)
 
         encoded_body = body.encode() if body else None
         session_method = getattr(self.session, method.lower())
@@ -129,24 +257,38 @@ class Exchange(BaseExchange):
         response = None
         http_response = None
         json_response = None
+        start = time.time()
         try:
-            async with session_method(yarl.URL(url, encoded=True),
-                                      data=encoded_body,
-                                      headers=request_headers,
-                                      timeout=(self.timeout / 1000),
-                                      proxy=self.aiohttp_proxy) as response:
-                http_response = await response.text()
-                json_response = self.parse_json(http_response) if self.is_json_encoded_object(http_response) else None
+            response = await session_method(yarl.URL(url, encoded=True),
+                                            data=encoded_body,
+                                            headers=request_headers,
+                                            timeout=(self.timeout / 1000),
+                                            proxy=self.aiohttp_proxy)
+            try:
                 headers = response.headers
-                if self.enableLastHttpResponse:
-                    self.last_http_response = http_response
-                if self.enableLastResponseHeaders:
-                    self.last_response_headers = headers
-                if self.enableLastJsonResponse:
-                    self.last_json_response = json_response
+                if self.adaptiveRateLimit:
+                    self.handle_rate_limit_feedback(response.status, headers)
+                if raw and (response.status < 400):
+                    return self.raw_response(response.status, headers, await response.read(), start)
+                if (stream is not None) and (response.status < 400):
+                    self.set_last_response(response.status, headers, None, None, start)
+                    return ResponseStream(self, response, stream, url, method)  # it releases the response at the end
+                if (self.jsonDecoder != 'json') and ('json' in headers.get('Content-Type', '')):
+                    # the fast decoders parse the bytes directly, the text is decoded as utf-8 without charset detection
+                    http_body = await response.read()
+                    http_response = http_body.decode(response.charset or 'utf-8', 'replace')
+                    json_response = self.parse_json(http_body) if self.is_json_encoded_object(http_body) else None
+                else:
+                    http_response = await response.text()
+                    json_response = self.parse_json(http_response) if self.is_json_encoded_object(http_response) else None
+                self.set_last_response(response.status, headers, http_response, json_response, start)
                 if self.verbose:
                     print("\nResponse:", method, url, response.status, headers, http_response)
-                self.logger.debug("%s %s, Response: %s %s %s", method, url, response.status, headers, http_response)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("%s %s, Response: %s %s %s", method, url, response.status, headers, http_response)
+            finally:
+                if (stream is None) or (response.status >= 400):
+                    response.release()
 
         except socket.gaierror as e:
             self.raise_error(ExchangeNotAvailable, url, method, e, None)
@@ -163,6 +305,7 @@ class Exchange(BaseExchange):
         self.handle_errors(response.status, response.reason, url, method, headers, http_response, json_response)
         self.handle_rest_errors(None, response.status, http_response, url, method)
         self.handle_rest_response(http_response, json_response, url, method, headers, body)
+        self.trim_last_response()
         if json_response is not None:
             return json_response
         return http_response
@@ -223,8 +366,8 @@ class Exchange(BaseExchange):
     async def fetch_l2_order_book(self, symbol, limit=None, params={}):
         orderbook = await self.fetch_order_book(symbol, limit, params)
         return self.extend(orderbook, {
-            'bids': self.sort_by(self.aggregate(orderbook['bids']), 0, True),
-            'asks': self.sort_by(self.aggregate(orderbook['asks']), 0),
+            'bids': self.sort_bids_asks(self.aggregate(orderbook['bids']), True),
+            'asks': self.sort_bids_asks(self.aggregate(orderbook['asks'])),
         })
 
     async def perform_order_book_request(self, market, limit=None, params={}):
@@ -246,6 +389,60 @@ class Exchange(BaseExchange):
     async def fetchOHLCV(self, symbol, timeframe='1m', since=None, limit=None, params={}):
         return await self.fetch_ohlcv(symbol, timeframe, since, limit, params)
 
+    async def fetch_ohlcv_window(self, symbol, timeframe, since, until, limit, params={}, fetch_ohlcv=None):
+        fetch_ohlcv = fetch_ohlcv or self.fetch_ohlcv
+        duration = self.parse_timeframe(timeframe) * 1000
+        result = []
+        while since < until:
+            candles = self.ohlcv_rows(await fetch_ohlcv(symbol, timeframe, since, limit, params))
+            if not self.merge_ohlcv_window(result, candles, since, until) or (candles[-1][0] >= until - duration):
+                break  # the window is complete or there are no more candles
+            since = result[-1][0] + duration
+        return result
+
+    def fetch_ohlcv_range(self, symbol, timeframe='1m', start=None, end=None, limit=None, params={}):
+        """Returns an asynchronous iterator over the candles from start to end, see the synchronous version"""
+        return OHLCVRange(self, symbol, timeframe, start, end, limit, params)
+
+    async def fetch_resampled_ohlcv(self, fetch_ohlcv, symbol, *args, **kwargs):
+        timeframe, since, limit, params = self.ohlcv_arguments(args, kwargs)
+        if (timeframe is None) or (timeframe in self.timeframes):
+            return await fetch_ohlcv(symbol, *args, **kwargs)
+        params = params or {}
+        source = self.resample_timeframe(timeframe)
+        if source is None:
+            self.raise_error(NotSupported, details='fetch_ohlcv() does not support the ' + timeframe + ' timeframe')
+        since, until, source_limit = self.resample_window(source, timeframe, since, limit)
+        candles = await self.fetch_ohlcv_window(symbol, source, since, until, source_limit, params, fetch_ohlcv)
+        return self.format_ohlcvs(self.resample_ohlcv(candles, source, timeframe))
+
+    async def fetch_trade_columns(self, fetch_trades, *args, **kwargs):
+        return self.trade_columns(await fetch_trades(*args, **kwargs))
+
+    async def fetch_cached_ohlcv(self, fetch_ohlcv, symbol, *args, **kwargs):
+        timeframe, since, limit, params = self.ohlcv_arguments(args, kwargs)
+        if params or (timeframe is None):
+            return await fetch_ohlcv(symbol, *args, **kwargs)
+        params = {}
+        await self.load_markets()
+        duration = self.parse_timeframe(timeframe) * 1000
+        cached = self.ohlcvCache.read(self.id, symbol, timeframe)
+        fetched = []
+        if (cached is None) or (len(cached) == 0):
+            if since is None:
+                fetched = self.ohlcv_rows(await fetch_ohlcv(symbol, *args, **kwargs))
+            else:
+                fetched = await self.fetch_ohlcv_window(symbol, timeframe, since, self.milliseconds(), limit, params, fetch_ohlcv)
+        else:
+            first, last = int(cached[0, 0]), int(cached[-1, 0])
+            if (since is None) or (limit is None) or (since + limit * duration > last):
+                fetched = await self.fetch_ohlcv_window(symbol, timeframe, last, self.milliseconds(), limit, params, fetch_ohlcv)
+            if (since is None) and (limit is not None):
+                since = (fetched[-1][0] if fetched else last) - (limit - 1) * duration
+            if (since is not None) and (since < first):
+                fetched = (await self.fetch_ohlcv_window(symbol, timeframe, since, first, limit, params, fetch_ohlcv)) + fetched
+        return self.update_cached_ohlcv(symbol, timeframe, cached, fetched, since, limit)
+
     async def fetch_full_tickers(self, symbols=None, params={}):
         return await self.fetch_tickers(symbols, params)
 
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from asyncio import Queue, sleep, Future, ensure_future, get_event_loop
-from time import time
+from asyncio import get_event_loop
+from collections import deque
+from time import monotonic
 
 __all__ = [
     'throttle',
@@ -9,42 +10,60 @@ __all__ = [
 
 
 def throttle(config=None):
+    """A token bucket that releases the queued calls from a single timer
+
+    The bucket holds up to capacity tokens and refills at refillRate tokens per millisecond. A call
+    proceeds as soon as the balance is positive and then takes its cost from it, which may leave the
+    balance negative until it is refilled. Instead of polling, the timer is armed for the exact moment
+    when the balance of the bucket will allow the call at the head of the queue to proceed.
+    """
 
     cfg = {
-        'lastTimestamp': time(),
+        'lastTimestamp': monotonic(),
         'numTokens': 0,
-        'running': False,
-        'queue': Queue(),
-        'loop': get_event_loop(),
-        'delay': 0.001,
+        'queue': deque(),
+        'timer': None,
+        'loop': None,
         'refillRate': 0.001,
         'defaultCost': 1.000,
         'capacity': 1.000,
     }
 
-    cfg.update(config)
-
-    async def run():
-        if not cfg['running']:
-            cfg['running'] = True
-            while not cfg['queue'].empty():
-                now = time()
-                elapsed = (now - cfg['lastTimestamp'])
-                cfg['lastTimestamp'] = now
-                cfg['numTokens'] = min(cfg['capacity'], cfg['numTokens'] + elapsed * cfg['refillRate'] * 1000)
-                if cfg['numTokens'] > 0:
-                    if not cfg['queue'].empty():
-                        cost, future = cfg['queue'].get_nowait()
-                        cfg['numTokens'] -= (cost if cost else cfg['defaultCost'])
-                        if not future.done():
-                            future.set_result(None)
-                await sleep(cfg['delay'])
-            cfg['running'] = False
+    cfg.update(config or {})
+
+    loop = cfg['loop'] or get_event_loop()
+    queue = cfg['queue']
+
+    def refill():
+        now = monotonic()
+        elapsed = now - cfg['lastTimestamp']
+        cfg['lastTimestamp'] = now
+        cfg['numTokens'] = min(cfg['capacity'], cfg['numTokens'] + elapsed * cfg['refillRate'] * 1000)
+
+    def release():
+        cfg['timer'] = None
+        refill()
+        while queue:
+            cost, future = queue[0]
+            if future.done():
+                # the awaiting task was cancelled, it does not take any tokens
+                queue.popleft()
+            elif cfg['numTokens'] > 0:
+                queue.popleft()
+                cfg['numTokens'] -= cost
+                future.set_result(None)
+            else:
+                # sleep until the balance is positive again, the timer may fire a bit early (within the
+                # resolution of the loop clock), in which case release() arms the timer once more
+                delay = -cfg['numTokens'] / (cfg['refillRate'] * 1000)
+                cfg['timer'] = loop.call_later(delay, release)
+                break
 
     def throttle(cost=None):
-        future = Future()
-        cfg['queue'].put_nowait((cost, future))
-        ensure_future(run())
+        future = loop.create_future()
+        queue.append((cfg['defaultCost'] if cost is None else cost, future))
+        if cfg['timer'] is None:
+            release()
         return future
 
     return throttle
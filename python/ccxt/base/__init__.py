@@ -23,6 +23,8 @@
 from ccxt.base import errors
 from ccxt.base import exchange
 from ccxt.base import decimal_to_precision
+from ccxt.base import order_book
+from ccxt.base import ohlcv_cache
 
 from ccxt.base.errors import BaseError                  # noqa: F401
 from ccxt.base.errors import ExchangeError              # noqa: F401
@@ -50,4 +52,4 @@ from ccxt.base.errors import NullResponse               # noqa: F401
 from ccxt.base.errors import OrderImmediatelyFillable   # noqa: F401
 from ccxt.base.errors import OrderNotFillable           # noqa: F401
 
-__all__ = exchange.__all__ + decimal_to_precision.__all__ + errors.__all__  # noqa: F405
+__all__ = exchange.__all__ + decimal_to_precision.__all__ + order_book.__all__ + ohlcv_cache.__all__ + errors.__all__  # noqa: F405
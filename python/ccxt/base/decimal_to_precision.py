@@ -1,6 +1,8 @@
 import decimal
 import numbers
 import itertools
+import re
+import sys
 
 __all__ = [
     'TRUNCATE',
@@ -10,6 +12,7 @@ __all__ = [
     'NO_PADDING',
     'PAD_WITH_ZERO',
     'decimal_to_precision',
+    'decimals_to_precision',
 ]
 
 
@@ -26,48 +29,111 @@ NO_PADDING = 4
 PAD_WITH_ZERO = 5
 
 
+# the decimal context used for all calculations, the global context of the user is never modified
+# all default traps plus decimal.Underflow (raised when a number is rounded to zero)
+# rounding 0.5 away from zero
+context = decimal.Context(prec=28, rounding=decimal.ROUND_HALF_UP, traps=[
+    decimal.InvalidOperation,
+    decimal.DivisionByZero,
+    decimal.Overflow,
+    decimal.Underflow,
+])
+
+# numbers that do not change when converted to a Decimal and back to a string with '{:f}'
+plain_number = re.compile(r'^-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?$')
+
+# quantizer functions memoized by (rounding_mode, precision, counting_mode, padding_mode)
+quantizers = {}
+
+powers_of_10 = {}
+
+
+def power_of_10(x):
+    if x not in powers_of_10:
+        powers_of_10[x] = context.power(decimal.Decimal('10'), -x)
+    return powers_of_10[x]
+
+
 def decimal_to_precision(n, rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
-    assert precision is not None and isinstance(precision, numbers.Integral)
-    assert rounding_mode in [TRUNCATE, ROUND]
-    assert counting_mode in [DECIMAL_PLACES, SIGNIFICANT_DIGITS]
-    assert padding_mode in [NO_PADDING, PAD_WITH_ZERO]
+    key = (rounding_mode, precision, counting_mode, padding_mode)
+    quantize = quantizers.get(key)
+    if quantize is None:
+        assert precision is not None and isinstance(precision, numbers.Integral)
+        assert rounding_mode in [TRUNCATE, ROUND]
+        assert counting_mode in [DECIMAL_PLACES, SIGNIFICANT_DIGITS]
+        assert padding_mode in [NO_PADDING, PAD_WITH_ZERO]
+        quantize = quantizers[key] = quantizer(rounding_mode, precision, counting_mode, padding_mode)
+    return quantize(n)
 
-    context = decimal.getcontext()
 
+def quantizer(rounding_mode, precision, counting_mode, padding_mode):
     precision = min(context.prec - 2, precision)
 
-    # all default except decimal.Underflow (raised when a number is rounded to zero)
-    context.traps[decimal.Underflow] = True
-    context.rounding = decimal.ROUND_HALF_UP  # rounds 0.5 away from zero
+    if counting_mode == SIGNIFICANT_DIGITS or precision < 0:
+        return lambda n: to_precision(n, rounding_mode, precision, counting_mode, padding_mode)
+
+    def quantize(n):
+        # the fast path works on the digits of plain numbers directly and skips the Decimal conversions,
+        # the repr of a float is plain unless it is in scientific notation, inf or nan
+        string = str(n)
+        if type(n) is float:
+            plain = ('e' not in string) and ('n' not in string)
+        else:
+            plain = plain_number.match(string) is not None
+        if not plain or (len(string) + precision >= context.prec):
+            return to_precision(n, rounding_mode, precision, counting_mode, padding_mode)
+        before, after = string.split('.') if '.' in string else (string, '')
+        if rounding_mode == ROUND:
+            if len(after) > precision:
+                # round half up (away from zero) by the first dropped digit, like Decimal.quantize
+                negative = before[0] == '-'
+                digits = (before[1:] if negative else before) + after[:precision]
+                if after[precision] >= '5':
+                    digits = str(int(digits) + 1).zfill(len(digits))
+                dot = len(digits) - precision
+                precise = ('-' if negative else '') + digits[:dot] + ('.' + digits[dot:] if precision > 0 else '')
+            elif precision > 0:
+                precise = before + '.' + after.ljust(precision, '0')
+            else:
+                precise = before
+            if precise == '-0':
+                precise = precise[1:]
+        else:
+            precise = before + '.' + after[:precision]
+            if precise == '-0.':
+                precise = precise[1:]
+            precise = precise.rstrip('.')
+        return pad(precise, precision, counting_mode, padding_mode)
+
+    return quantize
+
 
+def to_precision(n, rounding_mode, precision, counting_mode, padding_mode):
     dec = decimal.Decimal(str(n))
     string = '{:f}'.format(dec)  # convert to string using .format to avoid engineering notation
     precise = None
 
-    def power_of_10(x):
-        return decimal.Decimal('10') ** (-x)
-
     if precision < 0:
         to_nearest = power_of_10(precision)
         if rounding_mode == ROUND:
-            return "{:f}".format(to_nearest * decimal.Decimal(decimal_to_precision(dec / to_nearest, rounding_mode, 0, DECIMAL_PLACES, padding_mode)))
+            return "{:f}".format(context.multiply(to_nearest, decimal.Decimal(decimal_to_precision(context.divide(dec, to_nearest), rounding_mode, 0, DECIMAL_PLACES, padding_mode))))
         elif rounding_mode == TRUNCATE:
-            return decimal_to_precision(dec - dec % to_nearest, rounding_mode, 0, DECIMAL_PLACES, padding_mode)
+            return decimal_to_precision(context.subtract(dec, context.remainder(dec, to_nearest)), rounding_mode, 0, DECIMAL_PLACES, padding_mode)
 
     if rounding_mode == ROUND:
         if counting_mode == DECIMAL_PLACES:
-            precise = '{:f}'.format(dec.quantize(power_of_10(precision)))  # ROUND_HALF_EVEN is default context
+            precise = '{:f}'.format(dec.quantize(power_of_10(precision), context=context))
         elif counting_mode == SIGNIFICANT_DIGITS:
             q = precision - dec.adjusted() - 1
             sigfig = power_of_10(q)
             if q < 0:
                 string_to_precision = string[:precision]
                 # string_to_precision is '' when we have zero precision
-                below = sigfig * decimal.Decimal(string_to_precision if string_to_precision else '0')
-                above = below + sigfig
-                precise = '{:f}'.format(min((below, above), key=lambda x: abs(x - dec)))
+                below = context.multiply(sigfig, decimal.Decimal(string_to_precision if string_to_precision else '0'))
+                above = context.add(below, sigfig)
+                precise = '{:f}'.format(min((below, above), key=lambda x: context.abs(context.subtract(x, dec))))
             else:
-                precise = '{:f}'.format(dec.quantize(sigfig))
+                precise = '{:f}'.format(dec.quantize(sigfig, context=context))
         if precise == ('-0.' + len(precise) * '0')[:2] or precise == '-0':
             precise = precise[1:]
 
@@ -93,6 +159,10 @@ def decimal_to_precision(n, rounding_mode=ROUND, precision=None, counting_mode=D
             precise = precise[1:]
         precise = precise.rstrip('.')
 
+    return pad(precise, precision, counting_mode, padding_mode)
+
+
+def pad(precise, precision, counting_mode, padding_mode):
     if padding_mode == NO_PADDING:
         return precise.rstrip('0').rstrip('.') if '.' in precise else precise
     elif padding_mode == PAD_WITH_ZERO:
@@ -116,6 +186,72 @@ def decimal_to_precision(n, rounding_mode=ROUND, precision=None, counting_mode=D
             return precise
 
 
+def decimals_to_precision(array, rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
+    """Converts a sequence of numbers in one pass, returns a list of strings or a float array for a numpy array"""
+    # numpy is imported if there is an array, because it takes longer to import than ccxt
+    if ('numpy' in sys.modules) and isinstance(array, sys.modules['numpy'].ndarray):
+        return numpy_to_precision(array, rounding_mode, precision, counting_mode)
+    if not len(array):
+        return []
+    # the first call validates the arguments and memoizes the quantizer for all other values
+    first = decimal_to_precision(array[0], rounding_mode, precision, counting_mode, padding_mode)
+    quantize = quantizers[(rounding_mode, precision, counting_mode, padding_mode)]
+    return [first] + [quantize(n) for n in array[1:]]
+
+
+def numpy_to_precision(array, rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES):
+    assert precision is not None and isinstance(precision, numbers.Integral)
+    assert rounding_mode in [TRUNCATE, ROUND]
+    assert counting_mode in [DECIMAL_PLACES, SIGNIFICANT_DIGITS]
+    import numpy
+    array = numpy.asarray(array, dtype=numpy.float64)
+    with numpy.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        return numpy_round(array, rounding_mode, precision, counting_mode)
+
+
+def numpy_round(array, rounding_mode, precision, counting_mode):
+    import numpy
+    magnitude = numpy.abs(array)
+    if counting_mode == DECIMAL_PLACES:
+        exponent = numpy.full(array.shape, precision, dtype=numpy.float64)
+    else:
+        digits = numpy.floor(numpy.log10(magnitude)) + 1
+        digits = numpy.where(magnitude > 0, digits, 1)
+        # log10 is inexact for some numbers right below or above a power of 10
+        digits = numpy.where(magnitude < numpy.power(10.0, digits - 1), digits - 1, digits)
+        digits = numpy.where(magnitude >= numpy.power(10.0, digits), digits + 1, digits)
+        exponent = precision - digits
+    # scaling by powers of ten is exact for integers up to 10 ** 22, divide by the power of ten instead of
+    # multiplying by its inexact inverse, so that the results are the closest floats to the decimal results
+    scale = numpy.power(10.0, numpy.abs(exponent))
+    positive = exponent >= 0
+    scaled = numpy.where(positive, magnitude * scale, magnitude / scale)
+    # above 2 ** 43 a float has too few fractional bits left to tell which side of the rounding boundary it is on,
+    # and the powers of ten above 10 ** 22 are not exact, so those values are rounded by decimal_to_precision()
+    inexact = numpy.isfinite(scaled) & ((scaled >= 2.0 ** 43) | (exponent > 22))
+    # the values a few ulps away from a rounding boundary, a half for ROUND and an integer for TRUNCATE, may be
+    # decimal numbers like 1.005 that floats can not represent exactly, or be just below the boundary like
+    # 6.049999999999999, so they are converted from their shortest repr like decimal_to_precision() does,
+    # unless they are exactly on the boundary and scale back to the same float
+    boundary = (numpy.floor(scaled) + 0.5) if rounding_mode == ROUND else numpy.round(scaled)
+    exact = (scaled == boundary) & (numpy.where(positive, scaled / scale, scaled * scale) == magnitude)
+    inexact |= (numpy.abs(scaled - boundary) <= 8 * numpy.spacing(scaled)) & ~exact
+    if rounding_mode == ROUND:
+        if counting_mode == SIGNIFICANT_DIGITS:
+            # the digits of the integer part are rounded to the nearest of the numbers below and above,
+            # the one below on a tie, like decimal_to_precision() does
+            scaled = numpy.where(positive, numpy.floor(scaled + 0.5), numpy.ceil(scaled - 0.5))
+        else:
+            scaled = numpy.floor(scaled + 0.5)  # rounds 0.5 away from zero
+    else:
+        scaled = numpy.floor(scaled)
+    result = numpy.copysign(numpy.where(positive, scaled / scale, scaled * scale), array)
+    if inexact.any():
+        indices = numpy.nonzero(inexact)
+        result[indices] = [float(decimal_to_precision(x, rounding_mode, precision, counting_mode)) for x in array[indices].tolist()]
+    return result
+
+
 def number_to_string(x):
     # avoids scientific notation for too large and too small numbers
     d = decimal.Decimal(str(x))
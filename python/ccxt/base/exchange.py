@@ -11,6 +11,7 @@ __version__ = '1.18.497'
 from ccxt.base.errors import ExchangeError
 from ccxt.base.errors import NetworkError
 from ccxt.base.errors import NotSupported
+from ccxt.base.errors import ArgumentsRequired
 from ccxt.base.errors import AuthenticationError
 from ccxt.base.errors import DDoSProtection
 from ccxt.base.errors import RequestTimeout
@@ -20,11 +21,18 @@ from ccxt.base.errors import InvalidAddress
 # -----------------------------------------------------------------------------
 
 from ccxt.base.decimal_to_precision import decimal_to_precision
+from ccxt.base.decimal_to_precision import decimals_to_precision
 from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TRUNCATE, ROUND
 from ccxt.base.decimal_to_precision import number_to_string
 
 # -----------------------------------------------------------------------------
 
+from ccxt.base.throttle import throttle
+from ccxt.base.json_stream import JsonStream
+from ccxt.base.ohlcv_cache import OHLCVCache
+
+# -----------------------------------------------------------------------------
+
 __all__ = [
     'Exchange',
 ]
@@ -37,6 +45,7 @@ import logging
 import base64
 import calendar
 import collections
+import copy
 import datetime
 from email.utils import parsedate
 import functools
@@ -47,13 +56,18 @@ import io
 import json
 import math
 from numbers import Number
+import operator
+import random
 import re
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.utils import default_user_agent
 from requests.exceptions import HTTPError, Timeout, TooManyRedirects, RequestException
-# import socket
+import socket
+import sys
 from ssl import SSLError
 # import sys
+import threading
 import time
 import uuid
 import zlib
@@ -78,6 +92,82 @@ try:
 except ImportError:
     import urllib as _urlencode          # Python 2
 
+# -----------------------------------------------------------------------------
+# json decoders, the first one installed is the default, json from the standard library is the fallback
+
+json_decoders = collections.OrderedDict()
+
+try:
+    import orjson
+    json_decoders['orjson'] = orjson.loads
+except ImportError:
+    pass
+
+try:
+    import ujson
+    json_decoders['ujson'] = ujson.loads
+except ImportError:
+    pass
+
+try:
+    import rapidjson
+    json_decoders['rapidjson'] = rapidjson.loads
+except ImportError:
+    pass
+
+json_decoders['json'] = json.loads
+
+# -----------------------------------------------------------------------------
+# the hmac objects keyed with the secrets by (secret, algorithm), a new secret gets a new entry
+
+hmac_keys = collections.OrderedDict()
+hmac_keys_limit = 64  # the oldest entries are dropped above this number
+
+# -----------------------------------------------------------------------------
+# the columns format of the candles and the trades, a dict of numpy arrays by field
+
+ohlcv_columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+trade_column_types = {'timestamp': 'int64', 'price': 'float64', 'amount': 'float64', 'cost': 'float64', 'side': 'int8'}  # others are objects
+trade_sides = {'buy': 1, 'sell': -1}  # the side column, 0 for an unknown side
+
+# -----------------------------------------------------------------------------
+
+
+class SocketOptionsAdapter(HTTPAdapter):
+    """A requests adapter that sets socket options on the pooled connections"""
+
+    def __init__(self, socket_options=None, **kwargs):
+        self.socket_options = socket_options
+        super(SocketOptionsAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs['socket_options'] = self.socket_options
+        super(SocketOptionsAdapter, self).init_poolmanager(*args, **kwargs)
+
+
+# -----------------------------------------------------------------------------
+
+
+def import_numpy():
+    """Returns numpy or None, it is imported by the array paths only, because it takes longer to import than ccxt"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def is_ndarray(value):
+    """Tells whether a value is a numpy array without importing numpy, there are no arrays before it is imported"""
+    return ('numpy' in sys.modules) and isinstance(value, sys.modules['numpy'].ndarray)
+
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None  # the futures backport is optional in Python 2, the windows are fetched one by one
+
 # -----------------------------------------------------------------------------
 # web3/0x imports
 
@@ -99,11 +189,14 @@ class Exchange(object):
 
     # rate limiter settings
     enableRateLimit = False
+    adaptiveRateLimit = False  # slows the rate limiter down in response to the rate limit headers and push backs
     rateLimit = 2000  # milliseconds = seconds * 1000
     timeout = 10000   # milliseconds = seconds * 1000
     asyncio_loop = None
     aiohttp_proxy = None
     aiohttp_trust_env = False
+    aiohttp_shared_connector = False  # the async instances share one connector per event loop and settings
+    aiohttp_connector_options = None  # TCPConnector settings, like {'limit_per_host': 10, 'ttl_dns_cache': 300}
     session = None  # Session () by default
     logger = None  # logging.getLogger(__name__) by default
     userAgent = None
@@ -135,6 +228,8 @@ class Exchange(object):
     ids = None
     tickers = None
     api = None
+    timeframes = None
+    _endpoints = {}  # rate limiter metadata of the api endpoints, see define_rest_api()
     parseJsonResponse = True
     proxy = ''
     origin = '*'  # CORS origin
@@ -254,21 +349,45 @@ class Exchange(object):
         'withdraw': False,
     }
     precisionMode = DECIMAL_PLACES
+    numericMode = 'float'  # 'float', 'decimal' or 'string', the type of the numbers parsed from the responses
+    ohlcvLimit = 500  # the number of candles per request of fetch_ohlcv_range(), up to the maximum of the exchange
+    ohlcvConcurrency = 4  # the number of requests of fetch_ohlcv_range() in flight
+    ohlcvCache = None  # an OHLCVCache or the path of one, fetch_ohlcv() fetches only the candles that are not cached
+    fetch_uncached_ohlcv = None  # the fetch_ohlcv() under the cache, set with the cache
+    ohlcvResample = True  # fetch_ohlcv() aggregates the candles of a shorter timeframe for the timeframes the exchange lacks
+    orderBookArrays = False  # parse_order_book() returns the bids and the asks in numpy arrays of shape (n, 2)
+    ohlcvFormat = 'lists'  # 'lists' or 'columns', the candles of parse_ohlcvs() in a dict of numpy arrays by column
+    tradesFormat = 'dicts'  # 'dicts' or 'columns', the trades of fetch_trades() and fetch_my_trades() in a dict of numpy arrays by field
+    tradesColumns = ['timestamp', 'price', 'amount', 'side']  # the fields kept in the columns format, like 'id', 'datetime' or 'info'
+    numericContext = None  # the mode of the parsers running in the current thread
+    numericParsers = ['parse_trade', 'parse_order', 'parse_ticker', 'parse_transaction', 'parse_ledger_entry']
     minFundingAddressLength = 1  # used in check_address
     substituteCommonCurrencyCodes = True
     lastRestRequestTimestamp = 0
+    throttle = None
+    throttles = None
     lastRestPollTimestamp = 0
     restRequestQueue = None
     restPollerLoopIsRunning = False
     rateLimitTokens = 16
     rateLimitMaxTokens = 16
     rateLimitUpdateTime = 0
+    rateLimitSlowdown = 1.0  # the multiplier of the rate limiter cost of requests in the adaptive mode
+    rateLimitResumeTime = 0  # no requests are sent before this timestamp in the adaptive mode
+    rateLimitPushbacks = 0  # the number of consecutive push backs in the adaptive mode
+    jsonDecoder = list(json_decoders.keys())[0]  # the name of one of the json_decoders
     enableLastHttpResponse = True
     enableLastJsonResponse = True
     enableLastResponseHeaders = True
+    rawMode = False  # the generated api methods return the undecoded response bodies, see fetch()
+    streamChunkSize = 65536  # the number of bytes read at once from a streamed response
+    leanMode = False  # only the last_response_info of the successful responses is kept
+    lastResponseMaxSize = None  # the successful responses longer than this number of characters are not kept, None for no limit
+    lastResponseInfoHeaders = ['Content-Type', 'Content-Length', 'Date', 'Retry-After', 'X-RateLimit-Remaining', 'X-RateLimit-Limit', 'X-MBX-USED-WEIGHT', 'X-MBX-USED-WEIGHT-1M']
     last_http_response = None
     last_json_response = None
     last_response_headers = None
+    last_response_info = None
 
     requiresWeb3 = False
     web3 = None
@@ -304,31 +423,60 @@ class Exchange(object):
 
         self.userAgent = default_user_agent()
 
-        settings = self.deep_extend(self.describe(), config)
-
-        for key in settings:
-            if hasattr(self, key) and isinstance(getattr(self, key), dict):
-                setattr(self, key, self.deep_extend(getattr(self, key), settings[key]))
-            else:
-                setattr(self, key, settings[key])
-
-        if self.api:
+        # describe() and its merge with the default class properties are done once per class
+        cls = type(self)
+        if '_description' not in cls.__dict__:
+            cls._raw_description = self.describe()
+            cls._description = {}
+            for key, value in cls._raw_description.items():
+                if isinstance(getattr(self, key, None), dict):
+                    value = self.deep_extend(getattr(self, key), value)
+                cls._description[key] = value
+
+        # the static metadata is shared by all instances of the class and must not be mutated,
+        # all other nested properties are copied, because they are often modified by instances
+        shared = ('api', 'exceptions', 'timeframes')
+
+        for key, value in cls._description.items():
+            if key not in config:
+                setattr(self, key, value if key in shared else copy.deepcopy(value))
+
+        # user settings are merged into new copies and never modify the shared class description
+        for key in config:
+            value = cls._raw_description[key] if key in cls._raw_description else None
+            value = self.deep_extend(value if key in shared else copy.deepcopy(value), config[key])
+            if isinstance(getattr(self, key, None), dict):
+                value = self.deep_extend(getattr(self, key), value)
+            setattr(self, key, value)
+
+        # the generated api methods and the camelcase aliases of all methods depend on the class only
+        # they are defined once per class, unless the api is overridden by the user in the config
+        define_class_methods = ('api' in config) or ('_underscore_properties' not in cls.__dict__)
+
+        if self.api and define_class_methods:
             self.define_rest_api(self.api, 'request')
 
         if self.markets:
             self.set_markets(self.markets)
 
+        if define_class_methods:
+            cls._underscore_properties = cls.define_camelcase_methods()
+
+        if self.numericMode != 'float':
+            self.set_numeric_mode()
+
+        if self.ohlcvCache is not None:
+            self.set_ohlcv_cache(self.ohlcvCache)
+        elif self.ohlcvResample and self.timeframes:
+            self.define_fetch_ohlcv()
+
+        if self.tradesFormat != 'dicts':
+            self.define_fetch_trades()
+
         # convert all properties from underscore notation foo_bar to camelcase notation fooBar
-        cls = type(self)
-        for name in dir(self):
-            if name[0] != '_' and name[-1] != '_' and '_' in name:
-                parts = name.split('_')
-                camelcase = parts[0] + ''.join(self.capitalize(i) for i in parts[1:])
-                attr = getattr(self, name)
-                if isinstance(attr, types.MethodType):
-                    setattr(cls, camelcase, getattr(cls, name))
-                else:
-                    setattr(self, camelcase, attr)
+        names = cls._underscore_properties + [name for name in self.__dict__ if Exchange.is_underscore_name(name)]
+        for name in names:
+            setattr(self, Exchange.underscore_to_camelcase(name), getattr(self, name))
 
         self.tokenBucket = self.extend({
             'refillRate': 1.0 / self.rateLimit,
@@ -337,7 +485,55 @@ class Exchange(object):
             'defaultCost': 1.0,
         }, getattr(self, 'tokenBucket') if hasattr(self, 'tokenBucket') else {})
 
-        self.session = self.session if self.session else Session()
+        # named buckets limit groups of endpoints separately, for example public, private and order endpoints
+        self.tokenBuckets = dict([(name, self.extend(self.tokenBucket, bucket)) for name, bucket in (getattr(self, 'tokenBuckets', None) or {}).items()])
+        self.init_rest_rate_limiter()
+
+        self.rateLimitFeedback = self.extend({
+            'statusCodes': [418, 429],  # the http status codes of push backs
+            'usageHeaders': {  # the rate limit headers mapped to the limits they count up to
+                'X-MBX-USED-WEIGHT': 1200,
+                'X-MBX-USED-WEIGHT-1M': 1200,
+            },
+            'usageThreshold': 0.8,  # the rate limiter slows down once this fraction of a limit is used
+            'backoff': 2.0,  # the slowdown is multiplied by this factor on every push back
+            'recovery': 0.1,  # and decreased by this amount on every other response until it is back to 1
+            'maxSlowdown': 16.0,
+            'delay': 1000,  # the pause after a push back without a Retry-After header, doubled on consecutive ones
+            'maxDelay': 60000,
+            'jitter': 0.25,  # pauses are randomly extended by up to this fraction
+        }, getattr(self, 'rateLimitFeedback') if hasattr(self, 'rateLimitFeedback') else {})
+
+        self.retryPolicy = self.extend({
+            'maxRetries': 0,  # the number of retries of a failed request, retrying is disabled by default
+            'exceptions': [RequestTimeout, ExchangeNotAvailable, DDoSProtection],
+            'methods': ['GET', 'HEAD', 'OPTIONS'],  # idempotent methods, other endpoints are retried if marked {'safe': True}
+            'delay': 500,  # doubled on every retry of a request
+            'maxDelay': 10000,
+            'jitter': 0.25,  # delays are randomly extended by up to this fraction
+            'ddosBackoff': 4.0,  # the delay after a DDoSProtection error, a push back of the exchange, is multiplied by this factor
+            'budget': 10,  # the maximum number of retries of all requests within the window
+            'budgetWindow': 60000,
+        }, getattr(self, 'retryPolicy') if hasattr(self, 'retryPolicy') else {})
+        self.retryTimestamps = collections.deque()
+        self.retryMetrics = {
+            'retries': 0,  # the number of retries
+            'recovered': 0,  # the number of requests that succeeded after retrying
+            'exhausted': 0,  # the number of requests that failed after maxRetries retries
+            'overBudget': 0,  # the number of requests that were not retried, because the budget was spent
+        }
+
+        self.sessionOptions = self.extend({
+            'poolConnections': 10,  # the number of hosts to keep pools of connections for
+            'poolMaxSize': 10,  # the number of connections kept open per host
+            'poolBlock': False,  # if True, threads wait for a free connection instead of opening more than poolMaxSize
+            'tcpNoDelay': True,
+            'keepAlive': False,  # sends TCP keep-alive probes on idle connections
+            'keepAliveIdle': 60,  # seconds before the first probe, where supported by the platform
+            'clearCookies': True,  # the cookies of the session are cleared before every request
+        }, getattr(self, 'sessionOptions') if hasattr(self, 'sessionOptions') else {})
+
+        self.session = self.session if self.session else self.create_session(self.sessionOptions)
         self.logger = self.logger if self.logger else logging.getLogger(__name__)
 
         if self.requiresWeb3 and Web3 and not self.web3:
@@ -348,6 +544,24 @@ class Exchange(object):
         if self.session:
             self.session.close()
 
+    @staticmethod
+    def create_session(options):
+        """Returns a requests session with the connection pools configured by the sessionOptions"""
+        socket_options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if options['tcpNoDelay'] else 0)]
+        if options['keepAlive']:
+            socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            if hasattr(socket, 'TCP_KEEPIDLE'):
+                socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, int(options['keepAliveIdle'])))
+        adapter = SocketOptionsAdapter(
+            socket_options=socket_options,
+            pool_connections=options['poolConnections'],
+            pool_maxsize=options['poolMaxSize'],
+            pool_block=options['poolBlock'])
+        session = Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
     def describe(self):
         return {}
 
@@ -366,13 +580,19 @@ class Exchange(object):
     def define_rest_api(cls, api, method_name, options={}):
         delimiters = re.compile('[^a-zA-Z0-9]')
         entry = getattr(cls, method_name)  # returns a function (instead of a bound method)
+        endpoints = {}
         for api_type, methods in api.items():
             for http_method, urls in methods.items():
+                # the paths are either listed or mapped to their rate limiter cost (a number)
+                # or to a dictionary like {'cost': 5, 'bucket': 'orders'} for weighted rate limiting
                 for url in urls:
+                    metadata = urls[url] if isinstance(urls, dict) else None
                     url = url.strip()
                     split_path = delimiters.split(url)
 
                     uppercase_method = http_method.upper()
+                    if metadata is not None:
+                        endpoints[(api_type, uppercase_method, url)] = metadata if isinstance(metadata, dict) else {'cost': metadata}
                     lowercase_method = http_method.lower()
                     camelcase_method = lowercase_method.capitalize()
                     camelcase_suffix = ''.join([Exchange.capitalize(x) for x in split_path])
@@ -392,12 +612,17 @@ class Exchange(object):
                         outer_kwargs = {'path': url, 'api': api_type, 'method': uppercase_method}
 
                         @functools.wraps(entry)
-                        def inner(_self, params=None):
+                        def inner(_self, params=None, raw=None, stream=None):
                             """
                             Inner is called when a generated method (publicGetX) is called.
                             _self is a reference to self created by function.__get__(exchange, type(exchange))
                             https://en.wikipedia.org/wiki/Closure_(computer_programming) equivalent to functools.partial
                             """
+                            raw = _self.rawMode if raw is None else raw
+                            if raw or (stream is not None):
+                                # the raw and streamed responses skip the request() of the exchange, it checks the decoded json
+                                config = {'stream': stream} if stream is not None else {'raw': True}
+                                return _self.fetch2(params=params or {}, config=config, **outer_kwargs)
                             inner_kwargs = dict(outer_kwargs)  # avoid mutation
                             if params is not None:
                                 inner_kwargs['params'] = params
@@ -406,6 +631,30 @@ class Exchange(object):
                     to_bind = partialer()
                     setattr(cls, camelcase, to_bind)
                     setattr(cls, underscore, to_bind)
+        cls._endpoints = endpoints
+
+    @classmethod
+    def define_camelcase_methods(cls):
+        """Adds fooBar aliases for all foo_bar methods to the class, returns the names of non-method properties"""
+        properties = []
+        for name in dir(cls):
+            if Exchange.is_underscore_name(name):
+                # look up the raw class attribute to keep staticmethods and classmethods intact
+                attr = next(klass.__dict__[name] for klass in cls.__mro__ if name in klass.__dict__)
+                if isinstance(attr, (types.FunctionType, staticmethod, classmethod)):
+                    setattr(cls, Exchange.underscore_to_camelcase(name), attr)
+                else:
+                    properties.append(name)
+        return properties
+
+    @staticmethod
+    def is_underscore_name(name):
+        return name[0] != '_' and name[-1] != '_' and '_' in name
+
+    @staticmethod
+    def underscore_to_camelcase(name):
+        parts = name.split('_')
+        return parts[0] + ''.join(Exchange.capitalize(i) for i in parts[1:])
 
     def raise_error(self, exception_type, url=None, method=None, error=None, details=None):
         if error:
@@ -413,20 +662,145 @@ class Exchange(object):
         output = ' '.join([self.id] + [var for var in (url, method, error, details) if var is not None])
         raise exception_type(output)
 
-    def throttle(self):
-        now = float(self.milliseconds())
-        elapsed = now - self.lastRestRequestTimestamp
-        if elapsed < self.rateLimit:
-            delay = self.rateLimit - elapsed
-            time.sleep(delay / 1000.0)
+    def init_rest_rate_limiter(self):
+        # the rate limiters can be passed in the config to share them with other instances
+        created = dict([(name, throttle(bucket)) for name, bucket in self.tokenBuckets.items() if name not in (self.throttles or {})])
+        self.throttles = self.extend(created, self.throttles or {})
+        limiters = list(created.values())
+        if not self.throttle:
+            self.throttle = throttle(self.tokenBucket)
+            limiters.append(self.throttle)
+        # the rate limiters created with the refill rate of rateLimit follow its changes, see apply_rate_limit()
+        self.rateLimitThrottles = [limiter for limiter in limiters if limiter.config['refillRate'] == 1.0 / self.rateLimit]
+        self.rateLimitApplied = self.rateLimit
+
+    def apply_rate_limit(self):
+        """Sets the refill rate of the rate limiters derived from rateLimit, when it was changed after the construction"""
+        if self.rateLimit == self.rateLimitApplied:
+            return
+        previous, refill_rate = 1.0 / self.rateLimitApplied, 1.0 / self.rateLimit
+        for bucket in [self.tokenBucket] + list(self.tokenBuckets.values()):
+            if bucket['refillRate'] == previous:
+                bucket['refillRate'] = refill_rate
+        for limiter in self.rateLimitThrottles:
+            limiter.config['refillRate'] = refill_rate
+        self.rateLimitApplied = self.rateLimit
+
+    def calculate_rate_limiter_cost(self, api, method, path, params, config={}):
+        """Returns the number of rate limiter tokens taken by a request"""
+        endpoint = self._endpoints.get((api, method, path), {})
+        return Exchange.safe_float(config, 'cost', Exchange.safe_float(endpoint, 'cost', self.tokenBucket['defaultCost']))
+
+    def select_throttle(self, api, method, path, config={}):
+        """Returns the rate limiter of the bucket of a request, the bucket is named after the endpoint group or the api"""
+        endpoint = self._endpoints.get((api, method, path), {})
+        name = self.safe_string(config, 'bucket', self.safe_string(endpoint, 'bucket', api))
+        return self.throttles[name] if name in self.throttles else self.throttle
+
+    def rate_limit_usage(self, headers):
+        """Returns the largest used fraction of the limits reported in the response headers or None"""
+        usage = None
+        for header, limit in self.rateLimitFeedback['usageHeaders'].items():
+            used = Exchange.safe_float(headers, header)
+            if used is not None:
+                usage = max(usage or 0, used / limit)
+        remaining = Exchange.safe_float(headers, 'X-RateLimit-Remaining')
+        limit = Exchange.safe_float(headers, 'X-RateLimit-Limit')
+        if (remaining is not None) and limit:
+            usage = max(usage or 0, 1 - remaining / limit)
+        return usage
+
+    def parse_retry_after(self, headers):
+        """Returns the number of milliseconds in the Retry-After header, which holds either seconds or a date"""
+        value = self.safe_string(headers, 'Retry-After')
+        if value is None:
+            return None
+        seconds = Exchange.safe_float({'seconds': value}, 'seconds')
+        if seconds is not None:
+            return seconds * 1000
+        timestamp = self.parse_date(value)
+        return None if timestamp is None else max(0, timestamp - self.milliseconds())
+
+    def handle_rate_limit_feedback(self, http_status_code, headers):
+        """Adapts the rate limiter to the rate limit headers and the push backs of the exchange"""
+        options = self.rateLimitFeedback
+        retry_after = self.parse_retry_after(headers)
+        pushed_back = (http_status_code in options['statusCodes']) or (retry_after is not None)
+        usage = self.rate_limit_usage(headers)
+        if pushed_back or ((usage is not None) and (usage >= options['usageThreshold'])):
+            self.rateLimitSlowdown = min(options['maxSlowdown'], self.rateLimitSlowdown * options['backoff'])
+        else:
+            self.rateLimitSlowdown = max(1.0, self.rateLimitSlowdown - options['recovery'])
+        if pushed_back:
+            self.rateLimitPushbacks += 1
+            delay = retry_after if retry_after is not None else min(options['maxDelay'], options['delay'] * 2 ** (self.rateLimitPushbacks - 1))
+            delay *= 1 + random.uniform(0, options['jitter'])
+            self.rateLimitResumeTime = max(self.rateLimitResumeTime, self.milliseconds() + delay)
+        else:
+            self.rateLimitPushbacks = 0
 
-    def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
+    def retry_delay(self, exception, attempt, api, method, path, config={}):
+        """Returns the number of milliseconds to wait before retrying a failed request or None if it is not retried
+
+        The delay is at least the Retry-After of the error response, the request is not retried if that is above the maxDelay.
+        """
+        policy = self.retryPolicy
+        endpoint = self._endpoints.get((api, method, path), {})
+        if not self.safe_value(config, 'safe', self.safe_value(endpoint, 'safe', method in policy['methods'])):
+            return None
+        if attempt >= policy['maxRetries']:
+            if attempt > 0:
+                self.retryMetrics['exhausted'] += 1
+            return None
+        retry_after = None
+        if not isinstance(exception, RequestTimeout) and self.last_response_info and (self.last_response_info['status'] >= 400):
+            # a timeout has no response, the last one is of an earlier request
+            retry_after = self.parse_retry_after(self.last_response_info['headers'])
+            if (retry_after is not None) and (retry_after > policy['maxDelay']):
+                return None
+        now = self.milliseconds()
+        while self.retryTimestamps and (self.retryTimestamps[0] <= now - policy['budgetWindow']):
+            self.retryTimestamps.popleft()
+        if len(self.retryTimestamps) >= policy['budget']:
+            self.retryMetrics['overBudget'] += 1
+            return None
+        self.retryTimestamps.append(now)
+        self.retryMetrics['retries'] += 1
+        delay = policy['delay'] * 2 ** attempt
+        if isinstance(exception, DDoSProtection):
+            delay *= policy['ddosBackoff']
+        delay = min(policy['maxDelay'], delay * (1 + random.uniform(0, policy['jitter'])))
+        return delay if retry_after is None else max(delay, retry_after)
+
+    def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}):
         """A better wrapper over request for deferred signing"""
-        if self.enableRateLimit:
-            self.throttle()
-        self.lastRestRequestTimestamp = self.milliseconds()
-        request = self.sign(path, api, method, params, headers, body)
-        return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        attempt = 0
+        while True:
+            if self.enableRateLimit:
+                cost = self.calculate_rate_limiter_cost(api, method, path, params, config)
+                if self.adaptiveRateLimit:
+                    delay = self.rateLimitResumeTime - self.milliseconds()
+                    if delay > 0:
+                        time.sleep(delay / 1000.0)
+                    cost *= self.rateLimitSlowdown
+                self.apply_rate_limit()
+                self.select_throttle(api, method, path, config)(cost)
+            self.lastRestRequestTimestamp = self.milliseconds()
+            # every attempt is signed anew, because the signatures of most exchanges include a nonce
+            request = self.sign(path, api, method, params, headers, body)
+            stream = JsonStream(config['stream']) if 'stream' in config else None
+            try:
+                response = self.fetch(request['url'], request['method'], request['headers'], request['body'], self.safe_value(config, 'raw', False), stream)
+            except tuple(self.retryPolicy['exceptions']) as e:
+                delay = self.retry_delay(e, attempt, api, method, path, config)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay / 1000.0)
+                continue
+            if attempt > 0:
+                self.retryMetrics['recovered'] += 1
+            return response
 
     def request(self, path, api='public', method='GET', params={}, headers=None, body=None):
         """Exchange.request is the entry point for all generated methods"""
@@ -467,23 +841,33 @@ class Exchange(object):
         headers.update({'Accept-Encoding': 'gzip, deflate'})
         return headers
 
-    def fetch(self, url, method='GET', headers=None, body=None):
-        """Perform a HTTP request and return decoded JSON data"""
+    def fetch(self, url, method='GET', headers=None, body=None, raw=False, stream=None):
+        """Perform a HTTP request and return decoded JSON data
+
+        With raw=True a successful response is returned as {'status', 'headers', 'body'} with the body in bytes,
+        it is neither decoded to text nor parsed, the failed responses are decoded and handled as usual.
+
+        With a JsonStream a successful response is returned as an iterator over the members parsed by the stream,
+        they are parsed from the body as it arrives, without holding the whole document in memory.
+        """
         request_headers = self.prepare_request_headers(headers)
         url = self.proxy + url
 
         if self.verbose:
             print("\nRequest:", method, url, request_headers, body)
-        self.logger.debug("%s %s, Request: %s %s", method, url, request_headers, body)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s %s, Request: %s %s", method, url, request_headers, body)
 
         if body:
             body = body.encode()
 
-        self.session.cookies.clear()
+        if self.sessionOptions['clearCookies']:
+            self.session.cookies.clear()
 
         response = None
         http_response = None
         json_response = None
+        start = time.time()
         try:
             response = self.session.request(
                 method,
@@ -491,21 +875,31 @@ class Exchange(object):
                 data=body,
                 headers=request_headers,
                 timeout=int(self.timeout / 1000),
-                proxies=self.proxies
+                proxies=self.proxies,
+                stream=stream is not None
             )
-            http_response = response.text
-            json_response = self.parse_json(http_response) if self.is_json_encoded_object(http_response) else None
             headers = response.headers
+            if self.adaptiveRateLimit:
+                self.handle_rate_limit_feedback(response.status_code, headers)
+            if raw and (response.status_code < 400):
+                return self.raw_response(response.status_code, headers, response.content, start)
+            if (stream is not None) and (response.status_code < 400):
+                self.set_last_response(response.status_code, headers, None, None, start)
+                return self.iterate_stream(response, stream, url, method)
+            if (self.jsonDecoder != 'json') and ('json' in headers.get('Content-Type', '')):
+                # the fast decoders parse the bytes directly, the text is decoded as utf-8 without charset detection
+                http_body = response.content
+                http_response = http_body.decode(response.encoding or 'utf-8', 'replace')
+                json_response = self.parse_json(http_body) if self.is_json_encoded_object(http_body) else None
+            else:
+                http_response = response.text
+                json_response = self.parse_json(http_response) if self.is_json_encoded_object(http_response) else None
             # FIXME remove last_x_responses from subclasses
-            if self.enableLastHttpResponse:
-                self.last_http_response = http_response
-            if self.enableLastJsonResponse:
-                self.last_json_response = json_response
-            if self.enableLastResponseHeaders:
-                self.last_response_headers = headers
+            self.set_last_response(response.status_code, headers, http_response, json_response, start)
             if self.verbose:
                 print("\nResponse:", method, url, response.status_code, headers, http_response)
-            self.logger.debug("%s %s, Response: %s %s %s", method, url, response.status_code, headers, http_response)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("%s %s, Response: %s %s %s", method, url, response.status_code, headers, http_response)
             response.raise_for_status()
 
         except Timeout as e:
@@ -531,10 +925,62 @@ class Exchange(object):
 
         self.handle_errors(response.status_code, response.reason, url, method, headers, http_response, json_response)
         self.handle_rest_response(http_response, json_response, url, method, headers, body)
+        self.trim_last_response()
         if json_response is not None:
             return json_response
         return http_response
 
+    def set_last_response(self, status, headers, http_response, json_response, start):
+        """Keeps the response on the instance, the error handlers of the exchanges read it"""
+        self.last_response_info = {
+            'status': status,
+            'size': len(http_response) if http_response is not None else 0,
+            'elapsed': int((time.time() - start) * 1000),  # milliseconds
+            'headers': {header: headers[header] for header in self.lastResponseInfoHeaders if header in headers},
+        }
+        if self.enableLastHttpResponse:
+            self.last_http_response = http_response
+        if self.enableLastJsonResponse:
+            self.last_json_response = json_response
+        if self.enableLastResponseHeaders:
+            self.last_response_headers = headers
+
+    def iterate_stream(self, response, stream, url, method):
+        """Yields the members parsed by the stream from the chunks of the response as they arrive"""
+        try:
+            for chunk in response.iter_content(self.streamChunkSize):
+                for item in stream.feed(chunk):
+                    yield item
+            for item in stream.close():
+                yield item
+        except RequestException as e:
+            self.raise_error(NetworkError, url, method, e)
+        except ValueError as e:
+            self.raise_error(ExchangeError, url, method, e)
+        finally:
+            response.close()
+
+    def raw_response(self, status, headers, body, start):
+        self.set_last_response(status, headers, body, None, start)
+        self.trim_last_response()
+        return {
+            'status': status,
+            'headers': headers,
+            'body': body,
+        }
+
+    def trim_last_response(self):
+        """Drops the body of a successful response in the leanMode or above the lastResponseMaxSize
+
+        The caller gets the response anyway, the copies on the instance would only double the peak memory.
+        """
+        size = self.last_response_info['size']
+        if self.leanMode or ((self.lastResponseMaxSize is not None) and (size > self.lastResponseMaxSize)):
+            self.last_http_response = None
+            self.last_json_response = None
+            if self.leanMode:
+                self.last_response_headers = self.last_response_info['headers']
+
     def handle_rest_errors(self, exception, http_status_code, response, url, method='GET'):
         error = None
         string_code = str(http_status_code)
@@ -560,10 +1006,23 @@ class Exchange(object):
     def parse_json(self, http_response):
         try:
             if Exchange.is_json_encoded_object(http_response):
-                return json.loads(http_response)
+                return self.decode_json(http_response)
         except ValueError:  # superclass of JsonDecodeError (python2)
             pass
 
+    def decode_json(self, input):
+        """Decodes a str or bytes with the jsonDecoder, the standard json handles what it rejects, like NaN or big integers"""
+        if (self.jsonDecoder != 'json') and (self.numericMode == 'float'):
+            try:
+                return json_decoders[self.jsonDecoder](input)
+            except ValueError:
+                pass
+        if self.numericMode != 'float':
+            # the fractional numbers are decoded exactly by the standard json, none of the faster decoders can do that,
+            # into decimals in the string mode too, because the parsers do arithmetic on the raw values
+            return json.loads(input.decode('utf-8') if isinstance(input, bytes) else input, parse_float=Decimal)
+        return json.loads(input.decode('utf-8') if isinstance(input, bytes) else input)
+
     @staticmethod
     def safe_float(dictionary, key, default_value=None):
         value = default_value
@@ -576,6 +1035,73 @@ class Exchange(object):
             value = default_value
         return value
 
+    def set_numeric_mode(self):
+        """Binds the safe_float methods and the parsers of the instance to the numericMode
+
+        In the 'string' mode the parsers listed in numericParsers compute with Decimal numbers,
+        because the exchanges do arithmetic on the parsed values, and their results are converted to strings.
+        """
+        self.numericContext = threading.local()
+        self.safe_float = self.safe_number
+        self.safe_float_2 = self.safe_number_2
+        if self.numericMode == 'string':
+            for name in self.numericParsers:
+                if hasattr(self, name):
+                    setattr(self, name, functools.partial(self.parse_with_decimals, getattr(self, name)))
+
+    def parse_number(self, value, default_value=None):
+        """Converts a number or a numeric string to a float, a Decimal or a string depending on the numericMode"""
+        if value is None:
+            return default_value
+        mode = getattr(self.numericContext, 'mode', None) or self.numericMode
+        try:
+            if mode == 'decimal':
+                if isinstance(value, Decimal):
+                    return value
+                value = Decimal(value if isinstance(value, basestring) else repr(value))
+                return value if value.is_finite() else default_value
+            elif mode == 'string':
+                if isinstance(value, basestring):
+                    float(value)  # rejects the strings that are not numbers
+                    return value
+                return Exchange.decimal_to_string(value) if isinstance(value, Decimal) else number_to_string(value)
+            return float(value)
+        except (ValueError, TypeError, ArithmeticError):
+            return default_value
+
+    def safe_number(self, dictionary, key, default_value=None):
+        """The safe_float of the instances with a numericMode other than 'float'"""
+        if isinstance(dictionary, list) and isinstance(key, int) and len(dictionary) > key:
+            return self.parse_number(dictionary[key], default_value)
+        return self.parse_number(Exchange.safe_value(dictionary, key), default_value)
+
+    def safe_number_2(self, dictionary, key1, key2, default_value=None):
+        return Exchange.safe_either(self.safe_number, dictionary, key1, key2, default_value)
+
+    def parse_with_decimals(self, method, *args):
+        previous = getattr(self.numericContext, 'mode', None)
+        self.numericContext.mode = 'decimal'
+        try:
+            result = method(*args)
+        finally:
+            self.numericContext.mode = previous
+        # a parser called by another parser, like parse_trade by parse_order, returns decimals to its caller
+        return result if previous is not None else Exchange.decimals_to_strings(result)
+
+    @staticmethod
+    def decimal_to_string(value):
+        return '{:f}'.format(value)
+
+    @staticmethod
+    def decimals_to_strings(value):
+        if isinstance(value, Decimal):
+            return Exchange.decimal_to_string(value)
+        elif isinstance(value, dict):
+            return {key: Exchange.decimals_to_strings(item) for key, item in value.items()}
+        elif isinstance(value, list):
+            return [Exchange.decimals_to_strings(item) for item in value]
+        return value
+
     @staticmethod
     def safe_string(dictionary, key, default_value=None):
         return str(dictionary[key]) if key is not None and (key in dictionary) and dictionary[key] is not None else default_value
@@ -793,7 +1319,10 @@ class Exchange(object):
 
     @staticmethod
     def sum(*args):
-        return sum([arg for arg in args if isinstance(arg, (float, int))])
+        numbers = [arg for arg in args if isinstance(arg, (float, int, Decimal))]
+        if any([isinstance(number, Decimal) for number in numbers]):
+            return sum([Decimal(repr(number)) if isinstance(number, float) else number for number in numbers])
+        return sum(numbers)
 
     @staticmethod
     def ordered(array):
@@ -801,6 +1330,13 @@ class Exchange(object):
 
     @staticmethod
     def aggregate(bidasks):
+        if is_ndarray(bidasks):
+            numpy = import_numpy()
+            bidasks = bidasks[bidasks[:, 1] > 0]
+            prices, first, inverse = numpy.unique(bidasks[:, 0], return_index=True, return_inverse=True)
+            volumes = numpy.bincount(inverse.ravel(), weights=bidasks[:, 1], minlength=len(prices))
+            # the levels are kept in the order of the first occurrences of their prices
+            return numpy.column_stack((prices, volumes))[numpy.argsort(first, kind='mergesort')]
         ordered = Exchange.ordered({})
         for [price, volume] in bidasks:
             if volume > 0:
@@ -924,7 +1460,15 @@ class Exchange(object):
 
     @staticmethod
     def hmac(request, secret, algorithm=hashlib.sha256, digest='hex'):
-        h = hmac.new(secret, request, algorithm)
+        # the key is hashed into the inner and outer states once per secret, every signature starts from a copy of them
+        keyed = hmac_keys.get((secret, algorithm))
+        if keyed is None:
+            keyed = hmac.new(secret, None, algorithm)
+            hmac_keys[(secret, algorithm)] = keyed
+            if len(hmac_keys) > hmac_keys_limit:
+                hmac_keys.popitem(last=False)
+        h = keyed.copy()
+        h.update(request)
         if digest == 'hex':
             return h.hexdigest()
         elif digest == 'base64':
@@ -969,6 +1513,8 @@ class Exchange(object):
 
     @staticmethod
     def is_json_encoded_object(input):
+        if isinstance(input, bytes) and not isinstance(input, basestring):
+            return (len(input) >= 2) and (input[:1] in (b'{', b'['))
         return (isinstance(input, basestring) and
                 (len(input) >= 2) and
                 ((input[0] == '{') or (input[0] == '[')))
@@ -1039,6 +1585,12 @@ class Exchange(object):
     def amount_to_precision(self, symbol, amount):
         return self.decimal_to_precision(amount, TRUNCATE, self.markets[symbol]['precision']['amount'], self.precisionMode)
 
+    def prices_to_precision(self, symbol, prices):
+        return decimals_to_precision(prices, ROUND, self.markets[symbol]['precision']['price'], self.precisionMode)
+
+    def amounts_to_precision(self, symbol, amounts):
+        return decimals_to_precision(amounts, TRUNCATE, self.markets[symbol]['precision']['amount'], self.precisionMode)
+
     def fee_to_precision(self, symbol, fee):
         return self.decimal_to_precision(fee, ROUND, self.markets[symbol]['precision']['price'], self.precisionMode)
 
@@ -1196,6 +1748,8 @@ class Exchange(object):
 
     def parse_ohlcvs(self, ohlcvs, market=None, timeframe='1m', since=None, limit=None):
         ohlcvs = self.to_array(ohlcvs)
+        if self.ohlcvFormat == 'columns':
+            return self.parse_ohlcv_columns(ohlcvs, market, timeframe, since, limit)
         num_ohlcvs = len(ohlcvs)
         result = []
         i = 0
@@ -1209,40 +1763,123 @@ class Exchange(object):
             result.append(ohlcv)
         return self.sort_by(result, 0)
 
+    def parse_ohlcv_columns(self, ohlcvs, market=None, timeframe='1m', since=None, limit=None):
+        """Writes the candles of parse_ohlcv() into a preallocated array and returns them in the columns format"""
+        numpy = import_numpy()
+        if numpy is None:
+            self.raise_error(NotSupported, details='the columns format of the candles requires numpy')
+        result = numpy.empty((len(ohlcvs), 6))
+        count = 0
+        for ohlcv in ohlcvs:
+            if limit and (count >= limit):
+                break
+            ohlcv = self.parse_ohlcv(ohlcv, market, timeframe, since, limit)
+            if since and (ohlcv[0] < since):
+                continue
+            result[count] = ohlcv[0:6]  # None values become nan
+            count += 1
+        result = result[:count]
+        return self.format_ohlcvs(result[numpy.argsort(result[:, 0], kind='mergesort')])
+
+    def format_ohlcvs(self, ohlcvs):
+        """Returns the candles, a list or a numpy array of shape (n, 6), in the ohlcvFormat of the instance
+
+        The columns format is a dict of numpy arrays by column, the timestamps are int64 and the others float64.
+        """
+        if self.ohlcvFormat == 'columns':
+            numpy = import_numpy()
+            if numpy is None:
+                self.raise_error(NotSupported, details='the columns format of the candles requires numpy')
+            ohlcvs = numpy.array(ohlcvs, dtype=numpy.float64).reshape(-1, 6)
+            result = dict([(name, numpy.ascontiguousarray(ohlcvs[:, i])) for i, name in enumerate(ohlcv_columns)])
+            result['timestamp'] = result['timestamp'].astype(numpy.int64)
+            return result
+        if is_ndarray(ohlcvs):
+            return [[int(ohlcv[0])] + [None if value != value else value for value in ohlcv[1:]] for ohlcv in ohlcvs.tolist()]
+        return ohlcvs
+
+    @staticmethod
+    def ohlcv_rows(ohlcvs):
+        """Returns the candles of the columns format in a list of lists, the ones in a list unchanged"""
+        if isinstance(ohlcvs, dict):
+            return [list(ohlcv) for ohlcv in zip(*[ohlcvs[name].tolist() for name in ohlcv_columns])]
+        return ohlcvs
+
     def parse_bid_ask(self, bidask, price_key=0, amount_key=0):
+        if self.numericMode != 'float':
+            return [self.parse_number(bidask[price_key]), self.parse_number(bidask[amount_key])]
         return [float(bidask[price_key]), float(bidask[amount_key])]
 
     def parse_bids_asks(self, bidasks, price_key=0, amount_key=1):
-        result = []
+        levels = []
         if len(bidasks):
             if type(bidasks[0]) is list:
-                for bidask in bidasks:
-                    if bidask[price_key] and bidask[amount_key]:
-                        result.append(self.parse_bid_ask(bidask, price_key, amount_key))
+                if (self.numericMode == 'float') and not self.orderBookArrays and (type(self).parse_bid_ask == Exchange.parse_bid_ask):
+                    # the levels are filtered and converted in one pass, without a method call per level
+                    return [[float(bidask[price_key]), float(bidask[amount_key])] for bidask in bidasks if bidask[price_key] and bidask[amount_key]]
+                levels = [bidask for bidask in bidasks if bidask[price_key] and bidask[amount_key]]
             elif type(bidasks[0]) is dict:
-                for bidask in bidasks:
-                    if (price_key in bidask) and (amount_key in bidask) and (bidask[price_key] and bidask[amount_key]):
-                        result.append(self.parse_bid_ask(bidask, price_key, amount_key))
+                levels = [bidask for bidask in bidasks if (price_key in bidask) and (amount_key in bidask) and (bidask[price_key] and bidask[amount_key])]
             else:
                 self.raise_error(ExchangeError, details='unrecognized bidask format: ' + str(bidasks[0]))
-        return result
+        if self.orderBookArrays:
+            numpy = import_numpy()
+            if numpy is None:
+                self.raise_error(NotSupported, details='orderBookArrays requires numpy')
+            return numpy.array([[bidask[price_key], bidask[amount_key]] for bidask in levels], dtype=numpy.float64).reshape(-1, 2)
+        return [self.parse_bid_ask(bidask, price_key, amount_key) for bidask in levels]
+
+    @staticmethod
+    def sort_bids_asks(bidasks, descending=False):
+        """Sorts the levels by price
+
+        Most exchanges send the levels in order. The sort of a list finds the ordered runs in one linear pass,
+        the sort of a numpy array does not, so an array is only sorted if it is out of order.
+        """
+        if is_ndarray(bidasks):
+            numpy = import_numpy()
+            differences = numpy.diff(bidasks[:, 0])
+            if (differences <= 0).all() if descending else (differences >= 0).all():
+                return bidasks
+            return bidasks[numpy.argsort(-bidasks[:, 0] if descending else bidasks[:, 0], kind='mergesort')]
+        return sorted(bidasks, key=operator.itemgetter(0), reverse=descending)
 
     def fetch_l2_order_book(self, symbol, limit=None, params={}):
         orderbook = self.fetch_order_book(symbol, limit, params)
         return self.extend(orderbook, {
-            'bids': self.sort_by(self.aggregate(orderbook['bids']), 0, True),
-            'asks': self.sort_by(self.aggregate(orderbook['asks']), 0),
+            'bids': self.sort_bids_asks(self.aggregate(orderbook['bids']), True),
+            'asks': self.sort_bids_asks(self.aggregate(orderbook['asks'])),
         })
 
     def parse_order_book(self, orderbook, timestamp=None, bids_key='bids', asks_key='asks', price_key=0, amount_key=1):
+        bids = self.parse_bids_asks(orderbook[bids_key] if (bids_key in orderbook) and isinstance(orderbook[bids_key], list) else [], price_key, amount_key)
+        asks = self.parse_bids_asks(orderbook[asks_key] if (asks_key in orderbook) and isinstance(orderbook[asks_key], list) else [], price_key, amount_key)
+        if (self.numericMode == 'string') and not self.orderBookArrays:
+            # the prices are sorted by their values, not by their characters
+            bids = sorted(bids, key=lambda bidask: float(bidask[0]), reverse=True)
+            asks = sorted(asks, key=lambda bidask: float(bidask[0]))
+        else:
+            bids = self.sort_bids_asks(bids, True)
+            asks = self.sort_bids_asks(asks)
         return {
-            'bids': self.sort_by(self.parse_bids_asks(orderbook[bids_key], price_key, amount_key) if (bids_key in orderbook) and isinstance(orderbook[bids_key], list) else [], 0, True),
-            'asks': self.sort_by(self.parse_bids_asks(orderbook[asks_key], price_key, amount_key) if (asks_key in orderbook) and isinstance(orderbook[asks_key], list) else [], 0),
+            'bids': bids,
+            'asks': asks,
             'timestamp': timestamp,
             'datetime': self.iso8601(timestamp) if timestamp is not None else None,
             'nonce': None,
         }
 
+    def parse_streamed_order_book(self, market_id, orderbook, timestamp=None, bids_key='bids', asks_key='asks', price_key=0, amount_key=1):
+        """Returns the symbol and the parsed order book for a member of a streamed response that maps market ids to order books"""
+        symbol = self.markets_by_id[market_id]['symbol'] if self.markets_by_id and (market_id in self.markets_by_id) else market_id
+        return symbol, self.parse_order_book(orderbook, timestamp, bids_key, asks_key, price_key, amount_key)
+
+    def parse_streamed_ticker(self, market_id, ticker):
+        """Returns the symbol and the parsed ticker for a member of a streamed response that maps market ids to tickers"""
+        market = self.markets_by_id[market_id] if self.markets_by_id and (market_id in self.markets_by_id) else None
+        ticker = self.parse_ticker(ticker, market)
+        return self.safe_string(ticker, 'symbol', market_id), ticker
+
     def parse_balance(self, balance):
         currencies = self.omit(balance, 'info').keys()
         for account in ['free', 'used', 'total']:
@@ -1300,6 +1937,191 @@ class Exchange(object):
     def fetchOHLCV(self, symbol, timeframe='1m', since=None, limit=None, params={}):
         return self.fetch_ohlcv(symbol, timeframe, since, limit, params)
 
+    def ohlcv_windows(self, timeframe, start, end=None, limit=None):
+        """Splits the milliseconds from start to end (excluded) into windows of limit candles"""
+        if start is None:
+            self.raise_error(ArgumentsRequired, details='fetch_ohlcv_range() requires a start timestamp')
+        end = self.milliseconds() if end is None else end
+        duration = self.parse_timeframe(timeframe) * 1000
+        start = int(math.ceil(start / float(duration)) * duration)  # the first candle that opens within the range
+        span = (limit or self.ohlcvLimit) * duration
+        return [(since, min(since + span, end)) for since in range(start, end, span)]
+
+    @staticmethod
+    def merge_ohlcv_window(result, candles, since, until):
+        """Appends the candles within [since, until) that open after the last one in the result, returns their number"""
+        count = len(result)
+        for candle in candles:
+            if (since <= candle[0] < until) and ((len(result) == 0) or (candle[0] > result[-1][0])):
+                result.append(candle)
+        return len(result) - count
+
+    def fetch_ohlcv_window(self, symbol, timeframe, since, until, limit, params={}, fetch_ohlcv=None):
+        """Fetches the candles within [since, until), with more requests if the exchange returns fewer candles per request"""
+        fetch_ohlcv = fetch_ohlcv or self.fetch_ohlcv
+        duration = self.parse_timeframe(timeframe) * 1000
+        result = []
+        while since < until:
+            candles = self.ohlcv_rows(fetch_ohlcv(symbol, timeframe, since, limit, params))
+            if not self.merge_ohlcv_window(result, candles, since, until) or (candles[-1][0] >= until - duration):
+                break  # the window is complete or there are no more candles
+            since = result[-1][0] + duration
+        return result
+
+    def fetch_ohlcv_range(self, symbol, timeframe='1m', start=None, end=None, limit=None, params={}):
+        """Yields the candles from start to end (excluded, now by default) in order and without duplicates
+
+        The range is split into windows of ohlcvLimit candles that are fetched by ohlcvConcurrency threads,
+        under the rate limiter of the instance. The candles of a window are yielded as soon as it and all
+        the windows before it are fetched.
+        """
+        self.load_markets()
+        limit = limit or self.ohlcvLimit
+        windows = collections.deque(self.ohlcv_windows(timeframe, start, end, limit))
+        # the windows are fetched past the cache, which would refresh its last candles for every window
+        fetch_ohlcv = self.fetch_uncached_ohlcv or self.fetch_ohlcv
+        if (ThreadPoolExecutor is None) or (self.ohlcvConcurrency < 2):
+            for since, until in windows:
+                candles = self.fetch_ohlcv_window(symbol, timeframe, since, until, limit, params, fetch_ohlcv)
+                self.cache_ohlcv_window(symbol, timeframe, since, until, candles, params)
+                for candle in candles:
+                    yield candle
+            return
+        executor = ThreadPoolExecutor(self.ohlcvConcurrency)
+        futures = collections.deque()
+        try:
+            while windows or futures:
+                while windows and (len(futures) < self.ohlcvConcurrency):
+                    since, until = windows.popleft()
+                    futures.append((since, until, executor.submit(self.fetch_ohlcv_window, symbol, timeframe, since, until, limit, params, fetch_ohlcv)))
+                since, until, future = futures.popleft()
+                candles = future.result()
+                self.cache_ohlcv_window(symbol, timeframe, since, until, candles, params)
+                for candle in candles:
+                    yield candle
+        finally:
+            for since, until, future in futures:
+                future.cancel()
+            executor.shutdown()
+
+    def set_ohlcv_cache(self, cache):
+        """Serves fetch_ohlcv() from an OHLCVCache or the path of one, None disables the cache"""
+        self.ohlcvCache = cache if (cache is None) or isinstance(cache, OHLCVCache) else OHLCVCache(cache)
+        self.define_fetch_ohlcv()
+
+    def define_fetch_ohlcv(self):
+        """Wraps fetch_ohlcv() of the instance in the resampling of the missing timeframes and then in the cache"""
+        self.__dict__.pop('fetch_ohlcv', None)
+        if self.ohlcvResample and self.timeframes:
+            self.fetch_ohlcv = functools.partial(self.fetch_resampled_ohlcv, self.fetch_ohlcv)
+        self.fetch_uncached_ohlcv = None
+        if self.ohlcvCache is not None:
+            self.fetch_uncached_ohlcv = self.fetch_ohlcv
+            self.fetch_ohlcv = functools.partial(self.fetch_cached_ohlcv, self.fetch_ohlcv)
+        self.fetchOhlcv = self.fetch_ohlcv
+
+    def resample_timeframe(self, timeframe):
+        """Returns the longest timeframe of the exchange that divides a timeframe it lacks, or None"""
+        if timeframe[-1] in 'My':
+            return None
+        duration = self.parse_timeframe(timeframe)
+        durations = [(self.parse_timeframe(key), key) for key in self.timeframes if key[-1] not in 'My']
+        durations = [(seconds, key) for seconds, key in durations if duration % seconds == 0]
+        return max(durations)[1] if durations else None
+
+    @staticmethod
+    def ohlcv_arguments(args, kwargs):
+        """Returns the timeframe, since, limit and params passed to fetch_ohlcv() after the symbol, None for the missing ones"""
+        names = ['timeframe', 'since', 'limit', 'params']
+        values = dict(zip(names, args))
+        values.update(kwargs)
+        return [values.get(name) for name in names]
+
+    def fetch_resampled_ohlcv(self, fetch_ohlcv, symbol, *args, **kwargs):
+        """Aggregates the candles of a shorter timeframe of the exchange for a timeframe it does not support
+
+        The other calls are passed to fetch_ohlcv() as they are, so that the exchange applies its own defaults.
+        Without a limit, the last ohlcvLimit candles or the ohlcvLimit candles from since are returned.
+        """
+        timeframe, since, limit, params = self.ohlcv_arguments(args, kwargs)
+        if (timeframe is None) or (timeframe in self.timeframes):
+            return fetch_ohlcv(symbol, *args, **kwargs)
+        params = params or {}
+        source = self.resample_timeframe(timeframe)
+        if source is None:
+            self.raise_error(NotSupported, details='fetch_ohlcv() does not support the ' + timeframe + ' timeframe')
+        since, until, source_limit = self.resample_window(source, timeframe, since, limit)
+        candles = self.fetch_ohlcv_window(symbol, source, since, until, source_limit, params, fetch_ohlcv)
+        return self.format_ohlcvs(self.resample_ohlcv(candles, source, timeframe))
+
+    def resample_window(self, source, timeframe, since=None, limit=None):
+        """Returns the window of the candles of the source timeframe and their number per request for fetch_resampled_ohlcv()"""
+        duration = self.parse_timeframe(timeframe) * 1000
+        limit = limit or self.ohlcvLimit
+        if since is None:
+            since = self.ohlcv_opening_time(timeframe, self.milliseconds()) - (limit - 1) * duration
+        else:
+            since = self.ohlcv_opening_time(timeframe, since + duration - 1)  # the first candle that opens after since
+        ratio = duration // (self.parse_timeframe(source) * 1000)
+        return since, min(since + limit * duration, self.milliseconds()), min(limit * ratio, self.ohlcvLimit)
+
+    def fetch_cached_ohlcv(self, fetch_ohlcv, symbol, *args, **kwargs):
+        """Returns the candles from the cache, after fetching the ones before and after the cached candles
+
+        The last cached candle is fetched again, because it may not have been closed when it was cached.
+        The candles fetched with params, like the ones of other prices, are not cached, and neither are
+        the ones of the default timeframe of the exchange, the calls without a timeframe are passed as they are.
+        """
+        timeframe, since, limit, params = self.ohlcv_arguments(args, kwargs)
+        if params or (timeframe is None):
+            return fetch_ohlcv(symbol, *args, **kwargs)
+        params = {}
+        self.load_markets()
+        duration = self.parse_timeframe(timeframe) * 1000
+        cached = self.ohlcvCache.read(self.id, symbol, timeframe)
+        fetched = []
+        if (cached is None) or (len(cached) == 0):
+            if since is None:
+                fetched = self.ohlcv_rows(fetch_ohlcv(symbol, *args, **kwargs))
+            else:
+                fetched = self.fetch_ohlcv_window(symbol, timeframe, since, self.milliseconds(), limit, params, fetch_ohlcv)
+        else:
+            first, last = int(cached[0, 0]), int(cached[-1, 0])
+            if (since is None) or (limit is None) or (since + limit * duration > last):
+                fetched = self.fetch_ohlcv_window(symbol, timeframe, last, self.milliseconds(), limit, params, fetch_ohlcv)
+            if (since is None) and (limit is not None):
+                since = (fetched[-1][0] if fetched else last) - (limit - 1) * duration
+            if (since is not None) and (since < first):
+                fetched = self.fetch_ohlcv_window(symbol, timeframe, since, first, limit, params, fetch_ohlcv) + fetched
+        return self.update_cached_ohlcv(symbol, timeframe, cached, fetched, since, limit)
+
+    def cache_ohlcv_window(self, symbol, timeframe, since, until, candles, params={}):
+        """Merges the candles of a window of fetch_ohlcv_range() into the cache, if the window extends the cached ones without a gap"""
+        if (self.ohlcvCache is None) or params or not candles:
+            return
+        duration = self.parse_timeframe(timeframe) * 1000
+        cached = self.ohlcvCache.read(self.id, symbol, timeframe)
+        if (cached is not None) and len(cached):
+            if (since > cached[-1, 0] + duration) or (until < cached[0, 0]):
+                return
+        self.ohlcvCache.merge(self.id, symbol, timeframe, candles)
+
+    def update_cached_ohlcv(self, symbol, timeframe, cached, fetched, since=None, limit=None):
+        """Merges the fetched candles into the cached ones and returns the candles from since, or the last ones"""
+        numpy = import_numpy()  # the cache requires it
+        if fetched:
+            result = self.ohlcvCache.merge(self.id, symbol, timeframe, fetched)
+        elif cached is None:
+            return self.format_ohlcvs([])
+        else:
+            result = cached
+        if since is None:
+            result = result[-limit:] if limit else result
+        else:
+            start = numpy.searchsorted(result[:, 0], since)
+            result = result[start:start + limit] if limit else result[start:]
+        return self.format_ohlcvs(result)
+
     def parse_trading_view_ohlcv(self, ohlcvs, market=None, timeframe='1m', since=None, limit=None):
         result = self.convert_trading_view_to_ohlcv(ohlcvs)
         return self.parse_ohlcvs(result, market, timeframe, since, limit)
@@ -1336,34 +2158,180 @@ class Exchange(object):
         return result
 
     def build_ohlcv(self, trades, timeframe='1m', since=None, limit=None):
+        return self.build_ohlcvs(trades, [timeframe], since, limit)[timeframe]
+
+    def build_ohlcvs(self, trades, timeframes, since=None, limit=None):
+        """Builds the candles of several timeframes from the first limit trades in ascending order, returns them by timeframe
+
+        The timestamps, the prices and the amounts are read from the trades once for all the timeframes and
+        aggregated with numpy when it is installed, the edges of m/h/d are shifted, but not the ones of M.
+        The trades can also be in the columns format of parse_trades().
+        """
+        numpy = import_numpy()
+        durations = [(timeframe, self.parse_timeframe(timeframe) * 1000) for timeframe in timeframes]
+        if isinstance(trades, dict):
+            # the trades in the columns format of parse_trades()
+            timestamps, prices, amounts = [trades[key][:limit].astype(numpy.float64) for key in ('timestamp', 'price', 'amount')]
+            if since is not None:
+                selected = timestamps >= since
+                timestamps, prices, amounts = timestamps[selected], prices[selected], amounts[selected]
+        else:
+            trades = trades[:limit] if limit is not None else trades
+            if since is not None:
+                trades = [trade for trade in trades if trade['timestamp'] >= since]
+            if (numpy is None) or (self.numericMode != 'float') or not trades:
+                result = self.build_ohlcvs_from_trades(trades, durations)
+                return dict([(timeframe, self.format_ohlcvs(ohlcvs)) for timeframe, ohlcvs in result.items()])
+            timestamps, prices, amounts = [numpy.fromiter(map(operator.itemgetter(key), trades), numpy.float64, len(trades)) for key in ('timestamp', 'price', 'amount')]
+        result = {}
+        for timeframe, ms in durations:
+            result[timeframe] = self.format_ohlcvs(self.build_ohlcv_array(timestamps, prices, amounts, ms))
+        return result
+
+    @staticmethod
+    def build_ohlcvs_from_trades(trades, durations):
+        """The pure Python version of build_ohlcvs(), for the decimal numbers and without numpy"""
+        result = dict([(timeframe, []) for timeframe, ms in durations])
+        candles = dict([(timeframe, None) for timeframe, ms in durations])
+        for trade in trades:
+            timestamp = trade['timestamp']
+            price = trade['price']
+            for timeframe, ms in durations:
+                candle = candles[timeframe]
+                opening_time = int(timestamp - timestamp % ms)
+                if (candle is None) or (opening_time >= candle[0] + ms):
+                    # moved to a new timeframe -> create a new candle from opening trade
+                    candle = candles[timeframe] = [opening_time, price, price, price, price, trade['amount']]
+                    result[timeframe].append(candle)
+                else:
+                    # still processing the same timeframe -> update opening trade
+                    if price > candle[2]:
+                        candle[2] = price
+                    if price < candle[3]:
+                        candle[3] = price
+                    candle[4] = price
+                    candle[5] += trade['amount']
+        return result
+
+    @staticmethod
+    def build_ohlcv_array(timestamps, prices, amounts, ms):
+        """Aggregates the numpy arrays of the timestamps, the prices and the amounts of trades in ascending order into an (n, 6) array of candles"""
+        numpy = import_numpy()
+        opening_times = timestamps - timestamps % ms
+        starts = numpy.flatnonzero(numpy.concatenate(([True], opening_times[1:] != opening_times[:-1])))
+        ends = numpy.append(starts[1:], len(prices)) - 1
+        result = numpy.empty((len(starts), 6))
+        result[:, 0] = opening_times[starts]
+        result[:, 1] = prices[starts]
+        result[:, 2] = numpy.maximum.reduceat(prices, starts)
+        result[:, 3] = numpy.minimum.reduceat(prices, starts)
+        result[:, 4] = prices[ends]
+        result[:, 5] = numpy.add.reduceat(amounts, starts)
+        return result
+
+    @staticmethod
+    def ohlcv_opening_time(timeframe, timestamp):
+        """Returns the opening times of the candles of the timestamps, a number or a numpy array, the weeks open on mondays"""
+        ms = Exchange.parse_timeframe(timeframe) * 1000
+        offset = 345600000 if timeframe[-1] == 'w' else 0  # 1970-01-05 was the first monday
+        return timestamp - (timestamp - offset) % ms
+
+    def resample_ohlcv(self, ohlcvs, from_timeframe, to_timeframe):
+        """Aggregates the candles of a timeframe into the candles of a longer timeframe that is a multiple of it
+
+        The candles are a list in ascending order, or a numpy array of shape (n, 6) for which a numpy array is
+        returned. The missing values, None or nan, are skipped, like in the volumes of the empty candles.
+        """
+        if (to_timeframe[-1] in 'My') or (self.parse_timeframe(to_timeframe) % self.parse_timeframe(from_timeframe)):
+            self.raise_error(NotSupported, details='resample_ohlcv() can not resample ' + from_timeframe + ' candles to ' + to_timeframe)
+        numpy = import_numpy()
+        if (numpy is None) or (self.numericMode != 'float'):
+            return self.resample_ohlcv_list(ohlcvs, to_timeframe)
+        candles = numpy.array(ohlcvs, dtype=numpy.float64).reshape(-1, 6)
+        if len(candles) == 0:
+            return candles if isinstance(ohlcvs, numpy.ndarray) else []
+        opening_times = self.ohlcv_opening_time(to_timeframe, candles[:, 0])
+        starts = numpy.flatnonzero(numpy.concatenate(([True], opening_times[1:] != opening_times[:-1])))
+        ends = numpy.append(starts[1:], len(candles)) - 1
+        missing = numpy.isnan(candles[:, 5])
+        result = numpy.empty((len(starts), 6))
+        result[:, 0] = opening_times[starts]
+        result[:, 1] = candles[starts, 1]
+        result[:, 2] = numpy.fmax.reduceat(candles[:, 2], starts)
+        result[:, 3] = numpy.fmin.reduceat(candles[:, 3], starts)
+        result[:, 4] = candles[ends, 4]
+        result[:, 5] = numpy.add.reduceat(numpy.where(missing, 0, candles[:, 5]), starts)
+        result[numpy.logical_and.reduceat(missing, starts), 5] = numpy.nan
+        if isinstance(ohlcvs, numpy.ndarray):
+            return result
+        return [[int(ohlcv[0])] + [None if value != value else value for value in ohlcv[1:]] for ohlcv in result.tolist()]
+
+    @staticmethod
+    def resample_ohlcv_list(ohlcvs, timeframe):
+        """The pure Python version of resample_ohlcv(), for the decimal numbers and without numpy"""
+        result = []
+        for ohlcv in ohlcvs:
+            opening_time = Exchange.ohlcv_opening_time(timeframe, ohlcv[0])
+            if (not result) or (result[-1][0] != opening_time):
+                result.append([opening_time] + list(ohlcv[1:6]))
+            else:
+                candle = result[-1]
+                candle[2] = max([value for value in (candle[2], ohlcv[2]) if value is not None] or [None])
+                candle[3] = min([value for value in (candle[3], ohlcv[3]) if value is not None] or [None])
+                candle[4] = ohlcv[4]
+                candle[5] = ohlcv[5] if candle[5] is None else (candle[5] if ohlcv[5] is None else candle[5] + ohlcv[5])
+        return result
+
+    def fill_ohlcv_gaps(self, ohlcvs, timeframe, until=None):
+        """Aligns the candles to the timeframe and inserts the missing ones, up to until (excluded) if given
+
+        A timestamp is rounded to the nearest opening time and the last of the candles with the same opening
+        time is kept. The inserted candles are flat at the close of the previous candle with a volume of 0.
+        The candles are a list in ascending order, or a numpy array of shape (n, 6) for which a numpy array is returned.
+        """
+        ms = self.parse_timeframe(timeframe) * 1000
+        numpy = import_numpy()
+        if (numpy is None) or (self.numericMode != 'float'):
+            return self.fill_ohlcv_gaps_list(ohlcvs, timeframe, until)
+        candles = numpy.array(ohlcvs, dtype=numpy.float64).reshape(-1, 6)
+        if len(candles) == 0:
+            return candles if isinstance(ohlcvs, numpy.ndarray) else []
+        timestamps = self.ohlcv_opening_time(timeframe, candles[:, 0] + ms // 2)
+        first = timestamps[0]
+        count = int((timestamps[-1] - first) // ms) + 1
+        if until is not None:
+            count = max(count, int(-((first - until) // ms)))
+        indices = ((timestamps - first) // ms).astype(numpy.int64)
+        present = numpy.zeros(count, dtype=bool)
+        present[indices] = True
+        result = numpy.empty((count, 6))
+        result[indices] = candles  # the last candle with the same index is kept
+        # the index of the last present candle at or before every row
+        previous = numpy.maximum.accumulate(numpy.where(present, numpy.arange(count), 0))
+        result[~present, 1:5] = result[previous[~present], 4][:, None]
+        result[~present, 5] = 0
+        result[:, 0] = first + numpy.arange(count) * ms
+        if isinstance(ohlcvs, numpy.ndarray):
+            return result
+        return [[int(ohlcv[0])] + [None if value != value else value for value in ohlcv[1:]] for ohlcv in result.tolist()]
+
+    def fill_ohlcv_gaps_list(self, ohlcvs, timeframe, until=None):
+        """The pure Python version of fill_ohlcv_gaps(), for the decimal numbers and without numpy"""
         ms = self.parse_timeframe(timeframe) * 1000
-        ohlcvs = []
-        (high, low, close, volume) = (2, 3, 4, 5)
-        num_trades = len(trades)
-        oldest = (num_trades - 1) if limit is None else min(num_trades - 1, limit)
-        for i in range(0, oldest):
-            trade = trades[i]
-            if (since is not None) and (trade['timestamp'] < since):
+        result = []
+        for ohlcv in ohlcvs:
+            timestamp = self.ohlcv_opening_time(timeframe, int(ohlcv[0]) + ms // 2)
+            if result and (result[-1][0] == timestamp):
+                result[-1] = [timestamp] + list(ohlcv[1:6])
                 continue
-            opening_time = int(math.floor(trade['timestamp'] / ms) * ms)  # Shift the edge of the m/h/d (but not M)
-            j = len(ohlcvs)
-            if (j == 0) or opening_time >= ohlcvs[j - 1][0] + ms:
-                # moved to a new timeframe -> create a new candle from opening trade
-                ohlcvs.append([
-                    opening_time,
-                    trade['price'],
-                    trade['price'],
-                    trade['price'],
-                    trade['price'],
-                    trade['amount'],
-                ])
-            else:
-                # still processing the same timeframe -> update opening trade
-                ohlcvs[j - 1][high] = max(ohlcvs[j - 1][high], trade['price'])
-                ohlcvs[j - 1][low] = min(ohlcvs[j - 1][low], trade['price'])
-                ohlcvs[j - 1][close] = trade['price']
-                ohlcvs[j - 1][volume] += trade['amount']
-        return ohlcvs
+            while result and (result[-1][0] + ms < timestamp):
+                close = result[-1][4]
+                result.append([result[-1][0] + ms, close, close, close, close, 0])
+            result.append([timestamp] + list(ohlcv[1:6]))
+        while result and (until is not None) and (result[-1][0] + ms < until):
+            close = result[-1][4]
+            result.append([result[-1][0] + ms, close, close, close, close, 0])
+        return result
 
     @staticmethod
     def parse_timeframe(timeframe):
@@ -1390,6 +2358,49 @@ class Exchange(object):
         symbol = market['symbol'] if market else None
         return self.filter_by_symbol_since_limit(array, symbol, since, limit)
 
+    def trade_columns(self, trades):
+        """Writes the tradesColumns of the parsed trades into preallocated arrays, the other fields are dropped
+
+        The trades are returned in a dict of numpy arrays by field, in their order. The timestamps are int64,
+        in a masked array if some trades have none, the prices, the amounts and the costs float64 with nan
+        for None, the sides int8 with 1 for buy, -1 for sell and 0 otherwise, and the other fields are arrays
+        of objects.
+        """
+        numpy = import_numpy()
+        if numpy is None:
+            self.raise_error(NotSupported, details='the columns format of the trades requires numpy')
+        count = len(trades)
+        columns = [(name, numpy.empty(count, dtype=trade_column_types.get(name, object))) for name in self.tradesColumns]
+        missing = numpy.zeros(count, dtype=bool)
+        for i, trade in enumerate(trades):
+            for name, column in columns:
+                if name == 'side':
+                    column[i] = trade_sides.get(trade.get('side'), 0)
+                elif (name == 'timestamp') and (trade.get('timestamp') is None):
+                    column[i] = 0
+                    missing[i] = True
+                else:
+                    column[i] = trade.get(name)
+        result = dict(columns)
+        if ('timestamp' in result) and missing.any():
+            result['timestamp'] = numpy.ma.masked_array(result['timestamp'], mask=missing)
+        return result
+
+    def define_fetch_trades(self):
+        """Wraps fetch_trades() and fetch_my_trades() of the instance in the conversion of the trades to the tradesFormat
+
+        The trades are converted in the results only, the parsers and the other methods get them in dicts.
+        """
+        for name in ['fetch_trades', 'fetch_my_trades']:
+            self.__dict__.pop(name, None)
+            if self.tradesFormat == 'columns':
+                setattr(self, name, functools.partial(self.fetch_trade_columns, getattr(self, name)))
+            setattr(self, Exchange.underscore_to_camelcase(name), getattr(self, name))
+
+    def fetch_trade_columns(self, fetch_trades, *args, **kwargs):
+        # the arguments are passed as they are, so that the exchange applies its own defaults
+        return self.trade_columns(fetch_trades(*args, **kwargs))
+
     def parse_ledger(self, data, currency=None, since=None, limit=None):
         array = self.to_array(data)
         array = [self.parse_ledger_entry(item, currency) for item in array]
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+import codecs
+import json
+import re
+
+__all__ = [
+    'JsonStream',
+]
+
+whitespace = re.compile(r'[ \t\n\r]*')
+number_continuation = re.compile(r'[.eE+-]+$')  # the end of the buffer after a number that continues in the next chunk
+
+
+class JsonStream(object):
+    """An incremental parser that returns the members of one container of a json document as they arrive
+
+    The path lists the keys (and the indices in arrays) from the top of the document to the container,
+    for example ['result'] for {"error":[],"result":{"XXBTZUSD":{...},...}}. The members of that container
+    are returned as (key, value) pairs, or (index, value) pairs for an array, and only one member is held in
+    memory at a time. The members before the container are parsed and dropped, the rest of the document
+    after the container is not parsed at all.
+
+        stream = JsonStream(['result'])
+        for chunk in chunks:
+            for key, value in stream.feed(chunk):
+                ...
+        for key, value in stream.close():
+            ...
+    """
+
+    def __init__(self, path=()):
+        self.path = list(path)
+        self.decoder = json.JSONDecoder()
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.position = 0
+        self.depth = 0  # the number of containers of the path that have been entered
+        self.container = None  # '{' or '[' after entering a container
+        self.key = None  # the key of the member that is being parsed
+        self.colon = False  # whether the colon after the key has been parsed
+        self.index = 0  # the index of the next member of the container
+        self.needed = 0  # the number of characters to wait for before parsing an incomplete member again
+        self.done = False
+
+    def feed(self, chunk):
+        """Adds the next chunk of the document (bytes or text) and returns the members completed by it"""
+        self.buffer += self.utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if self.done or (len(self.buffer) - self.position < self.needed):
+            return []
+        return self.parse(False)
+
+    def close(self):
+        """Returns the last members at the end of the document, raises ValueError if the document is incomplete"""
+        self.buffer += self.utf8.decode(b'', True)
+        result = self.parse(True) if not self.done else []
+        if not self.done:
+            raise ValueError('incomplete json document, expected the end of ' + json.dumps(self.path[:self.depth]))
+        return result
+
+    def skip(self):
+        self.position = whitespace.match(self.buffer, self.position).end()
+        return self.position < len(self.buffer)
+
+    def decode(self, final):
+        """Decodes the next value, or returns None until it is followed by another character or the end of the document
+
+        A number at the end of the buffer may still continue in the next chunk, even after its decoded part,
+        as in -0. or 1e+ followed by the rest of the fraction or the exponent. An incomplete value is parsed
+        again when the buffer has doubled in size, so that a large member is not parsed once per chunk.
+        """
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.position)
+        except ValueError:
+            if final:
+                raise
+            self.needed = 2 * (len(self.buffer) - self.position)
+            return None
+        number = self.buffer[self.position] in '-0123456789'
+        if not final and ((end == len(self.buffer)) or (number and number_continuation.match(self.buffer, end))):
+            self.needed = len(self.buffer) - self.position + 1
+            return None
+        self.position = end
+        self.needed = 0
+        return (value,)
+
+    def parse(self, final):
+        result = []
+        while self.skip():
+            character = self.buffer[self.position]
+            if self.container is None:
+                if character not in '{[':
+                    raise ValueError('expected an object or an array at ' + json.dumps(self.path[:self.depth]))
+                self.container = character
+                self.position += 1
+            elif self.key is None:
+                if character == ',':
+                    self.position += 1
+                elif character in '}]':
+                    if self.depth < len(self.path):
+                        # like the error responses of kraken, {"error":["EQuery:Unknown asset pair"]} without the result
+                        raise ValueError('the json document has no ' + json.dumps(self.path[:self.depth + 1]))
+                    self.done = True
+                    break
+                elif self.container == '[':
+                    self.key = self.index
+                else:
+                    decoded = self.decode(final)
+                    if decoded is None:
+                        break
+                    self.key = decoded[0]
+                    self.colon = False
+            elif (self.container == '{') and not self.colon:
+                if character != ':':
+                    raise ValueError('expected a colon after the key ' + json.dumps(self.key))
+                self.position += 1
+                self.colon = True
+            elif (self.depth < len(self.path)) and (self.key == self.path[self.depth]):
+                # enter the next container of the path
+                self.depth += 1
+                self.container = None
+                self.key = None
+                self.index = 0
+            else:
+                decoded = self.decode(final)
+                if decoded is None:
+                    break
+                if self.depth == len(self.path):
+                    result.append((self.key, decoded[0]))
+                self.key = None
+                self.index += 1
+        # the parsed characters are dropped
+        self.buffer = self.buffer[self.position:]
+        self.position = 0
+        return result
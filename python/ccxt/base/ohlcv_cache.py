@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import threading
+import time
+
+from ccxt.base.errors import NotSupported
+
+try:
+    from urllib.parse import quote
+except ImportError:
+    from urllib import quote  # Python 2
+
+__all__ = [
+    'OHLCVCache',
+]
+
+replace = getattr(os, 'replace', os.rename)  # os.replace overwrites on Windows too, Python 2 has only os.rename
+
+
+class OHLCVCache(object):
+    """An on-disk cache of candles, one .npy file per exchange id, symbol and timeframe
+
+    The candles are stored in a float64 array of shape (n, 6) in column-major order, so that every column,
+    the timestamps in particular, is contiguous in the file. read() maps the file into memory without
+    copying it. A file is replaced atomically on every write, so a reader never sees a partial file.
+
+        cache = OHLCVCache('~/.ccxt/ohlcv', max_size=1 << 30, max_age=30 * 86400)
+        exchange = ccxt.binance({'ohlcvCache': cache})
+        exchange.fetch_ohlcv('BTC/USDT', '1h', since)  # fetches only the candles that are not cached yet
+
+    The files that were not written for max_age seconds are evicted, and the least recently written
+    files are evicted while all the files take more than max_size bytes. The cache is walked for the
+    eviction every evict_interval seconds, or sooner when the files written since exceed max_size.
+    """
+
+    def __init__(self, path, max_size=None, max_age=None, evict_interval=60):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            raise NotSupported('OHLCVCache requires numpy')
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_size = max_size
+        self.max_age = max_age
+        self.evict_interval = evict_interval
+        self.size = None  # the size of the files after the last eviction plus the size written since, None before
+        self.evicted = 0  # the time of the last eviction
+        self.locks = {}  # the locks of the threads that merge candles into a file, by filename
+        self.lock = threading.Lock()
+
+    def filename(self, exchange_id, symbol, timeframe):
+        return os.path.join(self.path, exchange_id, quote(symbol, safe=''), timeframe + '.npy')
+
+    def read(self, exchange_id, symbol, timeframe):
+        """Returns the cached candles in a read-only memory-mapped array of shape (n, 6), or None"""
+        import numpy
+        try:
+            return numpy.load(self.filename(exchange_id, symbol, timeframe), mmap_mode='r')
+        except (IOError, OSError, ValueError):
+            return None
+
+    def write(self, exchange_id, symbol, timeframe, ohlcvs):
+        """Replaces the cached candles with a list of candles or an array of shape (n, 6), None values become nan"""
+        import numpy
+        filename = self.filename(exchange_id, symbol, timeframe)
+        directory = os.path.dirname(filename)
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+        try:
+            previous = os.path.getsize(filename)
+        except OSError:
+            previous = 0
+        # a unique temporary file per call, the threads and the processes write the same file concurrently
+        descriptor, temporary = tempfile.mkstemp(suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                numpy.save(file, numpy.asfortranarray(numpy.array(ohlcvs, dtype=numpy.float64).reshape(-1, 6)))
+            size = os.path.getsize(temporary)
+            replace(temporary, filename)
+        except BaseException:
+            os.remove(temporary)
+            raise
+        self.written(size - previous)
+
+    def merge(self, exchange_id, symbol, timeframe, ohlcvs):
+        """Merges candles into the cached ones, the new candles replace the cached ones with the same timestamps
+
+        The threads of a process merge into a file one at a time, so that none of their candles are lost.
+        Returns all the candles of the file in an array of shape (n, 6).
+        """
+        import numpy
+        with self.file_lock(exchange_id, symbol, timeframe):
+            result = numpy.array(ohlcvs, dtype=numpy.float64).reshape(-1, 6)
+            cached = self.read(exchange_id, symbol, timeframe)
+            if (cached is not None) and len(cached):
+                result = numpy.concatenate([cached, result])
+            _, indices = numpy.unique(result[::-1, 0], return_index=True)
+            result = result[::-1][indices]
+            self.write(exchange_id, symbol, timeframe, result)
+        return result
+
+    def file_lock(self, exchange_id, symbol, timeframe):
+        filename = self.filename(exchange_id, symbol, timeframe)
+        with self.lock:
+            if filename not in self.locks:
+                self.locks[filename] = threading.Lock()
+            return self.locks[filename]
+
+    def delete(self, exchange_id, symbol, timeframe):
+        try:
+            os.remove(self.filename(exchange_id, symbol, timeframe))
+        except OSError:
+            pass
+
+    def files(self):
+        """Returns the (mtime, size, filename) of all the cached files, the least recently written first"""
+        result = []
+        for directory, _, names in os.walk(self.path):
+            for name in names:
+                if name.endswith('.npy'):
+                    filename = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(filename)
+                    except OSError:
+                        continue  # evicted by another process
+                    result.append((stat.st_mtime, stat.st_size, filename))
+        return sorted(result)
+
+    def written(self, size):
+        """Counts the bytes added by a write and evicts the files when it is due"""
+        if (self.max_size is None) and (self.max_age is None):
+            return
+        with self.lock:
+            if self.size is not None:
+                self.size += size
+            due = (self.size is None) or (time.time() - self.evicted >= self.evict_interval)
+            due = due or ((self.max_size is not None) and (self.size > self.max_size))
+            if due:
+                self.evicted = time.time()
+        if due:
+            self.evict()
+
+    def evict(self):
+        if (self.max_size is None) and (self.max_age is None):
+            return
+        files = self.files()
+        size = sum([file[1] for file in files])
+        oldest = (time.time() - self.max_age) if self.max_age is not None else None
+        for mtime, file_size, filename in files:
+            if ((oldest is None) or (mtime >= oldest)) and ((self.max_size is None) or (size <= self.max_size)):
+                break
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+            size -= file_size
+        with self.lock:
+            self.size = size
+            self.evicted = time.time()
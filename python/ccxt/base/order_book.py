@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+import decimal
+import math
+
+from ccxt.base.errors import BadResponse
+from ccxt.base.errors import InvalidNonce
+from ccxt.base.exchange import Exchange
+
+__all__ = [
+    'OrderBook',
+    'OrderBookSide',
+]
+
+
+class OrderBookSide(object):
+    """The bids or the asks of a local order book, in a sorted list of keys and a parallel list of amounts
+
+    The keys are the prices for the asks and the negated prices for the bids, so that the best level is
+    the first one on both sides. A level is found by a binary search, an insert or a delete shifts the
+    levels behind it with a single memmove of the lists, and a level with a zero amount is deleted.
+    """
+
+    def __init__(self, levels=(), descending=False):
+        self.descending = descending
+        self.keys = []
+        self.amounts = []
+        self.update(levels)
+
+    def store(self, price, amount):
+        """Sets the amount at a price, an amount of zero removes the price"""
+        key = -price if self.descending else price
+        index = bisect.bisect_left(self.keys, key)
+        found = (index < len(self.keys)) and (self.keys[index] == key)
+        if amount:
+            if found:
+                self.amounts[index] = amount
+            else:
+                self.keys.insert(index, key)
+                self.amounts.insert(index, amount)
+        elif found:
+            del self.keys[index]
+            del self.amounts[index]
+
+    def update(self, levels):
+        for level in levels:
+            self.store(level[0], level[1])
+
+    def clear(self):
+        self.keys = []
+        self.amounts = []
+
+    def limit(self, depth):
+        """Drops the levels beyond the depth"""
+        del self.keys[depth:]
+        del self.amounts[depth:]
+
+    def top(self, limit=None):
+        """Returns the best levels as [price, amount] lists, best first"""
+        keys = self.keys[:limit] if limit is not None else self.keys
+        sign = -1 if self.descending else 1
+        return [[sign * key, amount] for key, amount in zip(keys, self.amounts)]
+
+    def best(self):
+        return [-self.keys[0] if self.descending else self.keys[0], self.amounts[0]] if self.keys else None
+
+    def amount(self, price):
+        key = -price if self.descending else price
+        index = bisect.bisect_left(self.keys, key)
+        return self.amounts[index] if (index < len(self.keys)) and (self.keys[index] == key) else 0
+
+    def group(self, step, limit=None):
+        """Aggregates the levels into price buckets of the step, the bids are rounded down and the asks up"""
+        result = []
+        digits = max(0, -decimal.Decimal(repr(step)).as_tuple().exponent)  # drops the float noise of the multiplication
+        for key, amount in zip(self.keys, self.amounts):
+            # the bids are negated, so rounding the keys up rounds the prices of both sides away from the spread
+            price = round(math.ceil(round(key / step, 9)) * step, digits)
+            price = -price if self.descending else price
+            if result and (result[-1][0] == price):
+                result[-1][1] += amount
+            elif (limit is not None) and (len(result) == limit):
+                break
+            else:
+                result.append([price, amount])
+        return result
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class OrderBook(object):
+    """A local order book, seeded from a snapshot of fetch_order_book() and kept up to date with deltas
+
+        book = OrderBook(exchange.fetch_order_book('ETH/BTC'))
+        book.update(bids, asks, nonce=last_update_id, first_nonce=first_update_id)
+        book.top(10)
+
+    The nonce of the snapshot, like the lastUpdateId of binance or the seq of poloniex, orders the deltas:
+    a delta that covers the nonces up to the one of the book is stale and is skipped, and a delta that starts
+    beyond the next nonce means that some deltas are missing, it raises InvalidNonce and the book has to be
+    seeded again. A checksum function of the book, when given, validates the book after every delta.
+    """
+
+    def __init__(self, snapshot=None, depth=None, checksum=None):
+        self.bids = OrderBookSide(descending=True)
+        self.asks = OrderBookSide()
+        self.depth = depth  # the number of levels kept per side, None for all
+        self.checksum = checksum  # a function of the book that returns the checksum sent by the exchange
+        self.nonce = None
+        self.timestamp = None
+        self.datetime = None
+        if snapshot is not None:
+            self.reset(snapshot)
+
+    def reset(self, snapshot):
+        """Replaces the levels with the ones of a snapshot from fetch_order_book()"""
+        self.bids = OrderBookSide(snapshot.get('bids', []), True)
+        self.asks = OrderBookSide(snapshot.get('asks', []))
+        self.nonce = snapshot.get('nonce')
+        self.timestamp = snapshot.get('timestamp')
+        self.datetime = snapshot.get('datetime')
+        self.limit()
+
+    def update(self, bids=(), asks=(), nonce=None, first_nonce=None, timestamp=None, checksum=None):
+        """Applies a delta of [price, amount] levels, returns False for a stale delta that was skipped
+
+        The delta covers the nonces from first_nonce to nonce, a delta of a single nonce needs only the nonce.
+        """
+        if (nonce is not None) and (self.nonce is not None):
+            first_nonce = nonce if first_nonce is None else first_nonce
+            if nonce <= self.nonce:
+                return False
+            if first_nonce > self.nonce + 1:
+                raise InvalidNonce('order book nonce gap, expected ' + str(self.nonce + 1) + ', received ' + str(first_nonce))
+        self.bids.update(bids)
+        self.asks.update(asks)
+        self.limit()
+        if nonce is not None:
+            self.nonce = nonce
+        if timestamp is not None:
+            self.timestamp = timestamp
+            self.datetime = Exchange.iso8601(timestamp)
+        if (checksum is not None) and (self.checksum is not None):
+            expected = self.checksum(self)
+            if expected != checksum:
+                raise BadResponse('order book checksum mismatch, expected ' + str(checksum) + ', computed ' + str(expected))
+        return True
+
+    def limit(self):
+        if self.depth is not None:
+            self.bids.limit(self.depth)
+            self.asks.limit(self.depth)
+
+    def top(self, limit=None):
+        """Returns the best levels in the structure of fetch_order_book()"""
+        return {
+            'bids': self.bids.top(limit),
+            'asks': self.asks.top(limit),
+            'timestamp': self.timestamp,
+            'datetime': self.datetime,
+            'nonce': self.nonce,
+        }
+
+    def group(self, step, limit=None):
+        """Returns the levels aggregated into price buckets of the step in the structure of fetch_order_book()"""
+        return {
+            'bids': self.bids.group(step, limit),
+            'asks': self.asks.group(step, limit),
+            'timestamp': self.timestamp,
+            'datetime': self.datetime,
+            'nonce': self.nonce,
+        }
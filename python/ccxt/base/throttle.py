@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # file locks are not available on Windows
+
+from ccxt.base.errors import NotSupported
+
+# time.monotonic() is not available in Python 2
+monotonic = getattr(time, 'monotonic', time.time)
+
+__all__ = [
+    'throttle',
+    'TokenBucket',
+    'FileTokenBucket',
+]
+
+
+class TokenBucket(object):
+    """A blocking token bucket, the counterpart of ccxt.async_support.base.throttle
+
+    The bucket holds up to capacity tokens and refills at refillRate tokens per millisecond. A call
+    proceeds as soon as the balance is positive and then takes its cost from it, which may leave the
+    balance negative until it is refilled.
+
+    The bucket is thread-safe, a single instance can be shared by several threads and exchange instances
+    to keep all of them within one budget, for example {'throttle': bucket} for every instance with the
+    same api key. A call reserves its tokens under the lock and sleeps outside of it, so the waiting
+    threads proceed one after another in the order of their calls.
+    """
+
+    def __init__(self, config=None):
+        self.config = {
+            'refillRate': 0.001,
+            'defaultCost': 1.000,
+            'capacity': 1.000,
+        }
+        self.config.update(config or {})
+        self.lock = threading.Lock()
+        self.state = {
+            'numTokens': 0,
+            'lastTimestamp': self.now(),
+        }
+
+    def now(self):
+        return monotonic()
+
+    def __call__(self, cost=None):
+        delay = self.reserve(self.config['defaultCost'] if cost is None else cost)
+        if delay > 0:
+            time.sleep(delay)
+
+    def reserve(self, cost):
+        """Takes the cost from the bucket and returns the number of seconds to wait before the call"""
+        with self.lock:
+            return self.take(self.state, cost)
+
+    def take(self, state, cost):
+        now = self.now()
+        elapsed = max(0, now - state['lastTimestamp'])
+        num_tokens = min(self.config['capacity'], state['numTokens'] + elapsed * self.config['refillRate'] * 1000)
+        state['lastTimestamp'] = now
+        state['numTokens'] = num_tokens - cost
+        return 0 if num_tokens > 0 else -num_tokens / (self.config['refillRate'] * 1000)
+
+
+class FileTokenBucket(TokenBucket):
+    """A token bucket kept in a file, shared by all processes that use the same path
+
+    The balance is stored in the file, which is locked for the time of a reservation. Timestamps are
+    taken from the wall clock, because the monotonic clocks of different processes are not comparable.
+    """
+
+    def __init__(self, path, config=None):
+        if fcntl is None:
+            raise NotSupported('FileTokenBucket requires fcntl file locks, which are not supported on this platform')
+        super(FileTokenBucket, self).__init__(config)
+        self.path = path
+
+    def now(self):
+        return time.time()
+
+    def reserve(self, cost):
+        with self.lock:
+            with open(self.path, 'a+') as file:
+                fcntl.flock(file, fcntl.LOCK_EX)
+                try:
+                    file.seek(0)
+                    contents = file.read()
+                    state = json.loads(contents) if contents else dict(self.state)
+                    delay = self.take(state, cost)
+                    file.seek(0)
+                    file.truncate()
+                    file.write(json.dumps(state))
+                    file.flush()
+                    return delay
+                finally:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def throttle(config=None):
+    return TokenBucket(config)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler  # Python 2
+    from SocketServer import ThreadingMixIn
+
+# ----------------------------------------------------------------------------
+# the local http server and the stub exchanges of the tests that send requests
+
+
+def reply_empty_object(handler):
+    return 200, {}, b'{}'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def reply(self):
+        self.server.requests.append((self.command, self.path, time.time()))
+        status, headers, body = self.server.respond(self)
+        headers = dict({'Content-Type': 'application/json'}, **headers)
+        if isinstance(body, bytes):
+            headers['Content-Length'] = str(len(body))
+            body = [body]
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        for chunk in body:
+            self.wfile.write(chunk)
+            self.wfile.flush()
+
+    do_GET = reply
+    do_POST = reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    """Serves the requests in daemon threads on a free port of 127.0.0.1 until shutdown()
+
+    respond(handler) returns the status, the headers and the body of the reply to a request, the body is bytes
+    or an iterable of chunks that are sent as they are produced, with the Content-Length in the headers.
+    The method, the path and the time of arrival of every request are appended to requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, respond=reply_empty_object):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StubHandler)
+        self.respond = respond
+        self.requests = []
+        self.url = 'http://127.0.0.1:' + str(self.server_address[1])
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+
+def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+    return {'url': self.urls['api'] + '/' + path, 'method': method, 'body': body, 'headers': headers}
+
+
+def stub_exchange(base, description):
+    """Returns a subclass of an Exchange class with the description that sends all requests to urls['api'] + '/' + path"""
+    def describe(self):
+        return self.deep_extend(base.describe(self), description)
+    return type(str(description['id']), (base,), {'describe': describe, 'sign': sign})
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.errors import DDoSProtection  # noqa: E402
+from stub_server import StubServer, stub_exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the stub server replies with the status and the headers that are queued for the next requests
+
+responses = []
+server = StubServer(lambda handler: (responses.pop(0) if responses else (200, {})) + (b'{}',))
+
+stub = stub_exchange(Exchange, {
+    'id': 'stub',
+    'rateLimit': 1,
+    'enableRateLimit': True,
+    'adaptiveRateLimit': True,
+    'urls': {'api': server.url},
+    'api': {
+        'public': {
+            'get': [
+                'ping',
+            ],
+        },
+    },
+})
+
+exchange = stub({
+    'rateLimitFeedback': {
+        'delay': 100,
+    },
+})
+
+# ----------------------------------------------------------------------------
+# the used weight close to the limit slows the rate limiter down, the responses below the threshold recover it
+
+responses.append((200, {'X-MBX-USED-WEIGHT': '1100'}))
+exchange.public_get_ping()
+assert(exchange.rateLimitSlowdown == 2)
+assert(exchange.rateLimitResumeTime == 0)
+
+responses.append((200, {'X-MBX-USED-WEIGHT': '100'}))
+exchange.public_get_ping()
+assert(abs(exchange.rateLimitSlowdown - 1.9) < 1e-9)
+
+responses.append((200, {'X-RateLimit-Remaining': '1', 'X-RateLimit-Limit': '100'}))
+exchange.public_get_ping()
+assert(abs(exchange.rateLimitSlowdown - 3.8) < 1e-9)
+
+# ----------------------------------------------------------------------------
+# a push back pauses the requests for the time in the Retry-After header
+
+responses.append((429, {'Retry-After': '1'}))
+try:
+    exchange.public_get_ping()
+    assert(False)
+except DDoSProtection:
+    pass
+assert(abs(exchange.rateLimitSlowdown - 7.6) < 1e-9)
+assert(exchange.rateLimitPushbacks == 1)
+
+exchange.public_get_ping()
+pause = server.requests[-1][2] - server.requests[-2][2]
+assert(1.0 <= pause < 1.5)  # with up to 25% of jitter
+assert(exchange.rateLimitPushbacks == 0)
+
+# ----------------------------------------------------------------------------
+# consecutive push backs without Retry-After double the pause
+
+responses.append((418, {}))
+responses.append((418, {}))
+for i in range(0, 2):
+    try:
+        exchange.public_get_ping()
+        assert(False)
+    except DDoSProtection:
+        pass
+exchange.public_get_ping()
+assert(exchange.rateLimitPushbacks == 0)
+assert(abs(exchange.rateLimitSlowdown - 15.9) < 1e-9)  # capped by maxSlowdown before the last response
+timestamps = [request[2] for request in server.requests[-3:]]
+assert(0.1 <= timestamps[1] - timestamps[0] < 0.2)
+assert(0.2 <= timestamps[2] - timestamps[1] < 0.3)
+
+# ----------------------------------------------------------------------------
+# the throughput recovers slowly while the responses are fine
+
+for i in range(0, 5):
+    exchange.public_get_ping()
+assert(abs(exchange.rateLimitSlowdown - 15.4) < 1e-9)
+
+server.shutdown()
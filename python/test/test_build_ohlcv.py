@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+from decimal import Decimal
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+start = 1546300800000  # 2019-01-01
+trades = [
+    {'timestamp': start + 1000, 'price': 10.0, 'amount': 1.0},
+    {'timestamp': start + 30000, 'price': 12.0, 'amount': 2.0},
+    {'timestamp': start + 59999, 'price': 9.0, 'amount': 0.5},
+    {'timestamp': start + 60000, 'price': 11.0, 'amount': 1.5},
+    {'timestamp': start + 245000, 'price': 13.0, 'amount': 1.0},
+]
+
+exchange = Exchange({'id': 'test'})
+assert(exchange.build_ohlcv(trades) == [
+    [start, 10.0, 12.0, 9.0, 9.0, 3.5],
+    [start + 60000, 11.0, 11.0, 11.0, 11.0, 1.5],
+    [start + 240000, 13.0, 13.0, 13.0, 13.0, 1.0],
+])
+assert(exchange.build_ohlcv(trades, '5m') == [[start, 10.0, 13.0, 9.0, 13.0, 6.0]])
+assert(exchange.build_ohlcv(trades, '1m', start + 30000, 4) == [[start, 12.0, 12.0, 9.0, 9.0, 2.5], [start + 60000, 11.0, 11.0, 11.0, 11.0, 1.5]])
+assert(exchange.build_ohlcv([], '1m') == [])
+assert(isinstance(exchange.build_ohlcv(trades)[0][0], int))
+
+# the numpy and the pure Python versions build the same candles of several timeframes
+random.seed(0)
+timestamp = start
+trades = []
+for i in range(0, 5000):
+    timestamp += random.randint(0, 5000)
+    trades.append({'timestamp': timestamp, 'price': random.randint(1, 1000) / 8.0, 'amount': random.randint(1, 100) / 4.0})
+timeframes = ['1m', '5m', '1h']
+durations = [(timeframe, exchange.parse_timeframe(timeframe) * 1000) for timeframe in timeframes]
+result = exchange.build_ohlcvs(trades, timeframes)
+assert(result == Exchange.build_ohlcvs_from_trades(trades, durations))
+assert(sum([ohlcv[5] for ohlcv in result['1h']]) == sum([trade['amount'] for trade in trades]))
+
+# the decimal numbers are aggregated without numpy
+decimals = Exchange({'id': 'test', 'numericMode': 'decimal'})
+trades = [{'timestamp': start + i * 20000, 'price': Decimal('0.1') * i, 'amount': Decimal('0.1')} for i in range(1, 5)]
+assert(decimals.build_ohlcv(trades) == [
+    [start, Decimal('0.1'), Decimal('0.2'), Decimal('0.1'), Decimal('0.2'), Decimal('0.2')],
+    [start + 60000, Decimal('0.3'), Decimal('0.4'), Decimal('0.3'), Decimal('0.4'), Decimal('0.2')],
+])
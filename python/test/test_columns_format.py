@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+
+import numpy
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the candles and the trades of the binance parsers in the columns format
+
+market = {'id': 'ETHBTC', 'symbol': 'ETH/BTC', 'base': 'ETH', 'quote': 'BTC'}
+start = 1546300800000  # 2019-01-01
+
+random.seed(0)
+raw_trades = [{
+    'a': 26129 + i,
+    'p': '{:.8f}'.format(random.uniform(0.03, 0.04)),
+    'q': '{:.8f}'.format(random.uniform(0, 10)),
+    'f': 27781 + i,
+    'l': 27781 + i,
+    'T': start + 1000 * i + random.randint(0, 999),
+    'm': random.random() < 0.5,
+    'M': True,
+} for i in range(0, 1000)]
+raw_trades = random.sample(raw_trades, len(raw_trades))
+raw_ohlcvs = [[start + 60000 * i, '0.03', '0.04', '0.02', '0.035', '{:.8f}'.format(i)] for i in range(0, 100)]
+
+
+class binance(ccxt.binance):
+
+    def fetch_trades(self, symbol, since=None, limit=None, params={}):
+        return self.parse_trades(raw_trades, market, since, limit)
+
+    def fetch_my_trades(self, symbol=None, since=None, limit=None, params={}):
+        return self.parse_trades(params['fills'], market, since, limit)
+
+
+dicts = binance()
+columns = binance({'ohlcvFormat': 'columns', 'tradesFormat': 'columns'})
+
+trades = dicts.fetch_trades('ETH/BTC', start + 10000, 500)
+result = columns.fetch_trades('ETH/BTC', start + 10000, 500)
+assert(sorted(result.keys()) == ['amount', 'price', 'side', 'timestamp'])
+assert(result['timestamp'].dtype == numpy.int64)
+assert(result['side'].dtype == numpy.int8)
+assert(result['timestamp'].tolist() == [trade['timestamp'] for trade in trades])
+assert(result['price'].tolist() == [trade['price'] for trade in trades])
+assert(result['amount'].tolist() == [trade['amount'] for trade in trades])
+assert(result['side'].tolist() == [1 if trade['side'] == 'buy' else -1 for trade in trades])
+assert(sum([column.nbytes for column in result.values()]) == 500 * (8 + 8 + 8 + 1))
+
+
+class limited(binance):
+
+    def fetch_trades(self, symbol, since=None, limit=50, params={}):
+        return self.parse_trades(raw_trades, market, since, limit)
+
+
+# the defaults of the exchange apply to the arguments that are not passed
+assert(len(limited({'tradesFormat': 'columns'}).fetch_trades('ETH/BTC')['timestamp']) == 50)
+assert(len(limited({'tradesFormat': 'columns'}).fetchTrades('ETH/BTC', limit=20)['timestamp']) == 20)
+
+# the other fields are kept on request
+columns.tradesColumns = ['timestamp', 'id', 'symbol', 'cost', 'info']
+result = columns.fetchTrades('ETH/BTC', None, 10)
+assert(result['id'].tolist() == [trade['id'] for trade in dicts.fetch_trades('ETH/BTC', None, 10)])
+assert(result['symbol'].tolist() == ['ETH/BTC'] * 10)
+assert(result['info'][0]['a'] >= 26129)
+
+ohlcvs = dicts.parse_ohlcvs(raw_ohlcvs, market, '1m', start + 60000, 10)
+result = columns.parse_ohlcvs(raw_ohlcvs, market, '1m', start + 60000, 10)
+assert(sorted(result.keys()) == ['close', 'high', 'low', 'open', 'timestamp', 'volume'])
+assert(result['timestamp'].dtype == numpy.int64)
+assert(Exchange.ohlcv_rows(result) == ohlcvs)
+assert(columns.parse_ohlcvs([], market)['timestamp'].tolist() == [])
+
+# the candles are built from the trades in the columns format
+columns.tradesColumns = ['timestamp', 'price', 'amount']
+trades = dicts.fetch_trades('ETH/BTC')
+result = columns.fetch_trades('ETH/BTC')
+assert(Exchange.ohlcv_rows(columns.build_ohlcv(result, '1m', start + 5000, 800)) == dicts.build_ohlcv(trades, '1m', start + 5000, 800))
+
+# the parsers get the trades in dicts, the fills of the binance orders have no timestamp
+fills = [{'price': '0.01000000', 'qty': '4.00000000', 'commission': '0.00004000', 'commissionAsset': 'BTC'}, {'price': '0.01100000', 'qty': '6.00000000', 'commission': '0.00006600', 'commissionAsset': 'BTC'}]
+order = {'symbol': 'ETHBTC', 'orderId': 28, 'transactTime': start, 'price': '0', 'origQty': '10', 'executedQty': '10', 'status': 'FILLED', 'type': 'MARKET', 'side': 'SELL', 'fills': fills}
+assert(abs(columns.parse_order(order, market)['cost'] - 0.106) < 1e-12)
+assert(len(columns.parse_trades(raw_trades, market)) == len(raw_trades))
+columns.tradesColumns = Exchange.tradesColumns
+result = columns.fetch_my_trades('ETH/BTC', None, None, {'fills': fills})
+assert(result['timestamp'].mask.tolist() == [True, True])
+assert(result['price'].tolist() == [0.01, 0.011])
+assert(result['side'].tolist() == [0, 0])
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.decimal_to_precision import decimal_to_precision   # noqa: E402
+from ccxt.base.decimal_to_precision import decimals_to_precision  # noqa: E402
+from ccxt.base.decimal_to_precision import TRUNCATE               # noqa: E402
+from ccxt.base.decimal_to_precision import ROUND                  # noqa: E402
+from ccxt.base.decimal_to_precision import DECIMAL_PLACES         # noqa: E402
+from ccxt.base.decimal_to_precision import SIGNIFICANT_DIGITS     # noqa: E402
+from ccxt.base.decimal_to_precision import PAD_WITH_ZERO          # noqa: E402
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# ----------------------------------------------------------------------------
+# lists of numbers are converted to lists of strings
+
+assert(decimals_to_precision([], ROUND, 2) == [])
+assert(decimals_to_precision([1.15, '1.005', 0.0, -2.5], ROUND, 2) == ['1.15', '1.01', '0', '-2.5'])
+assert(decimals_to_precision((1.15, '1.005', 0.0, -2.5), TRUNCATE, 1, DECIMAL_PLACES, PAD_WITH_ZERO) == ['1.1', '1.0', '0.0', '-2.5'])
+assert(decimals_to_precision([0.000123456, 123456.0], ROUND, 3, SIGNIFICANT_DIGITS) == ['0.000123', '123000'])
+
+random.seed(0)
+values = [random.uniform(-1000, 1000) for i in range(0, 1000)]
+modes = [
+    (ROUND, 8, DECIMAL_PLACES),
+    (TRUNCATE, 8, DECIMAL_PLACES),
+    (ROUND, -1, DECIMAL_PLACES),
+    (TRUNCATE, 5, SIGNIFICANT_DIGITS),
+]
+
+for rounding_mode, precision, counting_mode in modes:
+    expected = [decimal_to_precision(x, rounding_mode, precision, counting_mode) for x in values]
+    assert(decimals_to_precision(values, rounding_mode, precision, counting_mode) == expected)
+
+# ----------------------------------------------------------------------------
+# numpy arrays are converted to float arrays
+
+if numpy is not None:
+    assert(decimals_to_precision(numpy.array([1.15, 1.005, -2.5]), ROUND, 2).tolist() == [1.15, 1.01, -2.5])
+    assert(decimals_to_precision(numpy.array([1.15, 1.005, -2.5]), TRUNCATE, 1).tolist() == [1.1, 1.0, -2.5])
+    for rounding_mode, precision, counting_mode in modes:
+        expected = [float(decimal_to_precision(x, rounding_mode, precision, counting_mode)) for x in values]
+        assert(decimals_to_precision(numpy.array(values), rounding_mode, precision, counting_mode).tolist() == expected)
+
+    # the floats right below or above a decimal tie, like 6.049999999999999, are converted from their repr
+    # like decimal_to_precision() does, truncating never rounds them up
+    assert(decimals_to_precision(numpy.array([6.049999999999999, 94.84999999999998]), TRUNCATE, 3).tolist() == [6.049, 94.849])
+    assert(decimals_to_precision(numpy.array([52.294999999999995, 0.29, 1.005]), ROUND, 2).tolist() == [52.29, 0.29, 1.01])
+    ties = numpy.array([round(random.uniform(-1000, 1000), 2) + 0.005 for i in range(0, 1000)])
+    near_ties = numpy.concatenate([numpy.nextafter(ties, 0), numpy.nextafter(ties, ties * 2)])
+    for rounding_mode, precision, counting_mode, array in [
+        (ROUND, 2, DECIMAL_PLACES, ties),
+        (ROUND, 2, DECIMAL_PLACES, near_ties),
+        (TRUNCATE, 2, DECIMAL_PLACES, near_ties),
+        (TRUNCATE, 3, DECIMAL_PLACES, near_ties),
+        (ROUND, 4, SIGNIFICANT_DIGITS, near_ties),
+        (TRUNCATE, 4, SIGNIFICANT_DIGITS, near_ties),
+    ]:
+        expected = [float(decimal_to_precision(x, rounding_mode, precision, counting_mode)) for x in array.tolist()]
+        assert(decimals_to_precision(array, rounding_mode, precision, counting_mode).tolist() == expected)
+
+    # the values scaled by more than 10 ** 22, and the ties of the integer digits rounded to significant digits,
+    # which go to the number below like in decimal_to_precision()
+    small = numpy.array([3.5866710224801333e-13, 1.234567891234e-20, 9.87654321e-18])
+    integers = numpy.array([125.0, 135.0, 1250.0, 150.0, 125.5, 1249.999, 12345.0])
+    hundreds = numpy.array([150.0, 250.0, 1250.0, 1249.0, 49.99])
+    for rounding_mode, precision, counting_mode, array in [
+        (ROUND, 11, SIGNIFICANT_DIGITS, small),
+        (TRUNCATE, 11, SIGNIFICANT_DIGITS, small),
+        (ROUND, 24, DECIMAL_PLACES, small),
+        (ROUND, 1, SIGNIFICANT_DIGITS, integers),
+        (ROUND, 2, SIGNIFICANT_DIGITS, integers),
+        (ROUND, 3, SIGNIFICANT_DIGITS, integers),
+        (ROUND, -2, DECIMAL_PLACES, hundreds),
+        (TRUNCATE, -2, DECIMAL_PLACES, hundreds),
+    ]:
+        expected = [float(decimal_to_precision(x, rounding_mode, precision, counting_mode)) for x in array.tolist()]
+        assert(decimals_to_precision(array, rounding_mode, precision, counting_mode).tolist() == expected)
+    assert(decimals_to_precision(numpy.array([3.5866710224801333e-13]), ROUND, 11, SIGNIFICANT_DIGITS).tolist() == [3.5866710225e-13])
+    assert(decimals_to_precision(numpy.array([125.0, 125.5]), ROUND, 2, SIGNIFICANT_DIGITS).tolist() == [120.0, 130.0])
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange as AsyncExchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the stub exchanges return at most 300 candles per request, starting one candle before since, with a gap in the history
+
+minute = 60000
+start = 1546300800000  # 2019-01-01
+end = start + 10000 * minute
+history = [[start + i * minute, i, i, i, i, 1] for i in range(0, 10000) if not (4000 <= i < 4100)]
+
+
+def candles(since, limit):
+    result = [candle for candle in history if candle[0] >= since - minute]
+    return result[:min(limit, 300)]
+
+
+class stub(Exchange):
+
+    requests = 0
+    threads = set()
+
+    def load_markets(self, reload=False, params={}):
+        return {}
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        self.requests += 1
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.001)
+        return candles(since, limit)
+
+
+class async_stub(AsyncExchange):
+
+    requests = 0
+
+    async def load_markets(self, reload=False, params={}):
+        return {}
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        self.requests += 1
+        await asyncio.sleep(0.001)
+        return candles(since, limit)
+
+
+exchange = stub({'id': 'stub'})
+assert(exchange.ohlcv_windows('1m', start + 1, start + 1500 * minute) == [(start + minute, start + 501 * minute), (start + 501 * minute, start + 1001 * minute), (start + 1001 * minute, start + 1500 * minute)])
+
+# the candles are in order, without duplicates and the gap, the windows are fetched by several threads
+result = list(exchange.fetch_ohlcv_range('BTC/USDT', '1m', start, end))
+assert(result == history)
+assert(len(exchange.threads) > 1)
+
+# a window is fetched again from its last candle until it is complete, the first window of 300 takes one request
+# and the others two, because the exchange returns one candle before the window
+exchange = stub({'id': 'stub', 'ohlcvLimit': 300, 'ohlcvConcurrency': 1})
+assert(list(exchange.fetch_ohlcv_range('BTC/USDT', '1m', start, start + 1200 * minute)) == history[:1200])
+assert(exchange.requests == 1 + 2 + 2 + 2)
+# the window of 1000 takes four requests of 300 and the window of 200 one
+exchange = stub({'id': 'stub', 'ohlcvLimit': 1000})
+assert(list(exchange.fetch_ohlcv_range('BTC/USDT', '1m', start, start + 1200 * minute, 1000)) == history[:1200])
+assert(exchange.requests == 4 + 1)
+
+# the ranges that are not iterated to the end stop fetching
+exchange = stub({'id': 'stub'})
+iterator = exchange.fetch_ohlcv_range('BTC/USDT', '1m', start, end)
+assert(next(iterator) == history[0])
+iterator.close()
+assert(exchange.requests < 10)
+
+# the windows are fetched past the cache and stored in it, with as many requests as without the cache
+path = tempfile.mkdtemp()
+try:
+    uncached = stub({'id': 'stub', 'ohlcvLimit': 300, 'ohlcvConcurrency': 4})
+    assert(list(uncached.fetch_ohlcv_range('BTC/USDT', '1m', start, start + 3000 * minute)) == history[:3000])
+    exchange = stub({'id': 'stub', 'ohlcvLimit': 300, 'ohlcvConcurrency': 4, 'ohlcvCache': path})
+    assert(list(exchange.fetch_ohlcv_range('BTC/USDT', '1m', start, start + 3000 * minute)) == history[:3000])
+    assert(exchange.requests == uncached.requests)
+    assert(exchange.ohlcvCache.read('stub', 'BTC/USDT', '1m').tolist() == history[:3000])
+    exchange.requests = 0
+    assert(exchange.fetch_ohlcv('BTC/USDT', '1m', start + 100 * minute, 10) == history[100:110])
+    assert(exchange.requests == 0)
+    # the windows that would leave a gap in the cache are not stored
+    list(exchange.fetch_ohlcv_range('BTC/USDT', '1m', start + 5000 * minute, start + 5300 * minute))
+    assert(len(exchange.ohlcvCache.read('stub', 'BTC/USDT', '1m')) == 3000)
+finally:
+    shutil.rmtree(path)
+
+
+async def test_async_fetch_ohlcv_range():
+    exchange = async_stub({'id': 'stub'})
+    result = [candle async for candle in exchange.fetch_ohlcv_range('BTC/USDT', '1m', start, end)]
+    assert(result == history)
+    path = tempfile.mkdtemp()
+    try:
+        cached = async_stub({'id': 'stub', 'ohlcvCache': path})
+        assert([candle async for candle in cached.fetch_ohlcv_range('BTC/USDT', '1m', start, end)] == history)
+        assert(cached.requests == exchange.requests)
+        assert(len(cached.ohlcvCache.read('stub', 'BTC/USDT', '1m')) == len(history))
+        await cached.close()
+    finally:
+        shutil.rmtree(path)
+    iterator = exchange.fetch_ohlcv_range('BTC/USDT', '1m', start, end, 300)
+    assert((await iterator.__anext__()) == history[0])
+    iterator.close()
+    await exchange.close()
+
+
+asyncio.get_event_loop().run_until_complete(test_async_fetch_ohlcv_range())
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import hmac
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base import exchange as base  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the signatures made from the keyed copies match the ones made from scratch
+
+secret = base64.b64decode('a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5')
+for algorithm in [hashlib.md5, hashlib.sha1, hashlib.sha256, hashlib.sha384, hashlib.sha512]:
+    for request in [b'', b'nonce=1&method=balance', b'nonce=2&method=balance']:
+        expected = hmac.new(secret, request, algorithm)
+        assert(Exchange.hmac(request, secret, algorithm) == expected.hexdigest())
+        assert(Exchange.hmac(request, secret, algorithm, 'base64') == base64.b64encode(expected.digest()))
+        assert(Exchange.hmac(request, secret, algorithm, 'binary') == expected.digest())
+
+# another secret is keyed anew, the oldest keys are dropped above the limit
+
+assert(Exchange.hmac(b'request', b'secret') == hmac.new(b'secret', b'request', hashlib.sha256).hexdigest())
+assert(Exchange.hmac(b'request', b'another') == hmac.new(b'another', b'request', hashlib.sha256).hexdigest())
+for i in range(0, base.hmac_keys_limit * 2):
+    Exchange.hmac(b'request', str(i).encode())
+assert(len(base.hmac_keys) == base.hmac_keys_limit)
+assert((b'secret', hashlib.sha256) not in base.hmac_keys)
+assert(Exchange.hmac(b'request', b'secret') == hmac.new(b'secret', b'request', hashlib.sha256).hexdigest())
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.exchange import json_decoders  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# every decoder decodes str and bytes, the standard json is the fallback for what the others reject
+
+assert(list(json_decoders.keys())[-1] == 'json')
+assert(Exchange.jsonDecoder == list(json_decoders.keys())[0])
+
+for decoder in json_decoders:
+    exchange = Exchange({'id': 'test', 'jsonDecoder': decoder})
+    assert(exchange.parse_json('{"price":"0.01633102","amount":1.5}') == {'price': '0.01633102', 'amount': 1.5})
+    assert(exchange.parse_json(b'[{"id":1},{"id":2}]') == [{'id': 1}, {'id': 2}])
+    assert(exchange.parse_json(u'{"name":"é"}'.encode('utf-8')) == {'name': u'é'})
+    assert(exchange.parse_json(b'[1, NaN]')[0] == 1)
+    assert(exchange.parse_json(b'{"error":') is None)
+    assert(exchange.parse_json('<html></html>') is None)
+
+assert(Exchange.is_json_encoded_object(b'{}'))
+assert(Exchange.is_json_encoded_object('[]'))
+assert(not Exchange.is_json_encoded_object(b'ok'))
+assert(not Exchange.is_json_encoded_object(None))
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange as AsyncExchange  # noqa: E402
+from ccxt.base.json_stream import JsonStream  # noqa: E402
+from stub_server import StubServer, stub_exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the members are the same for any split of the document into chunks
+
+document = {
+    'error': [],
+    'skipped': {'result': {'A': 1}},
+    'result': {
+        'X' + str(i): {'bids': [[str(100 - i), '1.5']], 'asks': [[str(101 + i), '2']], 'name': u'é "\\ }]', 'seq': i} for i in range(0, 200)
+    },
+    'tail': [1, 2, 3],
+}
+text = json.dumps(document, ensure_ascii=False).encode('utf-8')
+
+for size in [1, 2, 3, 7, 64, 4096, len(text)]:
+    stream = JsonStream(['result'])
+    members = []
+    for i in range(0, len(text), size):
+        members.extend(stream.feed(text[i:i + size]))
+    members.extend(stream.close())
+    assert(members == list(document['result'].items()))
+
+stream = JsonStream()
+assert(stream.feed(b'[1, 22, {"a": [1]}, "x"') == [(0, 1), (1, 22), (2, {'a': [1]})])
+assert(stream.feed(b']') == [(3, 'x')])
+assert(stream.close() == [])
+
+stream = JsonStream(['result', 1])
+assert(stream.feed(b'{"result": [0, {"a": 1, "b": 2}]}') + stream.close() == [('a', 1), ('b', 2)])
+
+# a document without the container of the path is an error, like the error responses of kraken
+for body in [b'{"result": {"a": 1}}', b'{"error": ["EQuery:Unknown asset pair"]}']:
+    stream = JsonStream(['missing'])
+    try:
+        stream.feed(body)
+        assert(False)
+    except ValueError:
+        pass
+
+# a number split after its sign, its decimal point or its exponent is decoded whole
+for first, second, value in [(b'-', b'1', -1), (b'-0.', b'0025', -0.0025), (b'1e', b'3', 1000), (b'1.5E+', b'2', 150), (b'25e-', b'2', 0.25)]:
+    stream = JsonStream(['pre'])
+    members = stream.feed(b'{"pre": [' + first)
+    members += stream.feed(second + b', 7]}')
+    assert(members + stream.close() == [(0, value), (1, 7)])
+
+stream = JsonStream()
+assert(stream.feed(b'{"a": 1') == [])
+assert(stream.feed(b'2') == [])
+try:
+    stream.close()
+    assert(False)
+except ValueError:
+    pass
+
+# ----------------------------------------------------------------------------
+# the stub server sends the first half of the order books and waits to send the rest
+
+orderbooks = json.dumps({'BTC_ETH': {'bids': [['0.02', '1']], 'asks': [['0.03', '2'], ['0.025', '1']]}, 'BTC_LTC': {'bids': [], 'asks': []}}).encode()
+middle = orderbooks.index(b'"BTC_LTC"')
+events = []
+
+
+def respond(handler):
+    def body():
+        yield orderbooks[:middle]
+        event.wait(10)
+        yield orderbooks[middle:]
+    event = threading.Event()
+    events.append(event)
+    return 200, {'Content-Length': str(len(orderbooks))}, body()
+
+
+server = StubServer(respond)
+
+description = {
+    'id': 'stub',
+    'urls': {'api': server.url},
+    'api': {
+        'public': {
+            'get': [
+                'orderbooks',
+            ],
+        },
+    },
+}
+
+stub = stub_exchange(Exchange, description)
+async_stub = stub_exchange(AsyncExchange, description)
+
+exchange = stub()
+exchange.markets_by_id = {'BTC_ETH': {'symbol': 'ETH/BTC'}}
+members = exchange.publicGetOrderbooks(stream=[])
+symbol, orderbook = exchange.parse_streamed_order_book(*next(members))
+# the first order book is parsed before the rest of the response is sent
+assert(symbol == 'ETH/BTC')
+assert(orderbook['asks'] == [[0.025, 1.0], [0.03, 2.0]])
+events[-1].set()
+assert([exchange.parse_streamed_order_book(*member)[0] for member in members] == ['BTC_LTC'])
+
+
+async def test_async_stream():
+    exchange = async_stub()
+    members = await exchange.publicGetOrderbooks(stream=[])
+    market_id, orderbook = await members.__anext__()
+    assert(market_id == 'BTC_ETH')
+    events[-1].set()
+    assert([market_id async for market_id, orderbook in members] == ['BTC_LTC'])
+    await exchange.close()
+
+
+asyncio.get_event_loop().run_until_complete(test_async_stream())
+server.shutdown()
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ----------------------------------------------------------------------------
+# every script runs in a new interpreter, the exchanges it uses are not imported yet
+
+scripts = [
+    # the classes are imported on first access
+    'import ccxt; assert(ccxt.kraken().id == "kraken")',
+    # a derived exchange imports its parent exchange
+    'import ccxt; ccxt.hitbtc2(); assert(ccxt.hitbtc().id == "hitbtc")',
+    # the submodules imported directly are bound to the package as classes too
+    'from ccxt.kraken import kraken; import ccxt; assert(ccxt.kraken is kraken)',
+    'import ccxt.bitmex; assert(ccxt.bitmex().id == "bitmex")',
+    'import ccxt.async_support.bitmex; import ccxt.async_support as ccxt; assert(ccxt.bitmex.describe is not None)',
+    # unpickling imports the submodule of the class, like in a process started by multiprocessing with spawn
+    'import pickle; import ccxt; data = pickle.dumps(ccxt.kraken); del ccxt.kraken; pickle.loads(data); assert(ccxt.kraken().id == "kraken")',
+    'import ccxt, pickle; pickle.loads(b"\\x80\\x03cccxt.kraken\\nkraken\\nq\\x00."); assert(ccxt.kraken().id == "kraken")',
+]
+
+if sys.version_info >= (3, 7):
+    for script in scripts:
+        subprocess.check_call([sys.executable, '-c', script], cwd=root)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.errors import BaseError  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the stub server replies with a large order book to /orderbook and with an error to /error
+
+orderbook = json.dumps({'bids': [[10000 - i, 1] for i in range(0, 5000)], 'asks': [[10001 + i, 1] for i in range(0, 5000)]}).encode()
+
+
+def respond(handler):
+    status, body = (200, orderbook) if handler.path == '/orderbook' else (400, b'{"error":"invalid order"}')
+    return status, {'X-RateLimit-Remaining': '99'}, body
+
+
+server = StubServer(respond)
+url = server.url
+
+# ----------------------------------------------------------------------------
+# everything is kept by default
+
+exchange = Exchange({'id': 'stub'})
+assert(exchange.fetch(url + '/orderbook')['bids'][0] == [10000, 1])
+assert(exchange.last_http_response == orderbook.decode())
+assert(exchange.last_json_response['asks'][0] == [10001, 1])
+assert(exchange.last_response_info['status'] == 200)
+assert(exchange.last_response_info['size'] == len(orderbook))
+assert(sorted(exchange.last_response_info['headers'].keys()) == ['Content-Length', 'Content-Type', 'Date', 'X-RateLimit-Remaining'])
+
+# the responses above the size limit are not kept
+
+exchange = Exchange({'id': 'stub', 'lastResponseMaxSize': 1000})
+exchange.fetch(url + '/orderbook')
+assert(exchange.last_http_response is None)
+assert(exchange.last_json_response is None)
+assert(exchange.last_response_headers['Content-Length'] == str(len(orderbook)))
+
+# only the metadata is kept in the lean mode, except for the failed requests
+
+exchange = Exchange({'id': 'stub', 'leanMode': True})
+assert(exchange.fetch(url + '/orderbook')['bids'][0] == [10000, 1])
+assert(exchange.last_http_response is None)
+assert(exchange.last_json_response is None)
+assert(exchange.last_response_headers == exchange.last_response_info['headers'])
+assert(exchange.last_response_info['size'] == len(orderbook))
+try:
+    exchange.fetch(url + '/error')
+    assert(False)
+except BaseError:
+    assert(exchange.last_json_response == {'error': 'invalid order'})
+    assert(exchange.last_response_info['status'] == 400)
+
+server.shutdown()
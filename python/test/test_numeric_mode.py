@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+from decimal import Decimal
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+market = {'id': 'ETHBTC', 'symbol': 'ETH/BTC', 'base': 'ETH', 'quote': 'BTC'}
+trade = '{"a":26129,"p":"0.01633102","q":"4.70443515","f":27781,"l":27781,"T":1498793709153,"m":true,"M":true}'
+orderbook = '{"lastUpdateId":1027024,"bids":[["9.5","10.0"],["10.25","3.0"]],"asks":[["10.5","1.0"],["9.75","2.0"]]}'
+
+# float is the default and keeps the previous behavior
+exchange = ccxt.binance()
+assert(exchange.safe_float({'price': '0.1'}, 'price') == 0.1)
+assert(exchange.parse_trade(exchange.parse_json(trade), market)['cost'] == 0.01633102 * 4.70443515)
+
+# decimal numbers are exact from the json decoder to the computed cost
+exchange = ccxt.binance({'numericMode': 'decimal'})
+assert(exchange.parse_json('{"price":0.1}')['price'] == Decimal('0.1'))
+assert(exchange.safe_float({'price': '0.1'}, 'price') == Decimal('0.1'))
+assert(exchange.safe_float({'price': 0.1}, 'price') == Decimal('0.1'))
+assert(exchange.safe_float({'price': ''}, 'price', 5) == 5)
+assert(exchange.safe_float({'price': 'NaN'}, 'price') is None)
+assert(exchange.safe_float_2({}, 'a', 'b', 1) == 1)
+assert(exchange.safeFloat(['1', '2'], 1) == Decimal('2'))
+parsed = exchange.parse_trade(exchange.parse_json(trade), market)
+assert(parsed['price'] == Decimal('0.01633102'))
+assert(parsed['cost'] == Decimal('0.0768282245233530'))
+book = exchange.parse_order_book(exchange.parse_json(orderbook))
+assert(book['bids'] == [[Decimal('10.25'), Decimal('3.0')], [Decimal('9.5'), Decimal('10.0')]])
+assert(book['asks'][0] == [Decimal('9.75'), Decimal('2.0')])
+
+# strings are kept as they are, the parsed trades are computed with decimals and converted to strings
+exchange = ccxt.binance({'numericMode': 'string'})
+assert(exchange.parse_json('{"price":0.10}')['price'] == Decimal('0.10'))
+assert(exchange.safe_float(exchange.parse_json('{"price":0.10}'), 'price') == '0.10')
+assert(exchange.safe_float({'price': '0.10'}, 'price') == '0.10')
+assert(exchange.safe_float({'price': 1e-7}, 'price') == '0.0000001')
+assert(exchange.safe_float({'price': 'abc'}, 'price') is None)
+parsed = exchange.parseTrade(exchange.parse_json(trade), market)
+assert((parsed['price'], parsed['amount'], parsed['cost']) == ('0.01633102', '4.70443515', '0.0768282245233530'))
+assert(exchange.safe_float({'price': '0.10'}, 'price') == '0.10')
+book = exchange.parse_order_book(exchange.parse_json(orderbook))
+assert(book['bids'] == [['10.25', '3.0'], ['9.5', '10.0']])
+assert(book['asks'] == [['9.75', '2.0'], ['10.5', '1.0']])
+
+# the internal numbers of the rate limiter are floats in every mode
+assert(exchange.rate_limit_usage({'X-MBX-USED-WEIGHT': '600'}) == 0.5)
+
+# the orders sum the costs and the fees of their fills in every mode, the fills are parsed by the nested parse_trade
+order = '{"symbol":"ETHBTC","orderId":28,"transactTime":1507725176595,"price":"0.00000000","origQty":"10.00000000","executedQty":"10.00000000","cummulativeQuoteQty":"0.10600000","status":"FILLED","type":"MARKET","side":"SELL","fills":[{"price":"0.01000000","qty":"4.00000000","commission":"0.00004000","commissionAsset":"BTC"},{"price":"0.01100000","qty":"6.00000000","commission":"0.00006600","commissionAsset":"BTC"}]}'
+exchange = ccxt.binance({'numericMode': 'decimal'})
+parsed = exchange.parse_order(exchange.parse_json(order), market)
+assert((parsed['cost'], parsed['average'], parsed['fee']['cost']) == (Decimal('0.106'), Decimal('0.0106'), Decimal('0.000106')))
+exchange = ccxt.binance({'numericMode': 'string'})
+parsed = exchange.parse_order(exchange.parse_json(order), market)
+assert((parsed['cost'], parsed['average'], parsed['fee']['cost']) == ('0.1060000000000000', '0.01060000', '0.00010600'))
+assert(exchange.numericContext.mode is None)
+assert(exchange.sum(Decimal('0.1'), None, 0.2) == Decimal('0.3'))
+
+# the parsers do arithmetic on the raw numbers of the responses in the string mode too
+exchange = ccxt.kraken({'numericMode': 'string'})
+kraken_market = {'id': 'XXBTZUSD', 'symbol': 'BTC/USD', 'base': 'BTC', 'quote': 'USD'}
+kraken_trade = '{"ordertxid":"O1","postxid":"P1","time":1551297455.1234,"type":"buy","ordertype":"limit","price":"3800.1","vol":"0.5","fee":"0.1"}'
+exchange.markets_by_id = {}
+parsed = exchange.parse_trade(exchange.parse_json(kraken_trade), kraken_market)
+assert((parsed['timestamp'], parsed['price'], parsed['cost']) == (1551297455123, '3800.1', '1900.05'))
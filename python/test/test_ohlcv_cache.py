@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.ohlcv_cache import OHLCVCache  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange as AsyncExchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the stub exchanges return at most 300 candles per request from a history that grows with the time
+
+minute = 60000
+start = 1546300800000  # 2019-01-01
+history = [[start + i * minute, i + 0.5, i + 1, i, i + 0.25, None if i == 7 else 10.0] for i in range(0, 3000)]
+
+
+def candles(since, limit, now):
+    result = [candle for candle in history if candle[0] < now]
+    limit = min(limit or 300, 300)
+    return result[-limit:] if since is None else [candle for candle in result if candle[0] >= since][:limit]
+
+
+class stub(Exchange):
+
+    now = start + 1000 * minute
+    requests = []
+
+    def milliseconds(self):
+        return self.now
+
+    def load_markets(self, reload=False, params={}):
+        return {}
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        self.requests.append(since)
+        return candles(since, limit, self.now)
+
+
+class async_stub(AsyncExchange):
+
+    now = start + 1000 * minute
+    requests = []
+
+    def milliseconds(self):
+        return self.now
+
+    async def load_markets(self, reload=False, params={}):
+        return {}
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        self.requests.append(since)
+        return candles(since, limit, self.now)
+
+
+path = tempfile.mkdtemp()
+try:
+    exchange = stub({'id': 'stub', 'ohlcvCache': path, 'requests': []})
+    assert(isinstance(exchange.ohlcvCache, OHLCVCache))
+
+    # the first call fetches and caches the candles, with None values stored as nan
+    assert(exchange.fetch_ohlcv('BTC/USDT', '1m', start, 100) == history[:100])
+    assert(exchange.fetchOHLCV('BTC/USDT', '1m', start + 5 * minute, 5) == history[5:10])
+    cached = exchange.ohlcvCache.read('stub', 'BTC/USDT', '1m')
+    assert(cached.shape == (1000, 6))
+    assert(cached.flags['F_CONTIGUOUS'])
+    assert(os.path.isfile(os.path.join(path, 'stub', 'BTC%2FUSDT', '1m.npy')))
+
+    # the cached candles are returned without requests
+    exchange.requests = []
+    assert(exchange.fetch_ohlcv('BTC/USDT', '1m', start + 200 * minute, 300) == history[200:500])
+    assert(exchange.requests == [])
+
+    # a refresh fetches from the last cached candle only
+    exchange.now = start + 1500 * minute
+    assert(exchange.fetch_ohlcv('BTC/USDT', '1m', start + 900 * minute) == history[900:1500])
+    assert(exchange.requests == [start + 999 * minute, start + 1299 * minute])
+    exchange.requests = []
+    assert(exchange.fetch_ohlcv('BTC/USDT', '1m', None, 10) == history[1490:1500])
+    assert(exchange.requests == [start + 1499 * minute])
+
+    # the candles before the cached ones are fetched too, the ones with params are not cached
+    exchange.ohlcvCache.write('stub', 'BTC/USDT', '1m', history[1000:1500])
+    exchange.requests = []
+    assert(exchange.fetch_ohlcv('BTC/USDT', '1m', start + 950 * minute, 100) == history[950:1050])
+    assert(exchange.requests == [start + 950 * minute])
+    assert(exchange.fetch_ohlcv('BTC/USDT', '1m', start, 10, {'price': 'mark'}) == history[:10])
+    assert(exchange.ohlcvCache.read('stub', 'BTC/USDT', '1m').shape == (550, 6))
+
+    # the cache is disabled and enabled again
+    exchange.set_ohlcv_cache(None)
+    exchange.requests = []
+    assert(exchange.fetch_ohlcv('BTC/USDT', '1m', start + 950 * minute, 10) == history[950:960])
+    assert(len(exchange.requests) == 1)
+    exchange.set_ohlcv_cache(path)
+    exchange.set_ohlcv_cache(path)
+    assert(exchange.fetch_ohlcv('BTC/USDT', '1m', start + 950 * minute, 10) == history[950:960])
+    assert(len(exchange.requests) == 1)
+
+    # the files are evicted by age and then by size, the least recently written first
+    exchange.ohlcvCache.delete('stub', 'BTC/USDT', '1m')
+    cache = OHLCVCache(path, max_size=3 * 3000, max_age=3600)  # the files of 50 candles take 2528 bytes
+    for i, symbol in enumerate(['ETH/USDT', 'LTC/USDT', 'XRP/USDT']):
+        cache.write('stub', symbol, '1m', history[:50])
+        os.utime(cache.filename('stub', symbol, '1m'), (time.time() - 10 + i, time.time() - 10 + i))
+    os.utime(cache.filename('stub', 'ETH/USDT', '1m'), (time.time() - 7200, time.time() - 7200))
+    cache.evict()
+    assert([os.path.dirname(file[2]) for file in cache.files()] == [os.path.join(path, 'stub', symbol) for symbol in ['LTC%2FUSDT', 'XRP%2FUSDT']])
+    cache.write('stub', 'EOS/USDT', '1m', history[:50])
+    cache.write('stub', 'ADA/USDT', '1m', history[:50])
+    assert(cache.read('stub', 'LTC/USDT', '1m') is None)
+    assert(len(cache.files()) == 3)
+
+    # the cache is walked for the eviction only every evict_interval seconds while it is below max_size
+    walks = []
+    cache = OHLCVCache(path, max_size=1 << 20, evict_interval=3600)
+    files = cache.files
+    cache.files = lambda: walks.append(len(walks)) or files()
+    for symbol in ['EOS/USDT', 'ADA/USDT', 'TRX/USDT']:
+        cache.write('stub', symbol, '1m', history[:50])
+    assert(walks == [0])
+
+    # the threads merge their candles into the same file without losing any
+    cache = OHLCVCache(path)
+    threads = [threading.Thread(target=cache.merge, args=('stub', 'DOT/USDT', '1m', history[100 + i * 10:110 + i * 10])) for i in range(0, 50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert(cache.read('stub', 'DOT/USDT', '1m').tolist() == history[100:600])
+    assert(cache.merge('stub', 'DOT/USDT', '1m', [history[100][:5] + [7.0]])[0].tolist() == history[100][:5] + [7.0])
+
+    async def test_async_ohlcv_cache():
+        exchange = async_stub({'id': 'stub', 'ohlcvCache': path, 'requests': []})
+        assert((await exchange.fetch_ohlcv('BTC/USDT', '1m', start, 100)) == history[:100])
+        exchange.now = start + 1500 * minute
+        exchange.requests = []
+        assert((await exchange.fetch_ohlcv('BTC/USDT', '1m', start + 900 * minute)) == history[900:1500])
+        assert(exchange.requests == [start + 999 * minute, start + 1299 * minute])
+        await exchange.close()
+
+    asyncio.get_event_loop().run_until_complete(test_async_ohlcv_cache())
+finally:
+    shutil.rmtree(path)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import zlib
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.order_book import OrderBook  # noqa: E402
+from ccxt.base.errors import BadResponse  # noqa: E402
+from ccxt.base.errors import InvalidNonce  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+snapshot = {
+    'bids': [[10.4, 1.0], [10.5, 2.0], [10.1, 3.0]],
+    'asks': [[11.0, 1.0], [11.25, 2.0], [12.0, 0.5]],
+    'timestamp': None,
+    'datetime': None,
+    'nonce': 100,
+}
+
+book = OrderBook(snapshot)
+assert(book.top() == {'bids': [[10.5, 2.0], [10.4, 1.0], [10.1, 3.0]], 'asks': [[11.0, 1.0], [11.25, 2.0], [12.0, 0.5]], 'timestamp': None, 'datetime': None, 'nonce': 100})
+assert(book.bids.best() == [10.5, 2.0])
+assert(book.asks.best() == [11.0, 1.0])
+
+# the levels are inserted, updated and deleted by price
+assert(book.update([[10.6, 1.5], [10.4, 0], [10.1, 4.0]], [[11.0, 0], [11.1, 1.0]], 101, 101, 1565000000000))
+assert(book.top(2) == {'bids': [[10.6, 1.5], [10.5, 2.0]], 'asks': [[11.1, 1.0], [11.25, 2.0]], 'timestamp': 1565000000000, 'datetime': '2019-08-05T10:13:20.000Z', 'nonce': 101})
+assert(book.bids.amount(10.1) == 4.0)
+assert(book.bids.amount(10.4) == 0)
+assert(book.update([], [[12.0, 0], [13.0, 0]], 105, 102))
+assert(book.asks.top() == [[11.1, 1.0], [11.25, 2.0]])
+assert(len(book.asks) == 2)
+
+# the stale deltas are skipped, a gap in the nonces raises
+assert(not book.update([[1.0, 1.0]], [], 105, 103))
+assert(book.bids.amount(1.0) == 0)
+try:
+    book.update([[1.0, 1.0]], [], 110, 107)
+    assert(False)
+except InvalidNonce:
+    pass
+
+# the levels are aggregated away from the spread
+book = OrderBook({'bids': [[10.45, 1.0], [10.41, 2.0], [10.3, 1.0]], 'asks': [[10.51, 1.0], [10.59, 2.0], [10.6, 0.5], [10.7, 1.0]]})
+assert(book.group(0.1) == {'bids': [[10.4, 3.0], [10.3, 1.0]], 'asks': [[10.6, 3.5], [10.7, 1.0]], 'timestamp': None, 'datetime': None, 'nonce': None})
+assert(book.group(0.1, 1)['asks'] == [[10.6, 3.5]])
+
+# the depth limits the levels kept per side
+book = OrderBook(snapshot, depth=2)
+assert(book.bids.top() == [[10.5, 2.0], [10.4, 1.0]])
+book.update([[10.7, 1.0]], [], 101)
+assert(book.bids.top() == [[10.7, 1.0], [10.5, 2.0]])
+
+
+# the checksum validates the book after the deltas
+def crc32(book):
+    levels = book.top(2)
+    return zlib.crc32(':'.join(str(level[0]) + ':' + str(level[1]) for side in ('bids', 'asks') for level in levels[side]).encode())
+
+
+book = OrderBook(snapshot, checksum=crc32)
+book.update([[10.6, 1.0]], [], 101, checksum=zlib.crc32(b'10.6:1.0:10.5:2.0:11.0:1.0:11.25:2.0'))
+try:
+    book.update([[10.7, 1.0]], [], 102, checksum=0)
+    assert(False)
+except BadResponse:
+    pass
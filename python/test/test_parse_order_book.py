@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+import numpy
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+orderbook = {
+    'bids': [['10.5', '1', []], ['10.2', '0'], ['10.4', '2.5'], ['', '1'], ['10.1', '3']],
+    'asks': [['11', '1'], ['11.5', '2'], ['12', '0.5']],
+}
+dicts = {
+    'bids': [{'price': 10.5, 'size': 1}, {'size': 2}, {'price': 10.6, 'size': 2}],
+    'asks': [],
+}
+
+# the levels are filtered, converted and sorted as before, the sorted levels are kept as they are
+
+exchange = Exchange({'id': 'test'})
+parsed = exchange.parse_order_book(orderbook)
+assert(parsed['bids'] == [[10.5, 1.0], [10.4, 2.5], [10.2, 0.0], [10.1, 3.0]])
+assert(parsed['asks'] == [[11.0, 1.0], [11.5, 2.0], [12.0, 0.5]])
+parsed = exchange.parse_order_book(dicts, None, 'bids', 'asks', 'price', 'size')
+assert(parsed['bids'] == [[10.6, 2.0], [10.5, 1.0]])
+assert(parsed['asks'] == [])
+assert(exchange.parse_order_book({})['bids'] == [])
+
+levels = [[1.0, 1.0], [2.0, 2.0], [2.0, 3.0], [3.0, 1.0]]
+assert(Exchange.sort_bids_asks(levels) == levels)
+assert(Exchange.sort_bids_asks(levels, True) == [[3.0, 1.0], [2.0, 2.0], [2.0, 3.0], [1.0, 1.0]])
+assert(Exchange.sort_bids_asks([]) == [])
+
+# the levels in numpy arrays
+
+exchange = Exchange({'id': 'test', 'orderBookArrays': True})
+parsed = exchange.parse_order_book(orderbook)
+assert(isinstance(parsed['bids'], numpy.ndarray))
+assert(parsed['bids'].tolist() == [[10.5, 1.0], [10.4, 2.5], [10.2, 0.0], [10.1, 3.0]])
+assert(parsed['asks'].tolist() == [[11.0, 1.0], [11.5, 2.0], [12.0, 0.5]])
+assert(exchange.parse_order_book(dicts, None, 'bids', 'asks', 'price', 'size')['bids'].tolist() == [[10.6, 2.0], [10.5, 1.0]])
+assert(exchange.parse_order_book({})['asks'].shape == (0, 2))
+
+array = numpy.array([[3.0, 1.0], [1.0, 2.0], [3.0, 2.0], [2.0, 0.0], [1.0, 1.0]])
+assert(Exchange.aggregate(array).tolist() == Exchange.aggregate(array.tolist()) == [[3.0, 3.0], [1.0, 3.0]])
+assert(Exchange.sort_bids_asks(Exchange.aggregate(array), True).tolist() == [[3.0, 3.0], [1.0, 3.0]])
+assert(Exchange.sort_bids_asks(Exchange.aggregate(array)).tolist() == [[1.0, 3.0], [3.0, 3.0]])
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange as AsyncExchange  # noqa: E402
+from ccxt.base.errors import BaseError  # noqa: E402
+from stub_server import StubServer, stub_exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the stub server replies with an order book to /depth and with an error to /error
+
+depth = b'{"lastUpdateId":1027024,"bids":[["4.00000000","431.00000000",[]]],"asks":[["4.00000200","12.00000000",[]]]}'
+server = StubServer(lambda handler: (200, {}, depth) if handler.path == '/depth' else (400, {}, b'{"msg":"invalid symbol"}'))
+
+description = {
+    'id': 'stub',
+    'urls': {'api': server.url},
+    'api': {
+        'public': {
+            'get': [
+                'depth',
+                'error',
+            ],
+        },
+    },
+}
+
+
+class stub(stub_exchange(Exchange, description)):
+
+    def request(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        response = self.fetch2(path, api, method, params, headers, body)
+        return response['bids']  # checks the decoded json like the exchanges do
+
+
+async_stub = stub_exchange(AsyncExchange, description)
+
+# ----------------------------------------------------------------------------
+
+exchange = stub()
+assert(exchange.publicGetDepth() == [['4.00000000', '431.00000000', []]])
+response = exchange.publicGetDepth({}, raw=True)
+assert(response['status'] == 200)
+assert(response['headers']['Content-Type'] == 'application/json')
+assert(response['body'] == depth)
+assert(exchange.last_response_info['size'] == len(depth))
+
+# the failed requests raise in the raw mode too
+exchange = stub({'rawMode': True})
+assert(exchange.public_get_depth()['body'] == depth)
+try:
+    exchange.publicGetError()
+    assert(False)
+except BaseError as e:
+    assert('invalid symbol' in str(e))
+
+
+async def test_async_raw_mode():
+    exchange = async_stub({'rawMode': True})
+    response = await exchange.publicGetDepth()
+    assert(response['body'] == depth)
+    assert((await exchange.publicGetDepth({}, raw=False))['asks'][0][0] == '4.00000200')
+    await exchange.close()
+
+
+asyncio.get_event_loop().run_until_complete(test_async_raw_mode())
+server.shutdown()
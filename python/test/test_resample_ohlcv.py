@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+from decimal import Decimal
+
+import numpy
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.errors import NotSupported  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange as AsyncExchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+minute = 60000
+start = 1546300800000  # 2019-01-01, a tuesday
+candles = [
+    [start, 1.0, 2.0, 0.5, 1.5, 10.0],
+    [start + 5 * minute, 1.5, 3.0, 1.0, 2.0, None],
+    [start + 10 * minute, 2.0, 2.5, 0.25, 2.25, 5.0],
+    [start + 15 * minute, 2.25, 2.5, 2.0, 2.0, None],
+    [start + 25 * minute, 2.0, 2.0, 1.0, 1.0, 1.0],
+]
+
+exchange = Exchange({'id': 'test'})
+decimals = Exchange({'id': 'test', 'numericMode': 'decimal'})
+
+expected = [
+    [start, 1.0, 3.0, 0.25, 2.25, 15.0],
+    [start + 15 * minute, 2.25, 2.5, 1.0, 1.0, 1.0],
+]
+assert(exchange.resample_ohlcv(candles, '5m', '15m') == expected)
+assert(exchange.resample_ohlcv(numpy.array(candles, dtype=numpy.float64), '5m', '15m')[1].tolist() == expected[1])
+assert(exchange.resample_ohlcv(candles[1:2], '5m', '15m') == [[start, 1.5, 3.0, 1.0, 2.0, None]])
+assert(Exchange.resample_ohlcv_list(candles, '15m') == expected)
+assert(exchange.resample_ohlcv([], '5m', '15m') == [])
+
+# the weeks open on mondays
+assert(exchange.resample_ohlcv(candles, '5m', '1w')[0][0] == start - 86400000)
+
+for timeframes in [('5m', '7m'), ('1d', '1M')]:
+    try:
+        exchange.resample_ohlcv(candles, *timeframes)
+        assert(False)
+    except NotSupported:
+        pass
+
+# the timestamps are rounded to the timeframe and the gaps are filled at the previous close
+sparse = [
+    [start + 3000, 1.0, 2.0, 0.5, 1.5, 10.0],
+    [start + 2 * minute - 1000, 1.5, 1.5, 1.5, 1.5, 1.0],
+    [start + 2 * minute + 2000, 1.75, 1.75, 1.75, 1.75, 2.0],
+    [start + 4 * minute, 2.0, 2.0, 2.0, 2.0, None],
+]
+filled = [
+    [start, 1.0, 2.0, 0.5, 1.5, 10.0],
+    [start + minute, 1.5, 1.5, 1.5, 1.5, 0.0],
+    [start + 2 * minute, 1.75, 1.75, 1.75, 1.75, 2.0],
+    [start + 3 * minute, 1.75, 1.75, 1.75, 1.75, 0.0],
+    [start + 4 * minute, 2.0, 2.0, 2.0, 2.0, None],
+    [start + 5 * minute, 2.0, 2.0, 2.0, 2.0, 0.0],
+]
+assert(exchange.fill_ohlcv_gaps(sparse, '1m', start + 6 * minute) == filled)
+assert(exchange.fill_ohlcv_gaps(sparse, '1m', start + 4 * minute + 1) == filled[:5])
+assert(exchange.fill_ohlcv_gaps_list(sparse, '1m', start + 6 * minute) == filled)
+assert(exchange.fill_ohlcv_gaps(numpy.array(sparse[:2], dtype=numpy.float64), '1m').tolist() == filled[:2] + [[start + 2 * minute, 1.5, 1.5, 1.5, 1.5, 1.0]])
+assert(exchange.fill_ohlcv_gaps([], '1m') == [])
+
+# the decimal numbers are resampled without numpy
+decimal_candles = [[candle[0]] + [None if value is None else Decimal(repr(value)) for value in candle[1:]] for candle in candles]
+assert(decimals.resample_ohlcv(decimal_candles, '5m', '15m') == [[candle[0]] + [Decimal(repr(value)) for value in candle[1:]] for candle in expected])
+
+# ----------------------------------------------------------------------------
+# fetch_ohlcv() aggregates the longest timeframe of the exchange that divides a timeframe the exchange lacks
+
+history = [[start + i * minute, i, i + 1, i - 1, i + 0.5, 1.0] for i in range(0, 3000)]
+
+
+description = {
+    'id': 'stub',
+    'has': {
+        'fetchOHLCV': True,
+    },
+    'timeframes': {
+        '1m': '1',
+        '5m': '5',
+        '1h': '60',
+    },
+}
+now = start + 2000 * minute + 30000
+
+
+def fetch_history(exchange, timeframe, since, limit):
+    exchange.requests.append((timeframe, since, limit))
+    candles = exchange.resample_ohlcv(history, '1m', timeframe) if timeframe != '1m' else history
+    candles = [candle for candle in candles if (since is None) or (candle[0] >= since)]
+    return candles[:min(limit or 100, 100)]
+
+
+class stub(Exchange):
+
+    requests = []
+
+    def describe(self):
+        return self.deep_extend(super(stub, self).describe(), description)
+
+    def milliseconds(self):
+        return now
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return fetch_history(self, timeframe, since, limit)
+
+
+exchange = stub({'ohlcvLimit': 200})
+assert(exchange.fetch_ohlcv('BTC/USDT', '5m', start, 3) == exchange.resample_ohlcv(history[:15], '1m', '5m'))
+assert(exchange.requests == [('5m', start, 3)])
+
+exchange.requests = []
+expected = exchange.resample_ohlcv(history[:1500], '1m', '15m')
+assert(exchange.fetchOHLCV('BTC/USDT', '15m', start, 100) == expected)
+assert(exchange.requests == [('5m', start, 200), ('5m', start + 500 * minute, 200), ('5m', start + 1000 * minute, 200)])
+
+# the last candles by default, the last one is still open, and the candles from the first one that opens after since
+assert(exchange.fetch_ohlcv('BTC/USDT', '10m')[-2] == exchange.resample_ohlcv(history[1990:2000], '1m', '10m')[0])
+assert(exchange.fetch_ohlcv('BTC/USDT', '15m', start + 1, 2) == expected[1:3])
+assert(len(exchange.fetch_ohlcv('BTC/USDT', '2h', None, 5)) == 5)
+since = Exchange.ohlcv_opening_time('7m', start) + 7 * minute
+offset = (since - start) // minute
+assert(exchange.fetch_ohlcv('BTC/USDT', '7m', since, 1) == exchange.resample_ohlcv(history[offset:offset + 7], '1m', '7m'))
+
+try:
+    exchange.fetch_ohlcv('BTC/USDT', '1M')
+    assert(False)
+except NotSupported:
+    pass
+
+# the resampled candles are returned in the columns format
+columns = stub({'ohlcvLimit': 200, 'ohlcvFormat': 'columns'})
+assert(Exchange.ohlcv_rows(columns.fetch_ohlcv('BTC/USDT', '15m', start, 100)) == expected)
+
+# the timeframes are not resampled when disabled
+disabled = stub({'ohlcvResample': False})
+assert(disabled.fetch_ohlcv('BTC/USDT', '15m', start, 1) == [[start, 0, 15, -1, 14.5, 15.0]])
+
+
+class hourly(stub):
+
+    def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=50, params={}):
+        return fetch_history(self, timeframe, since, limit)
+
+
+# the defaults of the exchange apply to the arguments that are not passed
+exchange = hourly()
+exchange.requests = []
+exchange.fetch_ohlcv('BTC/USDT')
+exchange.fetch_ohlcv('BTC/USDT', since=start)
+exchange.fetchOhlcv('BTC/USDT', '5m', limit=3)
+assert(exchange.requests == [('1h', None, 50), ('1h', start, 50), ('5m', None, 3)])
+
+
+class async_stub(AsyncExchange):
+
+    requests = []
+
+    def describe(self):
+        return self.deep_extend(super(async_stub, self).describe(), description)
+
+    def milliseconds(self):
+        return now
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return fetch_history(self, timeframe, since, limit)
+
+
+async def test_async_resample_ohlcv():
+    exchange = async_stub({'ohlcvLimit': 200})
+    assert((await exchange.fetch_ohlcv('BTC/USDT', '15m', start, 100)) == expected)
+    await exchange.close()
+
+
+asyncio.get_event_loop().run_until_complete(test_async_resample_ohlcv())
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.errors import ExchangeNotAvailable  # noqa: E402
+from stub_server import StubServer, stub_exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the stub server replies with the statuses, or the statuses and the headers, that are queued for the next requests
+
+
+def respond(handler):
+    reply = statuses.pop(0) if statuses else 200
+    status, headers = reply if isinstance(reply, tuple) else (reply, {})
+    return status, headers, b'{}'
+
+
+statuses = []
+server = StubServer(respond)
+requests = server.requests
+
+description = {
+    'id': 'stub',
+    'urls': {'api': server.url},
+    'api': {
+        'public': {
+            'get': [
+                'ping',
+            ],
+        },
+        'private': {
+            'post': {
+                'order': {'cost': 1},
+                'cancel': {'cost': 1, 'safe': True},
+            },
+        },
+    },
+}
+
+exchange = stub_exchange(Exchange, description)({
+    'retryPolicy': {
+        'maxRetries': 2,
+        'delay': 50,
+        'budget': 4,
+    },
+})
+
+# ----------------------------------------------------------------------------
+# idempotent requests are retried with exponential backoff
+
+statuses.extend([503, 504])
+assert(exchange.public_get_ping() == {})
+assert(len(requests) == 3)
+assert(0.05 <= requests[1][2] - requests[0][2] < 0.1)  # with up to 25% of jitter
+assert(0.1 <= requests[2][2] - requests[1][2] < 0.15)
+assert(exchange.retryMetrics == {'retries': 2, 'recovered': 1, 'exhausted': 0, 'overBudget': 0})
+
+# ----------------------------------------------------------------------------
+# other requests are not retried, unless the endpoint is marked safe
+
+del requests[:]
+statuses.append(503)
+try:
+    exchange.private_post_order()
+    assert(False)
+except ExchangeNotAvailable:
+    pass
+assert(len(requests) == 1)
+
+statuses.append(503)
+exchange.private_post_cancel()
+assert(len(requests) == 3)
+assert(exchange.retryMetrics == {'retries': 3, 'recovered': 2, 'exhausted': 0, 'overBudget': 0})
+
+# ----------------------------------------------------------------------------
+# a request fails after maxRetries retries, all retries together stay within the budget
+
+del requests[:]
+statuses.extend([503, 503, 503])
+try:
+    exchange.public_get_ping()
+    assert(False)
+except ExchangeNotAvailable:
+    pass
+assert(len(requests) == 2)  # the budget of 4 retries allowed only one more retry
+assert(exchange.retryMetrics == {'retries': 4, 'recovered': 2, 'exhausted': 0, 'overBudget': 1})
+
+exchange.retryTimestamps.clear()
+del requests[:]
+statuses.extend([503, 503, 503])
+try:
+    exchange.public_get_ping()
+    assert(False)
+except ExchangeNotAvailable:
+    pass
+assert(len(requests) == 3)
+assert(exchange.retryMetrics == {'retries': 6, 'recovered': 2, 'exhausted': 1, 'overBudget': 1})
+statuses.pop()
+
+# ----------------------------------------------------------------------------
+# the exchange pushing back delays the retries more, for as long as its Retry-After asks, if that is not too long
+
+exchange.retryTimestamps.clear()
+del requests[:]
+statuses.append(429)  # DDoSProtection
+assert(exchange.public_get_ping() == {})
+assert(0.2 <= requests[1][2] - requests[0][2] < 0.3)
+
+del requests[:]
+statuses.append((503, {'Retry-After': '0.3'}))
+assert(exchange.public_get_ping() == {})
+assert(0.3 <= requests[1][2] - requests[0][2] < 0.4)
+
+del requests[:]
+statuses.append((503, {'Retry-After': '60'}))
+try:
+    exchange.public_get_ping()
+    assert(False)
+except ExchangeNotAvailable:
+    pass
+assert(len(requests) == 1)
+assert(exchange.retryMetrics == {'retries': 8, 'recovered': 4, 'exhausted': 1, 'overBudget': 1})
+
+# ----------------------------------------------------------------------------
+# the async version waits without blocking the event loop
+
+if sys.version_info >= (3, 5):
+
+    import asyncio  # noqa: E402
+    import ccxt.async_support  # noqa: E402
+
+    loop = asyncio.get_event_loop()
+    exchange = stub_exchange(ccxt.async_support.Exchange, description)({
+        'asyncio_loop': loop,
+        'retryPolicy': {
+            'maxRetries': 1,
+            'delay': 200,
+        },
+    })
+
+    ticks = []
+    start = time.time()
+    loop.call_later(0.05, lambda: ticks.append(time.time() - start))
+    statuses.append(503)
+    assert(loop.run_until_complete(exchange.public_get_ping()) == {})
+    assert(time.time() - start >= 0.2)
+    assert(ticks[0] < 0.15)
+    assert(exchange.retryMetrics == {'retries': 1, 'recovered': 1, 'exhausted': 0, 'overBudget': 0})
+    loop.run_until_complete(exchange.close())
+
+server.shutdown()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.async_support.base import connector  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+async def test_shared_connector():
+    config = {
+        'aiohttp_shared_connector': True,
+        'aiohttp_connector_options': {'limit_per_host': 5},
+    }
+    exchanges = [ccxt.binance(config), ccxt.kraken(config), ccxt.bitmex(config)]
+    shared = exchanges[0].session.connector
+
+    # the instances share one connector with the settings from the config
+    assert(all([exchange.session.connector is shared for exchange in exchanges]))
+    assert(shared.limit_per_host == 5)
+
+    # the instances with other settings have a connector of their own, but share the ssl context
+    exchange = ccxt.binance()
+    assert(exchange.session.connector is not shared)
+    assert(exchange.session.connector._ssl is shared._ssl)
+    await exchange.close()
+
+    # the connector is closed along with the last instance that uses it, closing twice is safe
+    await exchanges[0].close()
+    await exchanges[0].close()
+    await exchanges[1].close()
+    assert(not shared.closed)
+    await exchanges[2].close()
+    assert(shared.closed)
+    assert(connector.connectors == {})
+
+
+asyncio.get_event_loop().run_until_complete(test_shared_connector())
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.throttle import throttle  # noqa: E402
+from ccxt.base.throttle import TokenBucket  # noqa: E402
+from ccxt.base.throttle import FileTokenBucket  # noqa: E402
+from ccxt.base.throttle import fcntl  # noqa: E402
+from stub_server import StubServer, stub_exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+class weighted(Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(weighted, self).describe(), {
+            'id': 'weighted',
+            'rateLimit': 10,
+            'api': {
+                'public': {
+                    'get': {
+                        'ping': 1,
+                        'depth': 5,
+                    },
+                },
+                'private': {
+                    'get': [
+                        'balance',
+                    ],
+                    'post': {
+                        'order': {'cost': 2, 'bucket': 'orders'},
+                    },
+                },
+            },
+        })
+
+
+exchange = weighted({
+    'tokenBuckets': {
+        'private': {},
+        'orders': {'refillRate': 0.5},
+    },
+})
+
+# ----------------------------------------------------------------------------
+# the costs and the buckets are taken from the api definitions
+
+assert(exchange.calculate_rate_limiter_cost('public', 'GET', 'ping', {}) == 1)
+assert(exchange.calculate_rate_limiter_cost('public', 'GET', 'depth', {}) == 5)
+assert(exchange.calculate_rate_limiter_cost('private', 'GET', 'balance', {}) == 1)
+assert(exchange.calculate_rate_limiter_cost('private', 'POST', 'order', {}) == 2)
+assert(exchange.calculate_rate_limiter_cost('public', 'GET', 'depth', {}, {'cost': 3}) == 3)
+
+assert(exchange.select_throttle('public', 'GET', 'depth') is exchange.throttle)
+assert(exchange.select_throttle('private', 'GET', 'balance') is exchange.throttles['private'])
+assert(exchange.select_throttle('private', 'POST', 'order') is exchange.throttles['orders'])
+assert(exchange.select_throttle('private', 'GET', 'balance', {'bucket': 'orders'}) is exchange.throttles['orders'])
+
+assert(exchange.tokenBuckets['orders']['refillRate'] == 0.5)
+assert(exchange.tokenBuckets['private']['refillRate'] == exchange.tokenBucket['refillRate'])
+
+# ----------------------------------------------------------------------------
+# a call takes its cost from the bucket and the next call waits for the refill
+
+bucket = throttle({'refillRate': 0.1, 'capacity': 1})  # 10 ms per token
+start = time.time()
+bucket(5)
+first = time.time() - start
+bucket()
+second = time.time() - start
+
+assert(first < 0.01)
+assert(0.04 <= second < 0.2)
+
+# ----------------------------------------------------------------------------
+# many threads of several exchange instances share one budget when they share a bucket
+
+
+server = StubServer()
+
+stub = stub_exchange(Exchange, {
+    'id': 'stub',
+    'enableRateLimit': True,
+    'urls': {'api': server.url},
+    'api': {
+        'public': {
+            'get': [
+                'ping',
+            ],
+        },
+    },
+})
+
+
+def run_threads(exchanges, number_of_threads, number_of_requests):
+    def run(exchange):
+        for i in range(0, number_of_requests):
+            exchange.public_get_ping()
+    threads = [threading.Thread(target=run, args=(exchanges[i % len(exchanges)],)) for i in range(0, number_of_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def assert_within_budget(config, number_of_requests):
+    # a token bucket lets through at most capacity + 1 requests at once and refillRate requests per millisecond after that
+    timestamps = sorted([request[2] for request in server.requests])
+    assert(len(timestamps) == number_of_requests)
+    for i in range(0, len(timestamps)):
+        for j in range(i, len(timestamps)):
+            elapsed = (timestamps[j] - timestamps[i]) * 1000 + 10  # + 10 ms for the requests that reach the server late, bunched up with the next ones
+            assert(j - i + 1 <= config['capacity'] + 1 + elapsed * config['refillRate'])
+
+
+# a rateLimit changed after the construction applies to the next requests
+exchange = stub({'rateLimit': 1000})
+exchange.rateLimit = 20
+start = time.time()
+for i in range(0, 5):
+    exchange.public_get_ping()
+assert(0.06 <= time.time() - start < 0.5)
+assert(exchange.tokenBucket['refillRate'] == 0.05)
+shared = TokenBucket({'refillRate': 0.001})
+exchange = stub({'rateLimit': 1000, 'throttle': shared})
+exchange.rateLimit = 20
+exchange.public_get_ping()
+assert(shared.config['refillRate'] == 0.001)  # the rate limiters passed in the config are left as they are
+del server.requests[:]
+
+config = {'refillRate': 0.2, 'capacity': 2}  # 200 requests per second in bursts of 3
+
+bucket = TokenBucket(config)
+exchanges = [stub({'throttle': bucket}) for i in range(0, 3)]
+run_threads(exchanges, 12, 5)
+assert_within_budget(config, 60)
+
+if fcntl is not None:
+    # separate buckets on the same file are what separate processes would use
+    del server.requests[:]
+    path = os.path.join(tempfile.mkdtemp(), 'stub.bucket')
+    exchanges = [stub({'throttle': FileTokenBucket(path, config)}) for i in range(0, 3)]
+    run_threads(exchanges, 12, 5)
+    assert_within_budget(config, 60)
+    os.remove(path)
+
+server.shutdown()